@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Multi-core env throughput: BulletHellAsyncVecEnv with 1..K worker processes.
+
+Every run steps --num-envs envs with random actions for --steps batched steps; the
+workers write observations, rewards and dones into shared memory. Reported: env steps
+per second, speedup over one worker, and scaling efficiency (speedup / workers; 100% is
+linear). The in-process BulletHellVecEnv is the zero-worker baseline. --exact runs the
+workers on separate BulletHellEnv instances instead of batched worlds.
+
+Speedups can only be linear up to the number of usable cores (printed first); pinning
+puts worker i on the i-th of them.
+
+Example:
+  python benchmarks/bench_async_vec_env.py --num-envs 256 --workers 1 2 4 8 --steps 500
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellAsyncVecEnv import BulletHellAsyncVecEnv
+from bullet_hell_rl.envs.BulletHellVecEnv import BulletHellVecEnv
+
+
+def _actions(n: int, steps: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {"move": rng.integers(0, 5, size=n), "fire_angle": rng.integers(0, 271, size=(n, 1)).astype(np.int16)}
+        for _ in range(steps)
+    ]
+
+
+def _rate(env, actions: list[dict], seed: int, warmup: int) -> float:
+    env.reset(seed=seed)
+    for action in actions[:warmup]:
+        env.step(action)
+    t0 = time.perf_counter()
+    for action in actions[warmup:]:
+        env.step(action)
+    return env.num_envs * (len(actions) - warmup) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="BulletHellAsyncVecEnv scaling with worker processes")
+    p.add_argument("--num-envs", type=int, default=256)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--steps", type=int, default=500)
+    p.add_argument("--warmup", type=int, default=20)
+    p.add_argument("--exact", action="store_true", help="Workers run BulletHellEnv instead of batched worlds")
+    p.add_argument("--no-pin", action="store_true", help="Don't pin workers to cores")
+    p.add_argument("--copy", action="store_true", help="Copy results out of shared memory every step")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    actions = _actions(args.num_envs, args.warmup + args.steps, args.seed)
+    print(f"{args.num_envs} envs, {cores} usable cores, {'BulletHellEnv' if args.exact else 'batched'} workers")
+    print(f"{'workers':>7} {'steps/s':>10} {'speedup':>8} {'efficiency':>10}")
+    if not args.exact:
+        env = BulletHellVecEnv(num_envs=args.num_envs)
+        print(f"{'0 (in)':>7} {_rate(env, actions, args.seed, args.warmup):>10.0f}")
+    base = None
+    for workers in args.workers:
+        env = BulletHellAsyncVecEnv(
+            num_envs=args.num_envs,
+            num_workers=workers,
+            batched=not args.exact,
+            pin_workers=not args.no_pin,
+            copy=args.copy,
+        )
+        try:
+            rate = _rate(env, actions, args.seed, args.warmup)
+        finally:
+            env.close()
+        base = base or rate
+        speedup = rate / base
+        print(f"{env.num_workers:>7} {rate:>10.0f} {speedup:>7.2f}x {speedup / env.num_workers:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Collision-pass cost per tick as the live bullet count grows.
+
+Compares three ways of running Entity.is_colliding for every player and enemy once:
+  list   - the original path: a plain list of bullets, one rect test per bullet
+  pool   - BulletPool with a vectorized rect test against every live bullet
+  hash   - BulletPool with the spatial-hash broadphase (rebuilt once per tick)
+
+Example:
+  python benchmarks/bench_collisions.py --enemies 30 --players 4 --bullets 10 100 1000 5000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import bullet_hell_rl.bullethell as bh
+
+
+def _make_world(n_bullets: int, n_enemies: int, n_players: int, seed: int):
+    rng = random.Random(seed)
+    pool = bh.BulletPool()
+    for _ in range(n_bullets):
+        pool.spawn(
+            rng.uniform(0, bh.WORLD_WIDTH),
+            rng.uniform(0, bh.WORLD_HEIGHT),
+            rng.uniform(0, 360),
+            bh.BULLET_DAMAGE,
+            rng.random() < 0.5,
+        )
+    # One integration step so rects use the moved (rounded) positions, as in a real tick.
+    pool.update(1.0 / 60)
+    entities = [
+        bh.Enemy(rng.randint(0, bh.WORLD_WIDTH - bh.ENTITY_SIZE), rng.randint(0, bh.WORLD_HEIGHT - bh.ENTITY_SIZE))
+        for _ in range(n_enemies)
+    ]
+    entities += [
+        bh.Player(rng.randint(0, bh.WORLD_WIDTH - bh.ENTITY_SIZE), rng.randint(0, bh.WORLD_HEIGHT - bh.ENTITY_SIZE), is_env=True)
+        for _ in range(n_players)
+    ]
+    return pool, entities
+
+
+def _collision_pass(entities, bullets, invalidate) -> int:
+    hits = 0
+    if invalidate is not None:
+        invalidate()  # bullets moved since last tick
+    for ent in entities:
+        health = ent.health
+        hits += len(ent.is_colliding(bullets))
+        ent.health = health  # keep the world unchanged between repeats
+    return hits
+
+
+def _time_per_tick(entities, bullets, repeats: int, invalidate=None) -> float:
+    _collision_pass(entities, bullets, invalidate)
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        _collision_pass(entities, bullets, invalidate)
+    return (time.perf_counter() - t0) / repeats
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Collision broadphase scaling benchmark")
+    p.add_argument("--enemies", type=int, default=30)
+    p.add_argument("--players", type=int, default=4)
+    p.add_argument("--bullets", type=int, nargs="+", default=[10, 50, 100, 500, 1000, 2000, 5000])
+    p.add_argument("--repeats", type=int, default=20)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"entities: {args.enemies} enemies + {args.players} players; times are ms per tick")
+    print(f"{'bullets':>8} {'list':>10} {'pool':>10} {'hash':>10} {'list/hash':>10}")
+    for n in args.bullets:
+        pool, entities = _make_world(n, args.enemies, args.players, args.seed)
+        as_list = list(pool)
+        repeats = max(1, args.repeats if n <= 1000 else args.repeats // 4)
+
+        t_list = _time_per_tick(entities, as_list, repeats)
+
+        pool.use_spatial_hash = False
+        t_pool = _time_per_tick(entities, pool, repeats)
+
+        pool.use_spatial_hash = True
+        t_hash = _time_per_tick(entities, pool, repeats, invalidate=pool._hash.invalidate)
+
+        print(
+            f"{n:>8} {t_list * 1e3:>10.3f} {t_pool * 1e3:>10.3f} {t_hash * 1e3:>10.3f} "
+            f"{t_list / t_hash:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Enemy AI cost per tick: per-enemy Enemy.update versus the batched EnemyController.
+
+  loop   - the old path: nearest living player scanned per enemy, then Enemy.update
+           (random.choice, update_position, math.atan2) one enemy at a time
+  batch  - EnemyController.update: one RNG call, one distance matrix, one arctan2
+
+Collisions are left out (an empty bullet list) so only the AI is timed.
+
+Example:
+  python benchmarks/bench_enemy_ai.py --enemies 10 100 1000 --players 1 4 16
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import bullet_hell_rl.bullethell as bh
+from bullet_hell_rl.enemy_ai import EnemyController
+
+TICK_MS = 1000 / 60
+
+
+def _nearest_scan(enemy, players):
+    """The old per-enemy nearest-player search."""
+    ex = enemy.x + enemy.size // 2
+    ey = enemy.y + enemy.size // 2
+    best, best_d2 = None, float("inf")
+    for p in players:
+        d2 = (p.x + p.size // 2 - ex) ** 2 + (p.y + p.size // 2 - ey) ** 2
+        if d2 < best_d2:
+            best, best_d2 = p, d2
+    return best
+
+
+def _make(n_enemies: int, n_players: int, seed: int):
+    rng = random.Random(seed)
+
+    def pos():
+        return rng.randint(0, bh.WORLD_WIDTH - bh.ENTITY_SIZE), rng.randint(0, bh.WORLD_HEIGHT - bh.ENTITY_SIZE)
+
+    enemies = [bh.Enemy(*pos()) for _ in range(n_enemies)]
+    players = [bh.Player(*pos(), is_env=True) for _ in range(n_players)]
+    return enemies, players
+
+
+def _time_loop(enemies, players, ticks: int) -> float:
+    t0 = time.perf_counter()
+    now = 0.0
+    for _ in range(ticks):
+        now += TICK_MS
+        for enemy in enemies:
+            enemy.update(TICK_MS / 1000, _nearest_scan(enemy, players), now, [])
+    return (time.perf_counter() - t0) / ticks
+
+
+def _time_batch(enemies, players, ticks: int) -> float:
+    controller = EnemyController()
+    t0 = time.perf_counter()
+    now = 0.0
+    for _ in range(ticks):
+        now += TICK_MS
+        controller.update(enemies, players, now, TICK_MS / 1000)
+    return (time.perf_counter() - t0) / ticks
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Per-enemy vs batched enemy AI benchmark")
+    p.add_argument("--enemies", type=int, nargs="+", default=[10, 50, 200, 1000])
+    p.add_argument("--players", type=int, nargs="+", default=[1, 4, 16])
+    p.add_argument("--ticks", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("times are ms per tick")
+    print(f"{'enemies':>8} {'players':>8} {'loop':>10} {'batch':>10} {'speedup':>8}")
+    for n_p in args.players:
+        for n_e in args.enemies:
+            t_loop = _time_loop(*_make(n_e, n_p, args.seed), args.ticks)
+            t_batch = _time_batch(*_make(n_e, n_p, args.seed), args.ticks)
+            print(f"{n_e:>8} {n_p:>8} {t_loop * 1e3:>10.3f} {t_batch * 1e3:>10.3f} {t_loop / t_batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+BulletHellEnv.step before and after the allocation-free observation path.
+
+"before" is the previous step, kept here verbatim as LegacyBulletHellEnv: action_space
+.contains on every call, the move lookup dict and center closure rebuilt per step,
+get_closest_entities fully sorting every bullet and enemy, one temporary np.array per
+observation row and fresh observation buffers. "after" is the current BulletHellEnv
+with reuse_obs=True (preallocated buffers returned as is, np.argpartition top-k over
+coordinate arrays); "after+copy" is its default, which returns a copy of the buffers.
+
+For each warm-up length both envs are brought to the same dense state (immortal player,
+same seed and actions), then time --steps further steps; the observation alone is timed
+too. Every before/after step must return identical observations, rewards and flags.
+
+Example:
+  python benchmarks/bench_env_step.py --warmup 0 200 1000 --steps 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import BULLET_SPEED_ENEMY, PLAYER_HEALTH_MAX
+from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+
+IMMORTAL_HEALTH = PLAYER_HEALTH_MAX * 10**9
+
+
+class LegacyBulletHellEnv(BulletHellEnv):
+    """BulletHellEnv with the step / observation / reward code it had before."""
+
+    def step(self, action):
+        err_msg = f"{action!r} ({type(action)}) invalid"
+        assert self.action_space.contains(action), err_msg
+        assert self.state is not None, "Call reset before using step method."
+        MOVE_LOOKUP = {0: "left", 1: "right", 2: "up", 3: "down", 4: "none"}
+        dir = MOVE_LOOKUP[action["move"]]
+        angle = action["fire_angle"][0]
+        reward = 0
+        frames = 0
+        for _ in range(self.frame_skip):
+            self.world.step({PLAYER_ID: (dir, angle)})
+            reward += self._legacy_tick_reward()
+            frames += 1
+            if self.player.health <= 0:
+                break
+        current_time = self.world.current_time
+        self.current_time = current_time
+        self._legacy_observe()
+        terminated = self.player.health <= 0
+        truncated = self.step_count >= self.max_steps
+        self.step_count += 1
+        info = {
+            "dt": self.world.delta_time,
+            "frames": frames,
+            "current_time": current_time,
+            "step_count": self.step_count,
+            "player_health": self.player.health,
+            "kill_count": self.player.kill_count,
+            "damage_taken": self.world.damage_totals[PLAYER_ID],
+            "spawns_skipped": self.world.spawns_skipped,
+            "bullets_evicted": self.world.bullets_evicted,
+        }
+        return self.state, reward, terminated, truncated, info
+
+    def _legacy_observe(self):
+        closest_bullets = self.get_closest_entities(self.player.x, self.player.y, self.bullets, self.N_bullets)
+        closest_bullets = [b for b in closest_bullets if not b.is_friendly]
+        self.bullet_obs = np.zeros((self.N_bullets, 4), dtype=np.float32)
+        for i, b in enumerate(closest_bullets[:self.N_bullets]):
+            self.bullet_obs[i] = np.array(
+                [
+                    (b.x - self.player.x) / self.world_width,
+                    (b.y - self.player.y) / self.world_height,
+                    b.vel_x / BULLET_SPEED_ENEMY,
+                    b.vel_y / BULLET_SPEED_ENEMY,
+                ],
+                dtype=np.float32,
+            )
+        closest_enemies = self.get_closest_entities(self.player.x, self.player.y, self.enemies, self.N_enemies)
+        self.enemies_obs = np.zeros((self.N_enemies, 4), dtype=np.float32)
+        for i, enemy in enumerate(closest_enemies[:self.N_enemies]):
+            self.enemies_obs[i] = np.array(
+                [
+                    (enemy.x - self.player.x) / self.world_width,
+                    (enemy.y - self.player.y) / self.world_height,
+                    enemy.vx,
+                    enemy.vy,
+                ],
+                dtype=np.float32,
+            )
+        self.state = {
+            "player": np.array(
+                (self.player.health / PLAYER_HEALTH_MAX, self.player.x / self.world_width, self.player.y / self.world_height)
+            ),
+            "enemies": self.enemies_obs,
+            "bullets": self.bullet_obs,
+        }
+
+    def _legacy_tick_reward(self):
+        def is_player_in_center(x, y):
+            c_x = self.world_width / 2
+            c_y = self.world_height / 2
+            if x > c_x / 2 and x < c_x / 2 + c_x:
+                if y > c_y / 2 and y < c_y / 2 + c_y:
+                    return True
+            return False
+
+        kill_total = self.world.kill_totals[PLAYER_ID]
+        if kill_total > self.player_previous_kill_count:
+            reward = 100
+            self.player_previous_kill_count = kill_total
+        elif self.player.health < self.player_previous_health:
+            reward = -300
+            self.player_previous_health = self.player.health
+        elif is_player_in_center(self.player.x, self.player.y):
+            reward = 10
+        else:
+            reward = 1
+        return reward
+
+
+def _actions(n: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {"move": int(rng.integers(5)), "fire_angle": np.array([rng.integers(0, 271)], dtype=np.int16)}
+        for _ in range(n)
+    ]
+
+
+def _prepare(env: BulletHellEnv, actions: list[dict], seed: int) -> None:
+    env.reset(seed=seed)
+    for action in actions:
+        env.player.health = IMMORTAL_HEALTH
+        env.step(action)
+    env.player.health = IMMORTAL_HEALTH
+
+
+def _run(env: BulletHellEnv, actions: list[dict]) -> tuple[float, list]:
+    out = []
+    elapsed = 0.0
+    for action in actions:
+        t0 = time.perf_counter()
+        obs, reward, terminated, truncated, _ = env.step(action)
+        elapsed += time.perf_counter() - t0
+        out.append((obs["player"].tobytes(), obs["enemies"].tobytes(), obs["bullets"].tobytes(), reward, terminated, truncated))
+    return elapsed / len(actions), out
+
+
+def _time(fn, repeats: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="BulletHellEnv.step before/after the allocation-free observation")
+    p.add_argument("--warmup", type=int, nargs="+", default=[0, 200, 1000])
+    p.add_argument("--steps", type=int, default=500)
+    p.add_argument("--repeats", type=int, default=2000, help="Observation-only timing repeats")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("microseconds per call; obs is the observation alone, step the whole env step")
+    print(
+        f"{'warmup':>6} {'enemies':>7} {'bullets':>7} {'obs before':>10} {'obs after':>9} "
+        f"{'step before':>11} {'step after':>10} {'after+copy':>10} {'speedup':>8}"
+    )
+    for warmup in args.warmup:
+        actions = _actions(warmup + args.steps, args.seed)
+        before, after, copying = LegacyBulletHellEnv(), BulletHellEnv(reuse_obs=True), BulletHellEnv()
+        _prepare(before, actions[:warmup], args.seed)
+        _prepare(after, actions[:warmup], args.seed)
+        _prepare(copying, actions[:warmup], args.seed)
+        n_enemies, n_bullets = len(after.enemies), len(after.bullets)
+        obs_before = _time(before._legacy_observe, args.repeats)
+        obs_after = _time(after._observe, args.repeats)
+        step_before, out_before = _run(before, actions[warmup:])
+        step_after, out_after = _run(after, actions[warmup:])
+        step_copying, out_copying = _run(copying, actions[warmup:])
+        if out_before != out_after or out_before != out_copying:
+            step = next(
+                i for i, (a, b, c) in enumerate(zip(out_before, out_after, out_copying)) if not a == b == c
+            )
+            raise AssertionError(f"before/after differ at step {warmup + step}")
+        print(
+            f"{warmup:>6} {n_enemies:>7} {n_bullets:>7} {obs_before * 1e6:>10.1f} {obs_after * 1e6:>9.1f} "
+            f"{step_before * 1e6:>11.1f} {step_after * 1e6:>10.1f} {step_copying * 1e6:>10.1f} "
+            f"{step_before / step_after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Frame stacking: ring-buffer FrameStack / FrameStackReplay against naive concatenation.
+
+For each observation shape and k, --steps synthetic observations go through:
+  naive - a deque of the last k observations, np.concatenate'd into a new stack every
+          step, (state, next_state) stacks kept in a deque replay (as DQNLegacy does)
+  ring  - envs.FrameStack's ring (one observation written twice per step, the stack is
+          a view) and DQN.frame_replay.FrameStackReplay (each frame stored once)
+Reported: microseconds per step for stacking plus storing, replay memory, and the time
+to sample a batch of --batch transitions.
+
+Example:
+  python benchmarks/bench_frame_stack.py --k 4 8 --steps 20000 --capacity 20000
+"""
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.DQN.frame_replay import FrameStackReplay
+from bullet_hell_rl.envs.FrameStack import FrameStack
+
+SHAPES = {"flat 63": (63,), "grid 3x16x16": (3, 16, 16)}
+
+
+class _ArrayEnv(gym.Env):
+    """Env replaying precomputed observations, so only stacking is timed."""
+
+    def __init__(self, observations: np.ndarray):
+        self.observations = observations
+        self.observation_space = spaces.Box(-1.0, 1.0, shape=observations.shape[1:], dtype=np.float32)
+        self.action_space = spaces.Discrete(20)
+        self.t = 0
+
+    def reset(self, *, seed=None, options=None):
+        self.t = 0
+        return self.observations[0], {}
+
+    def step(self, action):
+        self.t += 1
+        return self.observations[self.t], 1.0, False, False, {}
+
+
+def _naive(observations: np.ndarray, k: int, capacity: int, batch: int) -> tuple[float, int, float]:
+    frames = deque([observations[0]] * k, maxlen=k)
+    state = np.concatenate(frames)
+    replay = deque(maxlen=capacity)
+    t0 = time.perf_counter()
+    for t in range(1, len(observations)):
+        frames.append(observations[t])
+        next_state = np.concatenate(frames)
+        replay.append((state, t % 20, 1.0, next_state, False))
+        state = next_state
+    step = (time.perf_counter() - t0) / (len(observations) - 1)
+    memory = sum(s.nbytes + n.nbytes for s, _, _, n, _ in replay)
+    t0 = time.perf_counter()
+    sample = random.sample(replay, batch)
+    np.stack([s for s, *_ in sample])
+    np.stack([n for *_, n, _ in sample])
+    return step, memory, time.perf_counter() - t0
+
+
+def _ring(observations: np.ndarray, k: int, capacity: int, batch: int) -> tuple[float, int, float]:
+    env = FrameStack(_ArrayEnv(observations), k=k)
+    replay = FrameStackReplay(capacity, observations.shape[1:], k=k)
+    stack, _ = env.reset()
+    replay.start_episode(stack[-1])
+    t0 = time.perf_counter()
+    for t in range(1, len(observations)):
+        stack, reward, terminated, _, _ = env.step(t % 20)
+        replay.add(t % 20, reward, stack[-1], terminated)
+    step = (time.perf_counter() - t0) / (len(observations) - 1)
+    memory = replay.frames.nbytes + replay.frame_start.nbytes + sum(
+        a.nbytes for a in (replay.state_frame, replay.low_frame, replay.actions, replay.rewards, replay.dones)
+    )
+    t0 = time.perf_counter()
+    replay.sample(batch)
+    return step, memory, time.perf_counter() - t0
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Ring-buffer frame stacking vs naive concatenation")
+    p.add_argument("--k", type=int, nargs="+", default=[4, 8])
+    p.add_argument("--steps", type=int, default=20000)
+    p.add_argument("--capacity", type=int, default=20000)
+    p.add_argument("--batch", type=int, default=256)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'obs':>12} {'k':>2} {'naive us':>8} {'ring us':>7} {'naive MB':>8} {'ring MB':>7} "
+          f"{'naive smpl ms':>13} {'ring smpl ms':>12}")
+    for name, shape in SHAPES.items():
+        observations = rng.uniform(-1, 1, size=(args.steps + 1, *shape)).astype(np.float32)
+        for k in args.k:
+            naive = _naive(observations, k, args.capacity, args.batch)
+            ring = _ring(observations, k, args.capacity, args.batch)
+            print(
+                f"{name:>12} {k:>2} {naive[0] * 1e6:>8.1f} {ring[0] * 1e6:>7.1f} "
+                f"{naive[1] / 2**20:>8.1f} {ring[1] / 2**20:>7.1f} "
+                f"{naive[2] * 1e3:>13.2f} {ring[2] * 1e3:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
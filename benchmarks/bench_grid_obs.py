@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Observation cost against bullet count: the occupancy grid against the nearest-k paths.
+
+For each bullet count one env per observation mode gets the same world (seeded reset,
+then that many hostile bullets spawned at random positions, a tenth of them friendly),
+and its observation is rebuilt --repeats times:
+  default - BulletHellEnv's 63-dim Dict observation (10 nearest bullets)
+  bridge  - the actors' 49-dim observation (density cones + 5 nearest hostile bullets)
+  grid    - the (3, 16, 16) occupancy grid (one bincount, no sort)
+"sort share" is how the nearest-k paths grow with bullets; the grid should stay nearly
+flat.
+
+Example:
+  python benchmarks/bench_grid_obs.py --bullets 0 10 100 1000 10000 --repeats 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+MODES = ("default", "bridge", "grid")
+
+
+def _env(mode: str, n_bullets: int, seed: int) -> BulletHellEnv:
+    env = BulletHellEnv(flat=True, obs_mode=mode)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    pool = env.world.bullets
+    for x, y, angle, friendly in zip(
+        rng.uniform(0, env.world_width, n_bullets).tolist(),
+        rng.uniform(0, env.world_height, n_bullets).tolist(),
+        rng.uniform(0, 360, n_bullets).tolist(),
+        (rng.random(n_bullets) < 0.1).tolist(),
+    ):
+        pool.spawn(x, y, angle, 10, friendly)
+    return env
+
+
+def _time(fn, repeats: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Occupancy-grid observation vs the nearest-k observations")
+    p.add_argument("--bullets", type=int, nargs="+", default=[0, 10, 100, 1000, 10000])
+    p.add_argument("--repeats", type=int, default=500)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("microseconds per observation")
+    print(f"{'bullets':>7} " + " ".join(f"{mode:>9}" for mode in MODES) + f" {'grid vs bridge':>14}")
+    for n in args.bullets:
+        times = {mode: _time(_env(mode, n, args.seed)._observe, args.repeats) for mode in MODES}
+        print(
+            f"{n:>7} " + " ".join(f"{times[mode] * 1e6:>9.1f}" for mode in MODES)
+            + f" {times['bridge'] / times['grid']:>13.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
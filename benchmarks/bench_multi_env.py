@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Many BulletHellEnv instances stepping in one process.
+
+Kill and damage accounting lives in each env's own WorldSimulator, so envs sharing a
+process must not see each other's kills. For every env this checks that the steps paying
+the kill reward are exactly the steps where that env's own kill total went up, then
+reports env-steps per second for each env count.
+
+Example:
+  python benchmarks/bench_multi_env.py --envs 1 8 32 --steps 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+
+KILL_REWARD = 100
+
+
+def _run(n_envs: int, steps: int, seed: int) -> tuple[float, int]:
+    envs = [BulletHellEnv(render_mode=None) for _ in range(n_envs)]
+    for i, env in enumerate(envs):
+        env.reset(seed=seed + i)
+        env.action_space.seed(seed + i)
+    kills_seen = 0
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        for env in envs:
+            before = env.world.kill_totals[PLAYER_ID]
+            _, reward, terminated, truncated, info = env.step(env.action_space.sample())
+            gained = env.world.kill_totals[PLAYER_ID] - before
+            if (reward == KILL_REWARD) != (gained > 0):
+                raise AssertionError(f"kill reward out of sync with this env's kills: {reward=} {gained=}")
+            if info["kill_count"] != env.world.kill_totals[PLAYER_ID]:
+                raise AssertionError("player kill_count disagrees with the world's kill total")
+            kills_seen += gained
+            if terminated or truncated:
+                env.reset()
+    elapsed = time.perf_counter() - t0
+    return n_envs * steps / elapsed, kills_seen
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Step many BulletHellEnv instances in one process")
+    p.add_argument("--envs", type=int, nargs="+", default=[1, 4, 16, 32])
+    p.add_argument("--steps", type=int, default=300, help="Steps per env")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{'envs':>6} {'env-steps/s':>12} {'kills':>7}  accounting")
+    for n in args.envs:
+        rate, kills = _run(n, args.steps, args.seed)
+        print(f"{n:>6} {rate:>12.0f} {kills:>7}  ok")
+
+
+if __name__ == "__main__":
+    main()
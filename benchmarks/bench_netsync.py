@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Server bandwidth and CPU per tick: full state updates versus input-sync messages.
+
+A fixed-point world with N players (random flat actions) runs for --ticks ticks.
+  state - what run_server sends by default: one MSG_UPDATE per client with every player,
+          enemy and bullet, JSON-encoded
+  input - run_server(input_sync=True): one MSG_INPUTS shared by all clients
+Bytes are JSON payload bytes per client per tick; server ms is building + encoding the
+messages for all clients. An InputSyncReplica fed the JSON-encoded inputs must match the
+server's state_checksum every tick, and its ms per tick is the client-side cost.
+
+Example:
+  python benchmarks/bench_netsync.py --players 1 4 16 --ticks 1200
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.net.input_sync import (
+    InputSyncReplica,
+    inputs_message,
+    snapshot_message,
+    world_actions,
+)
+from bullet_hell_rl.net.state import bullet_states, build_update, enemy_state
+from bullet_hell_rl.world import FIXED_POINT_TICK_RATE, WorldSimulator
+
+
+def _run(n_players: int, ticks: int, seed: int, max_enemies: int | None) -> dict:
+    world = WorldSimulator(
+        tick_ms=1000 / FIXED_POINT_TICK_RATE,
+        player_ids=range(n_players),
+        respawn_dead_players=True,
+        max_enemies=max_enemies,
+        seed=seed,
+        fixed_point=True,
+    )
+    replica = InputSyncReplica(0)
+    replica.handle(json.loads(json.dumps(snapshot_message(world))))
+    rng = random.Random(seed)
+    state_bytes = input_bytes = 0
+    state_time = input_time = replica_time = 0.0
+    for _ in range(ticks):
+        flat = {pid: rng.randrange(20) for pid in world.players}
+        world.step(world_actions(flat))
+
+        t0 = time.perf_counter()
+        enemies = [enemy_state(e) for e in world.enemies]
+        bullets = bullet_states(world.bullets)
+        members = list(world.players.items())
+        for pid in world.players:
+            state_bytes += len(json.dumps(build_update(pid, members, enemies, bullets, world.tick_count)))
+        t1 = time.perf_counter()
+        payload = json.dumps(inputs_message(world, [], [], flat))
+        input_bytes += len(payload) * n_players
+        t2 = time.perf_counter()
+        state_time += t1 - t0
+        input_time += t2 - t1
+
+        t0 = time.perf_counter()
+        replica.handle(json.loads(payload))
+        replica_time += time.perf_counter() - t0
+        if replica.desynced or replica.world.state_checksum() != world.state_checksum():
+            raise AssertionError(f"replica diverged at tick {world.tick_count}")
+    per_client = ticks * n_players
+    return {
+        "state_bytes": state_bytes / per_client,
+        "input_bytes": input_bytes / per_client,
+        "state_ms": state_time / ticks * 1e3,
+        "input_ms": input_time / ticks * 1e3,
+        "replica_ms": replica_time / ticks * 1e3,
+        "enemies": len(world.enemies),
+        "bullets": len(world.bullets),
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Full state updates vs input-sync messages")
+    p.add_argument("--players", type=int, nargs="+", default=[1, 4, 16])
+    p.add_argument("--ticks", type=int, default=1200)
+    p.add_argument("--max-enemies", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("bytes per client per tick; server ms per tick for all clients; replica ms per tick")
+    print(
+        f"{'players':>7} {'state B':>9} {'input B':>8} {'ratio':>6} "
+        f"{'state ms':>9} {'input ms':>9} {'replica ms':>10} {'enemies':>8} {'bullets':>8}"
+    )
+    for n in args.players:
+        r = _run(n, args.ticks, args.seed, args.max_enemies)
+        print(
+            f"{n:>7} {r['state_bytes']:>9.0f} {r['input_bytes']:>8.0f} "
+            f"{r['state_bytes'] / r['input_bytes']:>5.1f}x {r['state_ms']:>9.3f} {r['input_ms']:>9.3f} "
+            f"{r['replica_ms']:>10.3f} {r['enemies']:>8} {r['bullets']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cost of rendering BulletHellEnv frames: the rgb_array mode against the previous render.
+
+"legacy" is the render the env had before rgb_array: pygame.display.set_mode on every
+frame, then one draw call per entity (it never cleared the screen). It runs on SDL's
+dummy video driver here, so no window opens and the numbers are the drawing overhead
+alone, without waiting on a real display. "rgb_array" redraws the cached offscreen frame
+with one fill and one Surface.blits and returns the frame array (no copy). Both render
+after every step of the same seeded episode; the player is kept alive so the world fills
+up over --steps.
+
+Example:
+  python benchmarks/bench_render.py --steps 1000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+IMMORTAL_HEALTH = 10**12
+
+
+def _legacy_render(env: BulletHellEnv) -> None:
+    if not pygame.get_init():
+        pygame.init()
+    screen = pygame.display.set_mode((env.screen_width, env.screen_height))
+    pygame.display.set_caption("Bullet Hell Environment")
+    env.player.draw(screen, 0, 0)
+    for enemy in env.enemies:
+        enemy.draw(screen, 0, 0)
+    for bullet in env.bullets:
+        bullet.draw(screen, 0, 0)
+    pygame.display.flip()
+
+
+def _run(mode: str, steps: int, seed: int) -> tuple[float, float, int]:
+    """(step seconds, render seconds, bullets at the end) for one episode."""
+    env = BulletHellEnv(render_mode="rgb_array" if mode == "rgb_array" else "terminal", flat=True)
+    env.reset(seed=seed)
+    render = env.render if mode == "rgb_array" else (lambda: _legacy_render(env))
+    step_time = render_time = 0.0
+    for i in range(steps):
+        env.player.health = IMMORTAL_HEALTH
+        t0 = time.perf_counter()
+        env.step(i % 20)
+        t1 = time.perf_counter()
+        if mode != "none":
+            render()
+        step_time += t1 - t0
+        render_time += time.perf_counter() - t1
+    bullets = len(env.bullets)
+    env.close()
+    if mode == "legacy":
+        pygame.quit()
+    return step_time, render_time, bullets
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="BulletHellEnv rgb_array render vs the previous render")
+    p.add_argument("--steps", type=int, default=1000)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print(f"{args.steps} steps, SDL_VIDEODRIVER={os.environ['SDL_VIDEODRIVER']}")
+    print(f"{'mode':>9} {'step us':>8} {'render us':>9} {'steps/s':>8} {'bullets':>7}")
+    for mode in ("none", "legacy", "rgb_array"):
+        step_time, render_time, bullets = _run(mode, args.steps, args.seed)
+        total = step_time + render_time
+        print(
+            f"{mode:>9} {step_time / args.steps * 1e6:>8.0f} {render_time / args.steps * 1e6:>9.0f} "
+            f"{args.steps / total:>8.0f} {bullets:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
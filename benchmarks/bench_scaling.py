@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+How tick cost scales with world size and entity counts, headless.
+
+For every bullet count (default 10 -> 10,000) and path, a fresh process builds a world of
+--world-size pixels, holds the live population at --enemies enemies and the given number
+of bullets (topped up between ticks, outside the timing; the players cannot die), and
+times --ticks ticks:
+
+  env    - BulletHellEnv.step: the world tick plus observation and reward
+  server - the run_server tick with --players clients: world.step plus building and
+           JSON-encoding every client's state update
+
+Reported per run: ticks/sec, ms per tick split into WorldSimulator.phase_times phases
+(spawn, players, enemy_ai, enemy_collisions, bullets) plus the path's own work
+(observation / broadcast), peak RSS of the process, and whether the tick fits the 60 Hz
+budget (16.7 ms). Results go to stdout as a table and, with --json, to a file.
+
+Example:
+  python benchmarks/bench_scaling.py --world-size 2000 2000 --enemies 50 --players 8 \\
+      --bullets 10 100 1000 10000 --json scaling.json
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import BULLET_DAMAGE, PLAYER_HEALTH_MAX, WORLD_HEIGHT, WORLD_WIDTH
+from bullet_hell_rl.world import WorldSimulator
+
+BUDGET_MS = 1000 / 60
+IMMORTAL_HEALTH = PLAYER_HEALTH_MAX * 10**9  # players never die, so populations stay put
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _top_up(world: WorldSimulator, n_enemies: int, n_bullets: int, rng: np.random.Generator) -> None:
+    """Refill enemies and bullets to the target counts; half the bullets are the players'."""
+    for player in world.players.values():
+        player.health = IMMORTAL_HEALTH
+    while len(world.enemies) < n_enemies:
+        world.spawn_enemy()
+    missing = n_bullets - len(world.bullets)
+    if missing > 0:
+        owners = list(world.players)
+        xs = rng.uniform(0, world.world_width, missing).tolist()
+        ys = rng.uniform(0, world.world_height, missing).tolist()
+        angles = rng.uniform(0, 360, missing).tolist()
+        friendly = (rng.random(missing) < 0.5).tolist()
+        for i, (x, y, angle, is_friendly) in enumerate(zip(xs, ys, angles, friendly)):
+            owner = owners[i % len(owners)] if is_friendly else None
+            world.bullets.spawn(x, y, angle, BULLET_DAMAGE, is_friendly, owner)
+
+
+def _run_env(cfg: dict, rng: np.random.Generator):
+    from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+    env = BulletHellEnv(world_width=cfg["world_width"], world_height=cfg["world_height"])
+    env.reset(seed=cfg["seed"])
+    actions = [
+        {"move": int(m), "fire_angle": np.array([a], dtype=np.int16)}
+        for m, a in zip(rng.integers(0, 5, 64), rng.integers(0, 271, 64))
+    ]
+
+    def tick(i: int) -> float:
+        t0 = time.perf_counter()
+        env.step(actions[i % len(actions)])
+        return time.perf_counter() - t0
+
+    return env.world, tick, "observation"
+
+
+def _run_server(cfg: dict, rng: np.random.Generator):
+    from bullet_hell_rl.net.input_sync import world_actions
+    from bullet_hell_rl.net.state import bullet_states, build_update, enemy_state
+
+    world = WorldSimulator(
+        tick_ms=1000 / cfg["tick_rate"],
+        player_ids=range(cfg["players"]),
+        initial_enemies=0,
+        respawn_dead_players=True,
+        seed=cfg["seed"],
+        world_width=cfg["world_width"],
+        world_height=cfg["world_height"],
+    )
+    flat = rng.integers(0, 20, size=(64, cfg["players"])).tolist()
+
+    def tick(i: int) -> float:
+        t0 = time.perf_counter()
+        world.step(world_actions(dict(enumerate(flat[i % len(flat)]))))
+        enemies = [enemy_state(e) for e in world.enemies]
+        bullets = bullet_states(world.bullets)
+        members = list(world.players.items())
+        for pid in world.players:
+            json.dumps(build_update(pid, members, enemies, bullets, world.tick_count)).encode("utf-8")
+        return time.perf_counter() - t0
+
+    return world, tick, "broadcast"
+
+
+def run_config(cfg: dict) -> dict:
+    """Time one configuration (meant to run in its own process, for a clean peak RSS)."""
+    rng = np.random.default_rng(cfg["seed"])
+    world, tick, own_phase = (_run_env if cfg["path"] == "env" else _run_server)(cfg, rng)
+    total = 0.0
+    live_enemies = live_bullets = 0
+    for i in range(cfg["warmup"] + cfg["ticks"]):
+        _top_up(world, cfg["enemies"], cfg["bullets"], rng)
+        if i == cfg["warmup"]:
+            world.phase_times = {}
+        elapsed = tick(i)
+        if i >= cfg["warmup"]:
+            total += elapsed
+            live_enemies += len(world.enemies)
+            live_bullets += len(world.bullets)
+    ticks = cfg["ticks"]
+    phases = {name: world.phase_times.get(name, 0.0) / ticks * 1e3 for name in WorldSimulator.PHASES}
+    ms_per_tick = total / ticks * 1e3
+    phases[own_phase] = max(0.0, ms_per_tick - sum(phases.values()))
+    return {
+        **cfg,
+        "ticks_per_sec": ticks / total,
+        "ms_per_tick": ms_per_tick,
+        "within_60hz": ms_per_tick <= BUDGET_MS,
+        "phase_ms": phases,
+        "mean_enemies": live_enemies / ticks,
+        "mean_bullets": live_bullets / ticks,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Tick cost vs world size and entity counts")
+    p.add_argument("--paths", nargs="+", choices=["env", "server"], default=["env", "server"])
+    p.add_argument("--world-size", type=int, nargs=2, default=[WORLD_WIDTH, WORLD_HEIGHT],
+                   metavar=("WIDTH", "HEIGHT"))
+    p.add_argument("--bullets", type=int, nargs="+", default=[10, 30, 100, 300, 1000, 3000, 10000])
+    p.add_argument("--enemies", type=int, default=20)
+    p.add_argument("--players", type=int, default=4, help="Clients on the server path (env has one)")
+    p.add_argument("--tick-rate", type=float, default=60, help="Server path ticks per second")
+    p.add_argument("--ticks", type=int, default=300)
+    p.add_argument("--warmup", type=int, default=30)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", type=Path, default=None, help="Write all results to this file")
+    p.add_argument("--in-process", action="store_true",
+                   help="Run every configuration in this process (peak RSS becomes cumulative)")
+    args = p.parse_args()
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    phase_names = list(WorldSimulator.PHASES)
+    print(f"world {args.world_size[0]}x{args.world_size[1]}, {args.enemies} enemies; ms per tick")
+    print(
+        f"{'path':>6} {'bullets':>7} {'ticks/s':>8} {'ms/tick':>8} "
+        + " ".join(f"{name[:9]:>9}" for name in phase_names + ["own"])
+        + f" {'RSS MB':>7} {'60Hz':>5}"
+    )
+    for path in args.paths:
+        for n_bullets in args.bullets:
+            cfg = {
+                "path": path,
+                "world_width": args.world_size[0],
+                "world_height": args.world_size[1],
+                "enemies": args.enemies,
+                "bullets": n_bullets,
+                "players": 1 if path == "env" else args.players,
+                "tick_rate": args.tick_rate,
+                "ticks": args.ticks,
+                "warmup": args.warmup,
+                "seed": args.seed,
+            }
+            if args.in_process:
+                r = run_config(cfg)
+            else:
+                with ctx.Pool(1) as pool:
+                    r = pool.apply(run_config, (cfg,))
+            results.append(r)
+            own = r["phase_ms"]["observation" if path == "env" else "broadcast"]
+            rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "n/a"
+            print(
+                f"{path:>6} {n_bullets:>7} {r['ticks_per_sec']:>8.0f} {r['ms_per_tick']:>8.3f} "
+                + " ".join(f"{r['phase_ms'][name]:>9.3f}" for name in phase_names)
+                + f" {own:>9.3f} {rss:>7} {'yes' if r['within_60hz'] else 'NO':>5}"
+            )
+    for path in args.paths:
+        over = [r["bullets"] for r in results if r["path"] == path and not r["within_60hz"]]
+        if over:
+            print(f"{path}: over the {BUDGET_MS:.1f} ms budget from {min(over)} bullets")
+        else:
+            print(f"{path}: within the {BUDGET_MS:.1f} ms budget at every bullet count")
+    if args.json is not None:
+        args.json.write_text(json.dumps({"budget_ms": BUDGET_MS, "results": results}, indent=2))
+        print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Timer bookkeeping per tick: polling every enemy versus the world's TimerScheduler.
+
+Each enemy has a shoot timer (SHOOT_INTERVAL_ENEMY) and an action timer
+(ENEMY_ACTION_INTERVAL), staggered so a realistic trickle comes due each tick.
+  poll   - the old loop: test current_time - last >= interval for both timers of every enemy
+  heap   - pop only the due timers from two TimerSchedulers and re-arm them
+Both do the same work on a due timer (reset it); the fire counts are checked to match.
+
+Example:
+  python benchmarks/bench_scheduler.py --enemies 100 1000 5000 20000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import ENEMY_ACTION_INTERVAL, SHOOT_INTERVAL_ENEMY
+from bullet_hell_rl.scheduler import TimerScheduler
+
+TICK_MS = 1000 / 60
+
+
+class _Timers:
+    __slots__ = ("shoot_timer", "last_action_time")
+
+    def __init__(self, shoot_timer, last_action_time):
+        self.shoot_timer = shoot_timer
+        self.last_action_time = last_action_time
+
+
+def _make(n: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        _Timers(-rng.uniform(0, SHOOT_INTERVAL_ENEMY), -rng.uniform(0, ENEMY_ACTION_INTERVAL))
+        for _ in range(n)
+    ]
+
+
+def _poll(enemies, ticks: int) -> tuple[float, int]:
+    fired = 0
+    now = 0.0
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        now += TICK_MS
+        for e in enemies:
+            if now - e.shoot_timer >= SHOOT_INTERVAL_ENEMY:
+                e.shoot_timer = now
+                fired += 1
+            if now - e.last_action_time >= ENEMY_ACTION_INTERVAL:
+                e.last_action_time = now
+                fired += 1
+    return (time.perf_counter() - t0) / ticks, fired
+
+
+def _heap(enemies, ticks: int) -> tuple[float, int]:
+    shots, actions = TimerScheduler(), TimerScheduler()
+    for key, e in enumerate(enemies):
+        shots.schedule(key, e.shoot_timer, SHOOT_INTERVAL_ENEMY)
+        actions.schedule(key, e.last_action_time, ENEMY_ACTION_INTERVAL)
+    fired = 0
+    now = 0.0
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        now += TICK_MS
+        for key in shots.pop_due(now):
+            enemies[key].shoot_timer = now
+            shots.schedule(key, now, SHOOT_INTERVAL_ENEMY)
+            fired += 1
+        for key in actions.pop_due(now):
+            enemies[key].last_action_time = now
+            actions.schedule(key, now, ENEMY_ACTION_INTERVAL)
+            fired += 1
+    return (time.perf_counter() - t0) / ticks, fired
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Polling vs heap scheduler for entity timers")
+    p.add_argument("--enemies", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    p.add_argument("--ticks", type=int, default=600)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("times are ms per tick")
+    print(f"{'enemies':>8} {'poll':>9} {'heap':>9} {'speedup':>8} {'fires/tick':>11}")
+    for n in args.enemies:
+        t_poll, fired_poll = _poll(_make(n, args.seed), args.ticks)
+        t_heap, fired_heap = _heap(_make(n, args.seed), args.ticks)
+        if fired_poll != fired_heap:
+            raise AssertionError(f"scheduler fired {fired_heap} timers, polling fired {fired_poll}")
+        print(
+            f"{n:>8} {t_poll * 1e3:>9.3f} {t_heap * 1e3:>9.3f} {t_poll / t_heap:>7.1f}x "
+            f"{fired_poll / args.ticks:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Process startup cost of the headless core versus the old pygame-at-import behaviour.
+
+Each scenario runs in a fresh interpreter that imports what a real process imports and
+builds its first world, then reports wall time and peak RSS. The "+pygame" rows prepend
+``import pygame; pygame.init()`` to the same scenario, which is what every server, env
+worker and learner paid when bullethell.py initialised pygame at import time.
+
+Example:
+  python benchmarks/bench_startup.py --repeats 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+
+SCENARIOS = {
+    # run_server.py: import the net package and create the world the server loop uses
+    "server": (
+        "from bullet_hell_rl.net import run_server\n"
+        "from bullet_hell_rl.world import WorldSimulator\n"
+        "WorldSimulator(initial_enemies=3, respawn_dead_players=True)\n"
+    ),
+    # env subprocess: construct and reset one BulletHellEnv
+    "env": (
+        "from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv\n"
+        "env = BulletHellEnv()\n"
+        "env.reset(seed=0)\n"
+    ),
+}
+
+PYGAME_PRELUDE = (
+    "import os\n"
+    "os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')\n"
+    "os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')\n"
+    "import pygame\n"
+    "pygame.init()\n"
+)
+
+CHILD = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {src!r})
+{body}
+elapsed = time.perf_counter() - t0
+import json, resource
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_kb / 1024, "pygame": "pygame" in sys.modules}}))
+"""
+
+
+def _run_once(body: str) -> dict:
+    code = CHILD.format(src=SRC, body=body)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Startup time / RSS of headless core vs pygame init")
+    p.add_argument("--repeats", type=int, default=5)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    results = []
+    for name, body in SCENARIOS.items():
+        for label, prelude in ((name, ""), (name + "+pygame", PYGAME_PRELUDE)):
+            runs = [_run_once(prelude + body) for _ in range(args.repeats)]
+            results.append({
+                "scenario": label,
+                "seconds_median": statistics.median(r["seconds"] for r in runs),
+                "rss_mb_median": statistics.median(r["rss_mb"] for r in runs),
+                "pygame_loaded": runs[0]["pygame"],
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'scenario':<16} {'startup ms':>11} {'peak RSS MB':>12} {'pygame':>7}")
+    for r in results:
+        print(
+            f"{r['scenario']:<16} {r['seconds_median'] * 1e3:>11.1f} {r['rss_mb_median']:>12.1f} "
+            f"{str(r['pygame_loaded']):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Cost of saving and restoring a world: WorldSimulator.get_state / set_state and the
+BulletHellEnv wrappers, against replaying the warm-up ticks to get back to the same state.
+
+For each warm-up length the env plays random actions for that many steps (states get
+denser as enemies accumulate), then times
+  get       - env.get_state()
+  set       - env.set_state(blob)
+  world get / world set - the WorldSimulator calls alone
+  replay    - reset(seed) + re-stepping the warm-up actions, the only option before
+A restored env must reproduce the next --check steps of the original exactly.
+
+Example:
+  python benchmarks/bench_state.py --warmup 50 200 500 --repeats 200
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+
+def _actions(n: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {"move": int(rng.integers(5)), "fire_angle": np.array([int(rng.integers(4)) * 90], dtype=np.int16)}
+        for _ in range(n)
+    ]
+
+
+def _play(env: BulletHellEnv, actions: list[dict]) -> list:
+    out = []
+    for action in actions:
+        obs, reward, terminated, truncated, _ = env.step(action)
+        out.append((reward, terminated, obs["player"].tobytes(), obs["enemies"].tobytes(), obs["bullets"].tobytes()))
+        if terminated:
+            break
+    return out
+
+
+def _time(fn, repeats: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="World snapshot/restore cost vs replaying warm-up")
+    p.add_argument("--warmup", type=int, nargs="+", default=[50, 200, 500])
+    p.add_argument("--repeats", type=int, default=200)
+    p.add_argument("--check", type=int, default=50)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("times in microseconds; replay is reset + warm-up steps")
+    print(
+        f"{'warmup':>6} {'enemies':>7} {'bullets':>7} {'bytes':>6} {'get':>8} {'set':>8} "
+        f"{'world get':>9} {'world set':>9} {'replay':>10}"
+    )
+    for warmup in args.warmup:
+        actions = _actions(warmup + args.check, args.seed)
+        env = BulletHellEnv()
+        # Immortal player, so every warm-up length reaches a dense state
+        env.reset(seed=args.seed)
+        env.player.health = float("inf")
+        _play(env, actions[:warmup])
+        env.player.health = 100
+        env.player_previous_health = 100
+
+        blob = env.get_state()
+        world_blob = env.world.get_state()
+        t_get = _time(env.get_state, args.repeats)
+        t_set = _time(lambda: env.set_state(blob), args.repeats)
+        t_world_get = _time(env.world.get_state, args.repeats)
+        t_world_set = _time(lambda: env.world.set_state(world_blob), args.repeats)
+        n_enemies, n_bullets = len(env.enemies), len(env.bullets)
+
+        env.set_state(blob)
+        expected = _play(env, actions[warmup:])
+        fork = BulletHellEnv()
+        fork.set_state(blob)
+        if _play(fork, actions[warmup:]) != expected:
+            raise AssertionError(f"restored env diverged after warm-up {warmup}")
+
+        replay_env = BulletHellEnv()
+
+        def replay():
+            replay_env.reset(seed=args.seed)
+            replay_env.player.health = float("inf")
+            _play(replay_env, actions[:warmup])
+
+        t_replay = _time(replay, max(1, args.repeats // 50))
+        print(
+            f"{warmup:>6} {n_enemies:>7} {n_bullets:>7} {len(blob):>6} {t_get * 1e6:>8.1f} {t_set * 1e6:>8.1f} "
+            f"{t_world_get * 1e6:>9.1f} {t_world_set * 1e6:>9.1f} {t_replay * 1e6:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
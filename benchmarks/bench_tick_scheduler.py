@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Server tick pacing: the previous sleep(1 / tick_rate) loop against FixedRateScheduler.
+
+Each mode runs a tick loop for --seconds of wall time. A tick busy-waits --work-ms (the
+simulate-and-send cost), and every --spike-every ticks one tick takes --spike-ms instead
+(a GC pause or a burst of bullets):
+  sleep     - the previous server loop: work, then time.sleep(1 / tick_rate)
+  catch_up  - FixedRateScheduler, overdue ticks run back to back
+  drop      - FixedRateScheduler, missed deadlines skipped
+"sim lag" is wall time minus simulated time (ticks / tick_rate) at the end: how far the
+world fell behind real time. The percentiles and counts come from the scheduler's
+report(); for "sleep" they are measured the same way.
+
+Example:
+  python benchmarks/bench_tick_scheduler.py --tick-rate 60 --work-ms 2 8 --seconds 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.net.tick_scheduler import FixedRateScheduler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _run(mode: str, tick_rate: float, work: float, spike: float, spike_every: int, seconds: float):
+    scheduler = FixedRateScheduler(tick_rate, policy="catch_up" if mode == "sleep" else mode)
+    t0 = time.perf_counter()
+    scheduler.report()
+    while time.perf_counter() - t0 < seconds:
+        scheduler.begin_tick()
+        _busy(spike if spike_every and (scheduler.ticks + 1) % spike_every == 0 else work)
+        if mode == "sleep":
+            scheduler.end_tick()
+            time.sleep(1.0 / tick_rate)
+        else:
+            scheduler.wait()
+    wall = time.perf_counter() - t0
+    return scheduler.report(), wall - scheduler.ticks / tick_rate
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Fixed-rate tick scheduler vs sleep(1 / tick_rate)")
+    p.add_argument("--tick-rate", type=float, default=60)
+    p.add_argument("--work-ms", type=float, nargs="+", default=[2.0, 8.0])
+    p.add_argument("--spike-ms", type=float, default=50.0)
+    p.add_argument("--spike-every", type=int, default=100, help="0 disables spikes")
+    p.add_argument("--seconds", type=float, default=3.0)
+    args = p.parse_args()
+
+    print(f"tick rate {args.tick_rate}/s (budget {1000 / args.tick_rate:.2f}ms), "
+          f"{args.spike_ms}ms spike every {args.spike_every} ticks")
+    print(f"{'work ms':>7} {'mode':>8} {'ticks/s':>7} {'sim lag s':>9} {'p50 ms':>6} {'p99 ms':>6} "
+          f"{'overrun':>7} {'late':>5} {'dropped':>7}")
+    for work_ms in args.work_ms:
+        for mode in ("sleep", "catch_up", "drop"):
+            stats, lag = _run(mode, args.tick_rate, work_ms / 1000, args.spike_ms / 1000,
+                              args.spike_every, args.seconds)
+            late = "-" if mode == "sleep" else stats["ticks_late"]
+            dropped = "-" if mode == "sleep" else stats["ticks_dropped"]
+            print(
+                f"{work_ms:>7.1f} {mode:>8} {stats['achieved_tick_rate']:>7.1f} {lag:>9.3f} "
+                f"{stats['tick_ms_p50']:>6.2f} {stats['tick_ms_p99']:>6.2f} "
+                f"{stats['tick_overruns']:>7} {late:>5} {dropped:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
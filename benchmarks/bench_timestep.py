@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Larger timesteps with swept bullet collisions.
+
+1. Tunnelling: player bullets are fired across a stationary enemy along random lanes and
+   stepped at each tick length. The hit rate of the 1 ms discrete run is the reference;
+   discrete tests at 60+ ms miss most hits, swept tests should match the reference.
+2. Throughput: BulletHellEnv steps per second and simulated game seconds per CPU second
+   at each tick length (swept collisions on, as the env uses them).
+
+Example:
+  python benchmarks/bench_timestep.py --tick-ms 15 60 120 240
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import bullet_hell_rl.bullethell as bh
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+
+def _hit_rate(tick_ms: float, swept: bool, shots: int, seed: int) -> float:
+    rng = random.Random(seed)
+    enemy = bh.Enemy(500, 500)
+    dt = tick_ms / 1000
+    hits = 0
+    for _ in range(shots):
+        pool = bh.BulletPool(capacity=1, swept=swept)
+        # Lane offsets span the whole hittable band plus some misses on either side.
+        lane = rng.uniform(-bh.BULLET_SIZE - 5, bh.ENTITY_SIZE + 5)
+        pool.spawn(300 + rng.uniform(0, 100), 500 + lane, 0.0, bh.BULLET_DAMAGE, True)
+        while pool and pool.x[0] < 700:
+            pool.update(dt)
+            if enemy.is_colliding(pool):
+                hits += 1
+                break
+        enemy.health = 1
+    return hits / shots
+
+
+def _throughput(tick_ms: float, steps: int, seed: int) -> tuple[float, float]:
+    env = BulletHellEnv(render_mode=None, tick_ms=tick_ms)
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - t0
+    return steps / elapsed, steps * tick_ms / 1000 / elapsed
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Swept collisions vs timestep benchmark")
+    p.add_argument("--tick-ms", type=float, nargs="+", default=[15, 60, 120, 240])
+    p.add_argument("--shots", type=int, default=500)
+    p.add_argument("--steps", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    reference = _hit_rate(1, False, args.shots, args.seed)
+    print(f"reference hit rate (1 ms, discrete): {reference:.3f}")
+    print(f"{'tick ms':>8} {'discrete':>9} {'swept':>7} {'steps/s':>9} {'sim s / CPU s':>14}")
+    for tick_ms in args.tick_ms:
+        discrete = _hit_rate(tick_ms, False, args.shots, args.seed)
+        swept = _hit_rate(tick_ms, True, args.shots, args.seed)
+        steps_per_s, sim_rate = _throughput(tick_ms, args.steps, args.seed)
+        print(f"{tick_ms:>8.0f} {discrete:>9.3f} {swept:>7.3f} {steps_per_s:>9.0f} {sim_rate:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
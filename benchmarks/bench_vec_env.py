@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Env steps per second: BulletHellVecEnv against N separate BulletHellEnv instances.
+
+For each N both sides play the same random actions for --steps batched steps on one core:
+  loop - N BulletHellEnv, stepped one after another and reset when an episode ends
+         (what SyncVectorEnv does)
+  vec  - one BulletHellVecEnv(num_envs=N) with next-step auto-reset
+Besides throughput the table reports mean reward per step, episodes finished and kills per
+episode, so a speedup that came from playing a different game would show.
+
+Example:
+  python benchmarks/bench_vec_env.py --num-envs 1 16 64 256 --steps 1000 --frame-skip 1
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+from bullet_hell_rl.envs.BulletHellVecEnv import BulletHellVecEnv
+
+
+def _actions(n: int, steps: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 5, size=(steps, n)), rng.integers(0, 271, size=(steps, n, 1)).astype(np.int16)
+
+
+def _run_loop(n: int, moves, angles, seed: int, frame_skip: int) -> dict:
+    envs = [BulletHellEnv(frame_skip=frame_skip) for _ in range(n)]
+    for i, env in enumerate(envs):
+        env.reset(seed=seed + i)
+    reward = 0.0
+    episodes = kills = 0
+    t0 = time.perf_counter()
+    for move, angle in zip(moves, angles):
+        for env, m, a in zip(envs, move.tolist(), angle):
+            _, r, terminated, truncated, info = env.step({"move": m, "fire_angle": a})
+            reward += r
+            if terminated or truncated:
+                episodes += 1
+                kills += info["kill_count"]
+                env.reset()
+    elapsed = time.perf_counter() - t0
+    return {"elapsed": elapsed, "reward": reward, "episodes": episodes, "kills": kills}
+
+
+def _run_vec(n: int, moves, angles, seed: int, frame_skip: int) -> dict:
+    env = BulletHellVecEnv(num_envs=n, frame_skip=frame_skip)
+    env.reset(seed=seed)
+    reward = 0.0
+    episodes = kills = 0
+    t0 = time.perf_counter()
+    for move, angle in zip(moves, angles):
+        _, r, terminated, truncated, info = env.step({"move": move, "fire_angle": angle})
+        reward += float(r.sum())
+        done = terminated | truncated
+        episodes += int(done.sum())
+        kills += int(info["kill_count"][done].sum())
+    elapsed = time.perf_counter() - t0
+    return {"elapsed": elapsed, "reward": reward, "episodes": episodes, "kills": kills}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="BulletHellVecEnv vs N separate BulletHellEnv")
+    p.add_argument("--num-envs", type=int, nargs="+", default=[1, 16, 64, 256])
+    p.add_argument("--steps", type=int, default=1000, help="Batched steps per run")
+    p.add_argument("--frame-skip", type=int, default=1)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    print("env steps per second on one core; reward is the mean per env step")
+    print(
+        f"{'N':>5} {'loop st/s':>10} {'vec st/s':>10} {'speedup':>8} "
+        f"{'loop rew':>9} {'vec rew':>9} {'loop eps':>9} {'vec eps':>8} {'loop k/ep':>9} {'vec k/ep':>9}"
+    )
+    for n in args.num_envs:
+        moves, angles = _actions(n, args.steps, args.seed)
+        loop = _run_loop(n, moves, angles, args.seed, args.frame_skip)
+        vec = _run_vec(n, moves, angles, args.seed, args.frame_skip)
+        total = n * args.steps
+        loop_rate = total / loop["elapsed"]
+        vec_rate = total / vec["elapsed"]
+        print(
+            f"{n:>5} {loop_rate:>10.0f} {vec_rate:>10.0f} {vec_rate / loop_rate:>7.1f}x "
+            f"{loop['reward'] / total:>9.3f} {vec['reward'] / total:>9.3f} "
+            f"{loop['episodes']:>9} {vec['episodes']:>8} "
+            f"{loop['kills'] / max(1, loop['episodes']):>9.2f} {vec['kills'] / max(1, vec['episodes']):>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Check a simulation engine against the golden traces in golden_traces/.
+
+Exits non-zero and prints the first divergence (trace, episode, step, field, values) if
+any trace does not replay within tolerance. With no engine options this checks the
+current code, so run it after every change to the simulation; an alternative backend
+passes when it replays every trace:
+
+  python check_golden_traces.py
+  python check_golden_traces.py --env-engine mypkg.fast_env:FastBulletHellEnv \\
+      --world-engine mypkg.fast_world:FastWorld
+  python check_golden_traces.py --record    # re-record after an intended behaviour change
+
+The baseline traces (recorded from the engine before the simulation rewrite) always replay
+against golden.baseline_env_engine; --record leaves them alone, --record-baseline re-records
+them from a checkout of that commit. pytest runs the same check (tests/test_golden_traces.py).
+See bullet_hell_rl/golden.py for what is recorded, the engine interface and the behaviour
+that changed on purpose since the baseline.
+"""
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from bullet_hell_rl.golden import (
+    BASELINE_REVISION,
+    BASELINE_TRACES,
+    DEFAULT_ATOL,
+    DEFAULT_RTOL,
+    GOLDEN_TRACES,
+    load_trace,
+    record_baseline_traces,
+    record_trace,
+    replay_trace,
+    save_trace,
+)
+
+TRACE_DIR = Path(__file__).resolve().parent / "golden_traces"
+
+
+def _load_engine(spec: str | None):
+    """'package.module:attribute' -> the factory it names (None keeps the reference engine)."""
+    if spec is None:
+        return None
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise SystemExit(f"engine must look like package.module:Factory, got {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Replay golden traces against a simulation engine")
+    p.add_argument("traces", nargs="*", default=[*GOLDEN_TRACES, *BASELINE_TRACES],
+                   help="Trace names (default: all)")
+    p.add_argument("--env-engine", default=None, help="module:factory building BulletHellEnv-like envs")
+    p.add_argument("--world-engine", default=None, help="module:factory building WorldSimulator-like worlds")
+    p.add_argument("--atol", type=float, default=DEFAULT_ATOL, help="Absolute float tolerance")
+    p.add_argument("--rtol", type=float, default=DEFAULT_RTOL, help="Relative float tolerance")
+    p.add_argument("--dir", type=Path, default=TRACE_DIR, help="Golden trace directory")
+    p.add_argument("--record", action="store_true",
+                   help="Record the traces with the given (default: reference) engine instead of checking")
+    p.add_argument("--record-baseline", type=Path, default=None, metavar="BASELINE_SRC",
+                   help=f"Record the baseline traces from the src/ directory of a {BASELINE_REVISION} checkout")
+    args = p.parse_args()
+
+    known = {**GOLDEN_TRACES, **BASELINE_TRACES}
+    unknown = [name for name in args.traces if name not in known]
+    if unknown:
+        raise SystemExit(f"unknown traces {unknown}; known: {sorted(known)}")
+    engines = {"env": _load_engine(args.env_engine), "server": _load_engine(args.world_engine)}
+
+    if args.record_baseline is not None:
+        args.dir.mkdir(parents=True, exist_ok=True)
+        record_baseline_traces(args.record_baseline, args.dir, [n for n in args.traces if n in BASELINE_TRACES])
+        return
+    if args.record:
+        args.dir.mkdir(parents=True, exist_ok=True)
+        for name in args.traces:
+            if name in BASELINE_TRACES:
+                continue  # only the baseline engine records these (--record-baseline)
+            engine = engines[GOLDEN_TRACES[name]["kind"]]
+            trace = record_trace(name, engine=engine)
+            path = args.dir / f"{name}.json.gz"
+            save_trace(trace, path)
+            print(f"recorded {name}: {sum(len(f) for f in trace['frames'])} frames -> {path}")
+        return
+
+    failed = 0
+    for name in args.traces:
+        path = args.dir / f"{name}.json.gz"
+        trace = load_trace(path)
+        t0 = time.perf_counter()
+        # Baseline traces check the reference engine's history, not alternative backends
+        engine = None if name in BASELINE_TRACES else engines[trace["kind"]]
+        divergence = replay_trace(trace, engine, atol=args.atol, rtol=args.rtol)
+        elapsed = time.perf_counter() - t0
+        frames = sum(len(f) for f in trace["frames"])
+        if divergence is None:
+            print(f"ok   {name}: {frames} frames in {elapsed:.2f}s")
+        else:
+            failed += 1
+            print(f"FAIL {divergence}")
+    if failed:
+        print(f"{failed} of {len(args.traces)} traces diverged")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
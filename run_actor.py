@@ -29,6 +29,8 @@ def main() -> None:
         default=None,
         help="Optional legacy .h5 to load if shared weights are missing",
     )
+    p.add_argument("--headless", action="store_true",
+                   help="No window or drawing; with a --lockstep server, act as fast as it ticks")
     args = p.parse_args()
     weights = args.weights or os.environ.get("SHARED_WEIGHTS", "shared_weights.h5")
     bootstrap = args.bootstrap or os.environ.get("BOOTSTRAP_WEIGHTS")
@@ -38,6 +40,7 @@ def main() -> None:
         token=args.token,
         weights_path=weights,
         bootstrap_weights_path=bootstrap,
+        headless=args.headless,
     )
 
 
@@ -8,6 +8,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
 
 from bullet_hell_rl.net import run_server
+from bullet_hell_rl.net.server import STRAGGLER_TIMEOUT, TICK_RATE
+from bullet_hell_rl.net.tick_scheduler import MAX_CATCH_UP_TICKS, TICK_POLICIES
+from bullet_hell_rl.world import FIXED_POINT_TICK_RATE
 
 
 def main() -> None:
@@ -15,8 +18,47 @@ def main() -> None:
     p.add_argument("--host", default="0.0.0.0", help="Bind host")
     p.add_argument("--port", type=int, default=5555, help="Bind port")
     p.add_argument("--secret", default=None, help="Optional token clients must send to join")
+    p.add_argument("--tick-rate", type=float, default=None,
+                   help=f"Simulation ticks per second (default: {TICK_RATE}, or {FIXED_POINT_TICK_RATE} with --input-sync)")
+    p.add_argument("--max-enemies", type=int, default=None,
+                   help="Cap on live enemies; spawning pauses at the cap (default: unbounded)")
+    p.add_argument("--max-bullets", type=int, default=None,
+                   help="Cap on live bullets; oldest are retired first (default: unbounded)")
+    p.add_argument("--seed", type=int, default=None, help="Seed for the world's random stream")
+    p.add_argument("--input-sync", action="store_true",
+                   help="Send per-tick inputs instead of full state; clients simulate a replica "
+                        "(deterministic fixed-point world, needs a power-of-two tick rate)")
+    p.add_argument("--lockstep", action="store_true",
+                   help="Advance a tick as soon as every actor has acted on the previous one "
+                        "instead of at --tick-rate (training; run actors with --headless)")
+    p.add_argument("--straggler-timeout", type=float, default=STRAGGLER_TIMEOUT,
+                   help=f"With --lockstep, seconds to wait for a slow actor before advancing "
+                        f"without it (default: {STRAGGLER_TIMEOUT})")
+    p.add_argument("--tick-policy", choices=TICK_POLICIES, default="catch_up",
+                   help="When a tick ends past the next deadline: run overdue ticks back to back "
+                        "(catch_up) or skip the missed deadlines (drop) (default: catch_up)")
+    p.add_argument("--max-catch-up", type=int, default=MAX_CATCH_UP_TICKS,
+                   help=f"With --tick-policy catch_up, most overdue ticks run back to back; older "
+                        f"deadlines are dropped (default: {MAX_CATCH_UP_TICKS})")
+    p.add_argument("--tick-metrics", action="store_true",
+                   help="Append tick-time percentiles and overrun counts to the training metrics "
+                        "CSV (RL_METRICS_LOG) every report")
     args = p.parse_args()
-    run_server(host=args.host, port=args.port, secret=args.secret)
+    run_server(
+        host=args.host,
+        port=args.port,
+        secret=args.secret,
+        tick_rate=args.tick_rate,
+        max_enemies=args.max_enemies,
+        max_bullets=args.max_bullets,
+        seed=args.seed,
+        input_sync=args.input_sync,
+        lockstep=args.lockstep,
+        straggler_timeout=args.straggler_timeout,
+        tick_policy=args.tick_policy,
+        max_catch_up=args.max_catch_up,
+        tick_metrics=args.tick_metrics,
+    )
 
 
 if __name__ == "__main__":
@@ -72,6 +72,8 @@ class  DeepQLearning:
         self.modelFileName = modelFileName
         self.episodeIndex = 0
         self._rl_config = rl_config
+        # BulletHellEnv(flat=True) emits flat observations and takes flat action indices
+        self._flat_env = getattr(env, "flat", False)
         
         self.stepCount = 0
         if rl_config is not None:
@@ -199,7 +201,11 @@ class  DeepQLearning:
     def _flatten_obs(self, obs):
         """
         Flatten BulletHellEnv dict observation into a 1D vector of length self.stateDimension.
+        A flat env (BulletHellEnv(flat=True)) already returns that vector, so it is only
+        copied (with reuse_obs=True it is the buffer the env refills every step).
         """
+        if self._flat_env:
+            return obs.copy()
         player = obs["player"].ravel()
         enemies = obs["enemies"].ravel()
         bullets = obs["bullets"].ravel()
@@ -209,8 +215,10 @@ class  DeepQLearning:
         """
         Map flat action index in [0, 20] to BulletHellEnv dict action.
         Move: 0-4. Aim: 0, 90, 180, 360 (4 choices).
+        A flat env takes the index itself.
         """
-        
+        if self._flat_env:
+            return flat_action
         move = int(flat_action // 4)
         angle = int(flat_action % 4) * 90
         fire_angle = np.array([angle], dtype=np.int16)
@@ -1,5 +1,5 @@
 """
-Append-only CSV metrics log for actor and learner processes (cross-process safe via file lock).
+Append-only CSV metrics log for actor, learner and server processes (cross-process safe via file lock).
 
 Location
 --------
@@ -9,6 +9,9 @@ Location
 Format
 ------
 - UTF-8 CSV with a header row written once when the file is created (empty or missing).
+- A file whose header is not the current schema (written before columns were added) is
+  renamed to ``<name>.<mtime>.csv`` and a fresh file is started, so new rows never land
+  under an old header. Each process checks a log's header once, on its first append.
 - One row per logged event. Unused columns are empty (``""``).
 - Booleans are stored as ``1`` or ``0``.
 - ``hidden_units`` (from RL config) is stored as a ``;``-separated list, e.g. ``128;56``.
@@ -22,6 +25,9 @@ Row kinds (``event`` column)
    player dies (single row per death transition).
 4. ``config`` (``source`` ``actor`` or ``learner``): flattened ``ActorLearnerRLConfig`` fields
    (no nested ``rl_config`` column).
+5. ``tick_stats`` (``source`` ``server``, with ``run_server(tick_metrics=True)``): tick-time
+   percentiles, achieved tick rate and overrun / late / dropped tick counts since the previous
+   row (``FixedRateScheduler.report``).
 
 Column order (all rows use this schema)
 ---------------------------------------
@@ -37,7 +43,9 @@ Column order (all rows use this schema)
 ``train_freq``, ``replay_buffer_size``, ``batch_size``, ``target_network_period``,
 ``weights_publish_every``, ``epsilon_start``, ``number_episodes``,
 ``explore_pure_random_until_selection_index``, ``epsilon_decay_after_selection_index``,
-``epsilon_decay_multiplier``, ``selection_index_divisor``.
+``epsilon_decay_multiplier``, ``selection_index_divisor``,
+``tick``, ``tick_rate``, ``achieved_tick_rate``, ``tick_ms_p50``, ``tick_ms_p95``, ``tick_ms_p99``,
+``tick_ms_max``, ``tick_overruns``, ``ticks_late``, ``ticks_dropped``.
 
 Locking
 -------
@@ -100,6 +108,16 @@ FIELDNAMES: tuple[str, ...] = (
     "epsilon_decay_after_selection_index",
     "epsilon_decay_multiplier",
     "selection_index_divisor",
+    "tick",
+    "tick_rate",
+    "achieved_tick_rate",
+    "tick_ms_p50",
+    "tick_ms_p95",
+    "tick_ms_p99",
+    "tick_ms_max",
+    "tick_overruns",
+    "ticks_late",
+    "ticks_dropped",
 )
 
 _FIELDSET = frozenset(FIELDNAMES)
@@ -141,6 +159,29 @@ def _row_from_merged(merged: dict[str, Any]) -> dict[str, str]:
     return row
 
 
+# Logs this process has checked (or written) the current header of; a log's header only
+# changes when it is rotated, which starts it again under the current header.
+_checked_paths: set[str] = set()
+
+
+def _header_matches(path: str) -> bool:
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    return tuple(header) == FIELDNAMES
+
+
+def _rotated_path(path: str) -> str:
+    """Free name for a superseded log: its modification time before the extension."""
+    root, ext = os.path.splitext(path)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(os.path.getmtime(path)))
+    candidate = f"{root}.{stamp}{ext}"
+    n = 1
+    while os.path.exists(candidate):
+        candidate = f"{root}.{stamp}-{n}{ext}"
+        n += 1
+    return candidate
+
+
 def log_metrics_record(source: str, event: str, fields: Mapping[str, Any]) -> None:
     path = metrics_log_path()
     lock_path = path + ".lock"
@@ -160,6 +201,11 @@ def log_metrics_record(source: str, event: str, fields: Mapping[str, Any]) -> No
     lock = FileLock(lock_path, timeout=15)
     with lock:
         need_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not need_header and path not in _checked_paths and not _header_matches(path):
+            # Older schema: keep that log under a new name and start this one afresh
+            os.replace(path, _rotated_path(path))
+            need_header = True
+        _checked_paths.add(path)
         with open(path, "a", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(
                 f,
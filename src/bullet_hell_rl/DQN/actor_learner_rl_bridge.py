@@ -6,12 +6,22 @@ Observation layout (flat float32, length STATE_DIM from actor_learner_rl_config)
 
 Each entity block uses obs_transform (rel_x, rel_y, rel_v_x, rel_v_y) with positions
 scaled by world size and relative velocities normalized per entity type.
+
+The features and the reward are computed from arrays (build_obs_from_arrays,
+additive_reward); the JSON entry points only unpack the update into rows, and
+BulletHellEnv(obs_mode="bridge", reward_mode="bridge") feeds them from the world directly.
+
+Occupancy grid (optional, build_grid_from_update / build_grid_from_arrays): counts of
+hostile bullets, enemies and allies per cell of a GRID_SIZE x GRID_SIZE window of
+2 * GRID_RADIUS pixels centred on the player, shape (GRID_CHANNELS, GRID_SIZE, GRID_SIZE)
+float32, rows along y. It sees every entity in the window instead of the k nearest and
+needs no sort.
 """
 from __future__ import annotations
 
 import math
 from platform import python_revision
-from typing import Any, Iterable, Mapping, Sequence, TypedDict
+from typing import Any, Mapping, Sequence, TypedDict
 
 import numpy as np
 
@@ -36,6 +46,11 @@ N_HEALTH_FEATURES = 1
 
 CONE_RADIUS = .1 * WORLD_HEIGHT
 
+GRID_SIZE = 16
+GRID_RADIUS = WORLD_HEIGHT / 4
+GRID_CHANNELS = 3  # hostile bullets, enemies, allies
+_GRID_CELL = 2 * GRID_RADIUS / GRID_SIZE
+
 _EXPECTED_DIM = (
     N_DENSITY_CONES
     + N_BULLETS * OBS_TRANSFORM_DIM
@@ -60,68 +75,106 @@ class ExperienceTuple(TypedDict):
     meta: MetaDict
 
 
-def _nearest_entities(
-    ref_x: float,
-    ref_y: float,
-    entities: Iterable[Mapping[str, Any]],
-    limit: int,
-) -> list[Mapping[str, Any]]:
-    entities = list(entities)
-    if not entities:
-        return []
+_EMPTY_ROWS = np.zeros((0, OBS_TRANSFORM_DIM))
 
-    def dist2(e: Mapping[str, Any]) -> float:
-        ex = float(e.get("x", 0.0))
-        ey = float(e.get("y", 0.0))
-        return (ex - ref_x) ** 2 + (ey - ref_y) ** 2
 
-    entities.sort(key=dist2)
-    return entities[:limit]
+def _relative_rows(
+    out: np.ndarray,
+    rows: np.ndarray,
+    px: float,
+    py: float,
+    you: np.ndarray,
+    scale: tuple[float, float, float, float],
+) -> None:
+    """Fill out (limit, 4) with obs_transform of the limit rows (x, y, vel_x, vel_y)
+    nearest (px, py), ties in row order; unused rows stay zero."""
+    if len(rows) == 0:
+        return
+    limit = len(out)
+    if len(rows) > 1:
+        dx = rows[:, 0] - px
+        dy = rows[:, 1] - py
+        rows = rows[np.argsort(dx * dx + dy * dy, kind="stable")[:limit]]
+    out[:len(rows)] = (rows - you) / scale
+
+
+def _density_cone_features(out: np.ndarray, bullets: np.ndarray, px: float, py: float) -> None:
+    """Hostile bullet counts in 8 angular wedges within CONE_RADIUS, L1-normalized."""
+    if len(bullets) == 0:
+        return
+    dx = bullets[:, 0] - px
+    dy = bullets[:, 1] - py
+    inside = np.hypot(dx, dy) <= CONE_RADIUS
+    n = np.count_nonzero(inside)
+    if n == 0:
+        return
+    rad = np.arctan2(dy[inside], dx[inside])
+    bkt = np.floor((rad + np.pi) / (np.pi / 4)).astype(np.int64) % N_DENSITY_CONES
+    out[:] = np.bincount(bkt, minlength=N_DENSITY_CONES) / n
+
+
+def build_obs_from_arrays(
+    you: Sequence[float],
+    bullets: np.ndarray,
+    allies: np.ndarray,
+    enemies: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    The observation of build_obs_from_update, from arrays instead of JSON dicts.
 
+    you: (x, y, vel_x, vel_y, health) of the observing player.
+    bullets / allies / enemies: (n, 4) float rows of (x, y, vel_x, vel_y): the hostile
+    bullets in update (spawn) order, the other players that are alive, and the enemies
+    (velocity as the -1/0/1 direction).
+    out: optional (STATE_DIM,) float32 buffer to fill instead of a new array.
+    """
+    px, py, pvx, pvy, health = you
+    if out is None:
+        out = np.zeros(STATE_DIM, dtype=np.float32)
+    else:
+        out.fill(0)
+    bullets_end = N_DENSITY_CONES + N_BULLETS * OBS_TRANSFORM_DIM
+    allies_end = bullets_end + N_ALLIES * OBS_TRANSFORM_DIM
+    enemies_end = allies_end + N_ENEMIES * OBS_TRANSFORM_DIM
+    you_rel = np.array((px, py, pvx, pvy))
+
+    _density_cone_features(out[:N_DENSITY_CONES], bullets, px, py)
+    _relative_rows(
+        out[N_DENSITY_CONES:bullets_end].reshape(N_BULLETS, OBS_TRANSFORM_DIM),
+        bullets, px, py, you_rel, (WORLD_WIDTH, WORLD_HEIGHT, BULLET_SPEED_ENEMY, BULLET_SPEED_ENEMY),
+    )
+    _relative_rows(
+        out[bullets_end:allies_end].reshape(N_ALLIES, OBS_TRANSFORM_DIM),
+        allies, px, py, you_rel, (WORLD_WIDTH, WORLD_HEIGHT, PLAYER_SPEED, PLAYER_SPEED),
+    )
+    # Relative enemy motion vs player, normalized by ENEMY_SPEED.
+    if len(enemies):
+        enemies = enemies * (1.0, 1.0, ENEMY_SPEED, ENEMY_SPEED)
+    _relative_rows(
+        out[allies_end:enemies_end].reshape(N_ENEMIES, OBS_TRANSFORM_DIM),
+        enemies, px, py, you_rel, (WORLD_WIDTH, WORLD_HEIGHT, ENEMY_SPEED, ENEMY_SPEED),
+    )
 
-def _player_velocity_px(you: Mapping[str, Any]) -> tuple[float, float]:
-    """Entity-style vel_x/vel_y in {-1,0,1} times PLAYER_SPEED → px/s."""
-    vx = float(you.get("vel_x", 0.0))
-    vy = float(you.get("vel_y", 0.0))
-    return vx, vy
+    out[enemies_end] = health / PLAYER_HEALTH_MAX
+    return out
 
 
-def _density_cone_features(
-    bullets,
-    px: float,
-    py: float,
-) -> np.ndarray:
-    """Hostile bullet counts in 8 angular wedges within CONE_RADIUS, L1-normalized."""
-    # Bullet format example:
-    # {'x', 'y', 'vel_x', 'vel_y', 'is_friendly', 'size', 'owner_id'}
-
-    def get_bullets_in_cone_radius(px: float, py: float, r: float):
-        blts: list[Any] = []
-        p = (px, py)
-        for b in bullets:
-            if b.get("is_friendly", False):
-                continue
-            distance = math.dist(p, (b.get("x"), b.get("y")))
-            if distance <= r:
-                blts.append(b)
-        return blts
-
-    bullets_in_radius = get_bullets_in_cone_radius(px, py, CONE_RADIUS)
-
-    buckets = [0.0] * N_DENSITY_CONES
-    for b in bullets_in_radius:
-        dx = float(b.get("x", 0.0)) - px
-        dy = float(b.get("y", 0.0)) - py
-        rad = np.arctan2(dy, dx)
-        bkt = int(np.floor((rad + np.pi) / (np.pi / 4))) % N_DENSITY_CONES
-        buckets[bkt] += 1.0
-
-    n = len(bullets_in_radius)
-    if n > 0:
-        for i in range(N_DENSITY_CONES):
-            buckets[i] /= n
-
-    return np.asarray(buckets, dtype=np.float32)
+def _rows(entities: Sequence[Mapping[str, Any]]) -> np.ndarray:
+    """(n, 4) float rows of entities' (x, y, vel_x, vel_y); missing keys read as 0.0."""
+    if not entities:
+        return _EMPTY_ROWS
+    return np.array(
+        [
+            (
+                float(e.get("x", 0.0)),
+                float(e.get("y", 0.0)),
+                float(e.get("vel_x", 0.0)),
+                float(e.get("vel_y", 0.0)),
+            )
+            for e in entities
+        ]
+    )
 
 
 def build_obs_from_update(
@@ -134,86 +187,64 @@ def build_obs_from_update(
     """
     _ = prev_update_msg
     you = update_msg.get("you") or {}
-    px = float(you.get("x", 0.0))
-    py = float(you.get("y", 0.0))
-    health = float(you.get("health", 0.0))
-    pvx, pvy = _player_velocity_px(you)
-
-    bullets_raw = list(update_msg.get("bullets") or [])
-
-    cones = _density_cone_features(bullets_raw, px, py)
-    # print(f"cones: {cones}")
-    hostile = [b for b in bullets_raw if not b.get("is_friendly", False)]
-    nearest_bu = _nearest_entities(px, py, hostile, N_BULLETS)
-    bullets_obs = np.zeros((N_BULLETS, OBS_TRANSFORM_DIM), dtype=np.float32)
-    for i, b in enumerate(nearest_bu[:N_BULLETS]):
-        bvx = float(b.get("vel_x", 0.0))
-        bvy = float(b.get("vel_y", 0.0))
-        bullets_obs[i] = np.array(
-            [
-                (float(b.get("x", 0.0)) - px) / WORLD_WIDTH,
-                (float(b.get("y", 0.0)) - py) / WORLD_HEIGHT,
-                (bvx - pvx) / BULLET_SPEED_ENEMY,
-                (bvy - pvy) / BULLET_SPEED_ENEMY,
-            ],
-            dtype=np.float32,
-        )
-
-    allies_raw = [
+    hostile = [b for b in (update_msg.get("bullets") or []) if not b.get("is_friendly", False)]
+    allies = [
         p
         for p in (update_msg.get("players") or [])
         if float(p.get("health", 0.0)) > 0.0
     ]
-    nearest_al = _nearest_entities(px, py, allies_raw, N_ALLIES)
-    allies_obs = np.zeros((N_ALLIES, OBS_TRANSFORM_DIM), dtype=np.float32)
-    for i, ally in enumerate(nearest_al[:N_ALLIES]):
-        avx, avy = _player_velocity_px(ally)
-        allies_obs[i] = np.array(
-            [
-                (float(ally.get("x", 0.0)) - px) / WORLD_WIDTH,
-                (float(ally.get("y", 0.0)) - py) / WORLD_HEIGHT,
-                (avx - pvx) / PLAYER_SPEED,
-                (avy - pvy) / PLAYER_SPEED,
-            ],
-            dtype=np.float32,
-        )
-
-    enemies_raw = list(update_msg.get("enemies") or [])
-    nearest_en = _nearest_entities(px, py, enemies_raw, N_ENEMIES)
-    enemies_obs = np.zeros((N_ENEMIES, OBS_TRANSFORM_DIM), dtype=np.float32)
-    for i, enemy in enumerate(nearest_en[:N_ENEMIES]):
-        evx = float(enemy.get("vel_x", 0.0)) * ENEMY_SPEED
-        evy = float(enemy.get("vel_y", 0.0)) * ENEMY_SPEED
-        # Relative enemy motion vs player, normalized by ENEMY_SPEED.
-        enemies_obs[i] = np.array(
-            [
-                (float(enemy.get("x", 0.0)) - px) / WORLD_WIDTH,
-                (float(enemy.get("y", 0.0)) - py) / WORLD_HEIGHT,
-                (evx - pvx) / ENEMY_SPEED,
-                (evy - pvy) / ENEMY_SPEED,
-            ],
-            dtype=np.float32,
-        )
-
-    health_feat = np.array([health / PLAYER_HEALTH_MAX], dtype=np.float32)
-
-    # print(f"cones: {cones}")
-    # print(f"bullets_obs: {bullets_obs}")
-    # print(f"allies_obs: {allies_obs}")
-    # print(f"enemies_obs: {enemies_obs}")
-    # print(f"health_feat: {health_feat}")
-    flat = np.concatenate(
-        [
-            cones,
-            bullets_obs.ravel(),
-            allies_obs.ravel(),
-            enemies_obs.ravel(),
-            health_feat,
-        ],
-        axis=0,
+    return build_obs_from_arrays(
+        [float(you.get(key, 0.0)) for key in ("x", "y", "vel_x", "vel_y", "health")],
+        _rows(hostile),
+        _rows(allies),
+        _rows(update_msg.get("enemies") or []),
+    )
+
+
+def build_grid_from_arrays(
+    you: Sequence[float],
+    bullets: np.ndarray,
+    allies: np.ndarray,
+    enemies: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    The occupancy grid around you[:2] = (x, y), from rows as for build_obs_from_arrays
+    (only their x, y columns are read). All three channels are binned by one np.bincount
+    over the concatenated positions: no sort, and the cost barely grows with entity count.
+    out: optional (GRID_CHANNELS, GRID_SIZE, GRID_SIZE) float32 buffer to fill.
+    """
+    px, py = you[0], you[1]
+    cells = GRID_SIZE * GRID_SIZE
+    groups = (bullets, enemies, allies)
+    xy = np.concatenate([rows[:, :2] for rows in groups])
+    channel = np.repeat(np.arange(GRID_CHANNELS) * cells, [len(rows) for rows in groups])
+    col = np.floor((xy[:, 0] - (px - GRID_RADIUS)) / _GRID_CELL)
+    row = np.floor((xy[:, 1] - (py - GRID_RADIUS)) / _GRID_CELL)
+    inside = (col >= 0) & (col < GRID_SIZE) & (row >= 0) & (row < GRID_SIZE)
+    index = channel[inside] + (row[inside] * GRID_SIZE + col[inside]).astype(np.int64)
+    counts = np.bincount(index, minlength=GRID_CHANNELS * cells)
+    if out is None:
+        out = np.empty((GRID_CHANNELS, GRID_SIZE, GRID_SIZE), dtype=np.float32)
+    out.reshape(-1)[:] = counts
+    return out
+
+
+def build_grid_from_update(update_msg: UpdateMessage) -> np.ndarray:
+    """The occupancy grid of MSG_UPDATE (see build_grid_from_arrays)."""
+    you = update_msg.get("you") or {}
+    hostile = [b for b in (update_msg.get("bullets") or []) if not b.get("is_friendly", False)]
+    allies = [
+        p
+        for p in (update_msg.get("players") or [])
+        if float(p.get("health", 0.0)) > 0.0
+    ]
+    return build_grid_from_arrays(
+        (float(you.get("x", 0.0)), float(you.get("y", 0.0))),
+        _rows(hostile),
+        _rows(allies),
+        _rows(update_msg.get("enemies") or []),
     )
-    assert flat.shape[0] == STATE_DIM, flat.shape
-    return flat.astype(np.float32, copy=False)
 
 
 def _center_control_reward(px: float, py: float) -> float:
@@ -228,23 +259,46 @@ def _center_control_reward(px: float, py: float) -> float:
     return 1.0 + (49.0 * closeness)
 
 
+def count_nearby_allies(px: float, py: float, allies: np.ndarray) -> int:
+    """Alive allies ((n, 4) rows as for build_obs_from_arrays) within WORLD_HEIGHT / 14
+    of (px, py)."""
+    if len(allies) == 0:
+        return 0
+    ally_radius = WORLD_HEIGHT / 14
+    return int(np.count_nonzero(np.hypot(allies[:, 0] - px, allies[:, 1] - py) <= ally_radius))
+
+
 def _count_nearby_alive_allies(curr_update_msg: UpdateMessage, px: float, py: float) -> int:
     you_curr = curr_update_msg.get("you") or {}
     own_id = you_curr.get("id")
-    ally_radius = WORLD_HEIGHT / 14
-    nearby_alive_allies = 0
-    for player in (curr_update_msg.get("players") or []):
-        if player.get("id") == own_id:
-            continue
-        if float(player.get("health", 0.0)) <= 0.0:
-            continue
-        distance = math.dist(
-            (px, py),
-            (float(player.get("x", 0.0)), float(player.get("y", 0.0))),
-        )
-        if distance <= ally_radius:
-            nearby_alive_allies += 1
-    return nearby_alive_allies
+    allies = [
+        player
+        for player in (curr_update_msg.get("players") or [])
+        if player.get("id") != own_id and float(player.get("health", 0.0)) > 0.0
+    ]
+    return count_nearby_allies(px, py, _rows(allies))
+
+
+def additive_reward(
+    h_prev: float,
+    h_curr: float,
+    k_prev: int,
+    k_curr: int,
+    px: float,
+    py: float,
+    nearby_alive_allies: int,
+) -> tuple[float, float, float, float, float, int]:
+    """
+    The additive tick reward between two consecutive player states.
+    Returns (reward, damage_term, ally_term, center_term, kill_term, kill_delta).
+    """
+    damage_term = -1000.0 if h_curr < h_prev else 0.0
+    ally_term = 5.0 * nearby_alive_allies
+    center_term = _center_control_reward(px, py)
+    kill_delta = max(0, k_curr - k_prev)
+    kill_term = 100.0 * kill_delta
+    reward = damage_term + ally_term + center_term + kill_term
+    return reward, damage_term, ally_term, center_term, kill_term, kill_delta
 
 
 def compute_reward_and_done(
@@ -274,21 +328,11 @@ def compute_reward_and_done(
     h_prev = float(you_prev.get("health", 0.0))
     k_prev = int(you_prev.get("kill_count", 0))
 
-    damaged = h_curr < h_prev
-    safe_term = 0.0 if not damaged else 0.0 #Just made this ineffective. too lazy to delte it correctly
-    damage_term = -1000.0 if damaged else 0.0
-
     nearby_alive_allies = _count_nearby_alive_allies(curr_update_msg, px, py)
-    ally_term = 5.0 * nearby_alive_allies
-
-    center_term = _center_control_reward(px, py)
-    # print(f"Center control reward: {center_term}")
-
-    kill_delta = max(0, k_curr - k_prev)
-    kill_term = 100.0 * kill_delta
-
-    reward = safe_term + damage_term + ally_term + center_term + kill_term
-    meta["safe_term"] = safe_term
+    reward, damage_term, ally_term, center_term, kill_term, kill_delta = additive_reward(
+        h_prev, h_curr, k_prev, k_curr, px, py, nearby_alive_allies
+    )
+    meta["safe_term"] = 0.0
     meta["damage_term"] = damage_term
     meta["ally_term"] = ally_term
     meta["nearby_alive_allies"] = nearby_alive_allies
@@ -466,9 +510,17 @@ __all__ = [
     "N_ENEMIES",
     "OBS_TRANSFORM_DIM",
     "N_HEALTH_FEATURES",
+    "GRID_SIZE",
+    "GRID_RADIUS",
+    "GRID_CHANNELS",
     "ExperienceTuple",
+    "additive_reward",
+    "build_obs_from_arrays",
     "build_obs_from_update",
+    "build_grid_from_arrays",
+    "build_grid_from_update",
     "compute_reward_and_done",
+    "count_nearby_allies",
     "serialize_experience",
     "validate_experience_shape",
     "run_bridge_self_checks",
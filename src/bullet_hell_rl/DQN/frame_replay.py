@@ -0,0 +1,127 @@
+"""
+Replay buffer for frame-stacked observations that stores every frame once.
+
+A replay of k-frame stacks keeps 2k frames per transition (state and next state) although
+consecutive transitions share all but one. FrameStackReplay keeps the frames in their own
+ring, each exactly once, plus per transition only the id of its state's newest frame;
+sample() rebuilds the (batch, k, *frame_shape) state and next-state stacks with one fancy
+index each. Frames before an episode's start repeat its first frame, as
+envs.FrameStack's reset does, so sampled stacks equal the stacks the agent saw.
+
+Feed it the newest frame only (stack[-1] of a FrameStack observation):
+
+    replay = FrameStackReplay(20000, env.observation_space.shape[1:], k=4)
+    stack, _ = env.reset()
+    replay.start_episode(stack[-1])
+    stack, reward, terminated, truncated, _ = env.step(action)
+    replay.add(action, reward, stack[-1], terminated)
+    states, actions, rewards, next_states, dones = replay.sample(64)
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+class FrameStackReplay:
+    def __init__(
+        self,
+        capacity: int,
+        frame_shape: Sequence[int],
+        k: int = 4,
+        dtype=np.float32,
+    ):
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+        self.capacity = capacity
+        self.k = k
+        # Frames: one slot per stored frame, ids counted from 0, slot = id % frame_capacity.
+        # capacity + k slots keep every frame of the newest transitions of long episodes;
+        # older transitions whose frames were overwritten (one extra frame per episode
+        # start) are skipped by sample().
+        self.frame_capacity = capacity + k
+        self.frames = np.zeros((self.frame_capacity, *frame_shape), dtype=dtype)
+        self.frame_start = np.zeros(self.frame_capacity, dtype=np.int64)
+        self.n_frames = 0
+        self._episode_start = -1
+        # Transitions, in a ring of capacity entries
+        self.state_frame = np.zeros(capacity, dtype=np.int64)
+        self.low_frame = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.n_transitions = 0
+
+    def __len__(self) -> int:
+        return min(self.n_transitions, self.capacity)
+
+    def _store(self, frame: np.ndarray) -> None:
+        slot = self.n_frames % self.frame_capacity
+        self.frames[slot] = frame
+        self.frame_start[slot] = self._episode_start
+        self.n_frames += 1
+
+    def start_episode(self, frame: np.ndarray) -> None:
+        """First frame of a new episode (the observation reset returned)."""
+        self._episode_start = self.n_frames
+        self._store(frame)
+
+    def add(self, action: int, reward: float, next_frame: np.ndarray, done: bool) -> None:
+        """One transition: the action taken in the current state, its reward, the next
+        state's newest frame and whether the episode ended there."""
+        if self._episode_start < 0:
+            raise RuntimeError("Call start_episode before add")
+        state = self.n_frames - 1
+        j = self.n_transitions % self.capacity
+        self.state_frame[j] = state
+        # Oldest frame either stack of this transition reads (nondecreasing over time)
+        self.low_frame[j] = max(state - self.k + 1, self._episode_start)
+        self.actions[j] = action
+        self.rewards[j] = reward
+        self.dones[j] = done
+        self.n_transitions += 1
+        self._store(next_frame)
+
+    def _first_valid(self) -> int:
+        """Age index (0 = oldest stored) of the oldest transition whose frames are all
+        still stored. low_frame grows with age index, so a binary search finds it."""
+        size = len(self)
+        oldest_frame = self.n_frames - self.frame_capacity
+        head = self.n_transitions - size
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.low_frame[(head + mid) % self.capacity] >= oldest_frame:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def stacks(self, frame_ids: np.ndarray) -> np.ndarray:
+        """(len(frame_ids), k, *frame_shape) stacks ending at frame_ids, oldest first."""
+        ids = frame_ids[:, None] + np.arange(1 - self.k, 1)
+        start = self.frame_start[frame_ids % self.frame_capacity]
+        ids = np.maximum(ids, start[:, None])
+        return self.frames[ids % self.frame_capacity]
+
+    def sample(self, batch_size: int, rng: np.random.Generator | None = None):
+        """(states, actions, rewards, next_states, dones) for batch_size transitions
+        drawn uniformly, with replacement, from those whose frames are still stored."""
+        rng = np.random.default_rng() if rng is None else rng
+        size = len(self)
+        first = self._first_valid()
+        if first >= size:
+            raise ValueError("replay buffer holds no complete transition")
+        age = rng.integers(first, size, size=batch_size)
+        j = (self.n_transitions - size + age) % self.capacity
+        state = self.state_frame[j]
+        return (
+            self.stacks(state),
+            self.actions[j],
+            self.rewards[j],
+            self.stacks(state + 1),
+            self.dones[j],
+        )
@@ -0,0 +1,499 @@
+"""
+N single-player worlds stepped together with array operations.
+
+WorldSimulator advances one world through Python objects (Player, Enemy, bullet views)
+and its timer heaps. BatchedWorlds keeps N worlds with one player each in stacked arrays
+instead and runs every phase of the tick once for all of them:
+
+  - players are (N,) columns, enemies (N, E) and bullets (N, B) with an alive mask; a
+    world that runs out of free slots doubles E or B for everyone,
+  - timers are "last fired" columns compared against each world's clock,
+  - collision candidates come from bounding-box tests, broadcast over (worlds x bullets)
+    for the players and through a per-world uniform grid for enemies x bullets; only the
+    few candidates get the exact rect / swept test,
+  - one numpy Generator draws for every world, through _random_positions,
+    _next_intervals and _enemy_moves.
+
+The rules are WorldSimulator's with one player and respawn_dead_players off, i.e. what
+BulletHellEnv runs: the same speeds, clamping, pygame.Rect rounding, swept collisions,
+shoot / action / spawn intervals, caps and kill and damage accounting, in the same tick
+order. The random draws come from a different stream, so a batched world does not replay
+a seeded WorldSimulator tick for tick. Given one RandomStream per world instead (override
+the three draw methods, as tests/test_batched_equivalence.py does) it does, which is how
+the rules are checked against WorldSimulator. envs.BulletHellVecEnv builds on this.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from bullet_hell_rl.bullethell import (
+    BULLET_DAMAGE,
+    BULLET_SIZE,
+    BULLET_SPEED_ENEMY,
+    BULLET_SPEED_PLAYER,
+    ENEMY_ACTION_INTERVAL,
+    ENEMY_SPAWN_MAX,
+    ENEMY_SPAWN_MIN,
+    ENEMY_SPEED,
+    ENTITY_SIZE,
+    PLAYER_HEALTH_MAX,
+    PLAYER_SPEED,
+    SHOOT_INTERVAL_ENEMY,
+    SHOOT_INTERVAL_PLAYER,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+    _round_half_away,
+    _swept_hits,
+)
+from bullet_hell_rl.spatial_hash import DEFAULT_CELL_SIZE
+
+# Move index -> unit step: left, right, up, down, none (BulletHellEnv's move order; enemies
+# roll one of the first four, ENEMY_ACTIONS' order, and stand still until their first roll).
+MOVE_X = np.array([-1, 1, 0, 0, 0], dtype=np.int64)
+MOVE_Y = np.array([0, 0, -1, 1, 0], dtype=np.int64)
+NO_MOVE = 4
+
+_HALF = ENTITY_SIZE // 2  # bullets leave from the shooter's center
+_DEAD_SEQ = np.iinfo(np.int64).max  # sorts released slots after every live bullet
+
+_ENEMY_COLUMNS = {
+    "enemy_x": np.float64,
+    "enemy_y": np.float64,
+    "enemy_rect_x": np.int64,
+    "enemy_rect_y": np.int64,
+    "enemy_move": np.int64,
+    "enemy_aim": np.float64,
+    "enemy_shot": np.float64,  # last shot time
+    "enemy_acted": np.float64,  # last direction roll
+    "enemy_seq": np.int64,  # spawn order, which is WorldSimulator.enemies' order
+    "enemy_alive": np.bool_,
+}
+_BULLET_COLUMNS = {
+    "bullet_x": np.float64,
+    "bullet_y": np.float64,
+    "bullet_vx": np.float64,
+    "bullet_vy": np.float64,
+    "bullet_rect_x": np.int64,
+    "bullet_rect_y": np.int64,
+    "bullet_prev_x": np.int64,
+    "bullet_prev_y": np.int64,
+    "bullet_friendly": np.bool_,
+    "bullet_seq": np.int64,
+    "bullet_alive": np.bool_,
+}
+_COLUMNS = {"enemy": _ENEMY_COLUMNS, "bullet": _BULLET_COLUMNS}
+
+
+class BatchedWorlds:
+    """
+    N single-player worlds in stacked arrays, advanced together by step().
+
+    tick_ms, initial_enemies, max_enemies, max_bullets, world_width, world_height and
+    spawn_interval_ms mean what they mean for WorldSimulator. seed: int, sequence of ints
+    or np.random.Generator for the shared stream. enemy_capacity / bullet_capacity: the
+    initial per-world slot counts (they grow on demand).
+
+    Columns are public for observation code: player_x / player_y (N,), enemy_* (N, E) and
+    bullet_* (N, B), valid where enemy_alive / bullet_alive is set. enemy_vx / enemy_vy
+    give the unit velocity of the last move, like Entity.vx / vy.
+    """
+
+    def __init__(
+        self,
+        num_worlds: int,
+        tick_ms: float = 1000 / 60,
+        initial_enemies: int = 3,
+        max_enemies: int | None = None,
+        max_bullets: int | None = None,
+        seed=None,
+        world_width: int = WORLD_WIDTH,
+        world_height: int = WORLD_HEIGHT,
+        spawn_interval_ms: tuple[int, int] = (ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX),
+        enemy_capacity: int = 8,
+        bullet_capacity: int = 64,
+    ):
+        if num_worlds < 1:
+            raise ValueError(f"num_worlds must be >= 1, got {num_worlds}")
+        if max_enemies is not None and max_enemies < 0:
+            raise ValueError(f"max_enemies must be >= 0, got {max_enemies}")
+        if max_bullets is not None and max_bullets < 0:
+            raise ValueError(f"max_bullets must be >= 0, got {max_bullets}")
+        n = self.num_worlds = num_worlds
+        self.tick_ms = tick_ms
+        self.delta_time = tick_ms / 1000
+        self.initial_enemies = initial_enemies if max_enemies is None else min(initial_enemies, max_enemies)
+        self.max_enemies = max_enemies
+        self.max_bullets = max_bullets
+        self.world_width = world_width
+        self.world_height = world_height
+        self.spawn_interval_ms = tuple(spawn_interval_ms)
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+        self.current_time = np.zeros(n)
+        self.tick_count = np.zeros(n, dtype=np.int64)
+        self.last_enemy_spawn_time = np.zeros(n)
+        self.next_spawn_interval = np.zeros(n)
+        self.player_x = np.zeros(n)
+        self.player_y = np.zeros(n)
+        self.player_rect_x = np.zeros(n, dtype=np.int64)
+        self.player_rect_y = np.zeros(n, dtype=np.int64)
+        self.player_vx = np.zeros(n, dtype=np.int64)
+        self.player_vy = np.zeros(n, dtype=np.int64)
+        self.player_aim = np.zeros(n)
+        self.player_shot = np.zeros(n)
+        self.health = np.zeros(n, dtype=np.int64)
+        self.kill_totals = np.zeros(n, dtype=np.int64)
+        self.damage_totals = np.zeros(n, dtype=np.int64)
+        self.spawns_skipped = np.zeros(n, dtype=np.int64)
+        self.bullets_evicted = np.zeros(n, dtype=np.int64)
+        self._next_seq = 0
+        for kind, capacity in (("enemy", enemy_capacity), ("bullet", bullet_capacity)):
+            for name, dtype in _COLUMNS[kind].items():
+                setattr(self, name, np.zeros((n, max(1, capacity)), dtype=dtype))
+        self.reset()
+
+    # ------------------------------------------------------------------ slots
+    @property
+    def enemy_vx(self) -> np.ndarray:
+        return MOVE_X[self.enemy_move]
+
+    @property
+    def enemy_vy(self) -> np.ndarray:
+        return MOVE_Y[self.enemy_move]
+
+    def enemy_counts(self) -> np.ndarray:
+        return self.enemy_alive.sum(axis=1)
+
+    def bullet_counts(self) -> np.ndarray:
+        return self.bullet_alive.sum(axis=1)
+
+    def _grow(self, kind: str, capacity: int) -> None:
+        for name in _COLUMNS[kind]:
+            old = getattr(self, name)
+            new = np.zeros((self.num_worlds, capacity), dtype=old.dtype)
+            new[:, : old.shape[1]] = old
+            setattr(self, name, new)
+
+    def _claim(self, kind: str, worlds: np.ndarray) -> np.ndarray:
+        """A free slot for every entry of worlds (a world may appear several times)."""
+        alive = getattr(self, f"{kind}_alive")
+        counts = np.bincount(worlds, minlength=self.num_worlds)
+        needed = int((alive.sum(axis=1) + counts).max())
+        if needed > alive.shape[1]:
+            self._grow(kind, max(needed, 2 * alive.shape[1]))
+            alive = getattr(self, f"{kind}_alive")
+        order = np.argsort(worlds, kind="stable")
+        grouped = worlds[order]
+        # k-th request of a world takes that world's k-th free slot
+        rank = np.arange(len(grouped)) - np.searchsorted(grouped, grouped)
+        free_first = np.argsort(alive[grouped], axis=1, kind="stable")
+        slots = np.empty_like(worlds)
+        slots[order] = free_first[np.arange(len(grouped)), rank]
+        return slots
+
+    # The random draws. Each takes the worlds it draws for (in the order WorldSimulator
+    # would draw them within a world), so a subclass can serve them from per-world streams.
+    def _random_positions(self, worlds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """A spawn position anywhere in the world per entry of worlds (integers, like
+        WorldSimulator.random_position)."""
+        k = len(worlds)
+        x = self.rng.integers(0, self.world_width - ENTITY_SIZE + 1, size=k)
+        y = self.rng.integers(0, self.world_height - ENTITY_SIZE + 1, size=k)
+        return x, y
+
+    def _next_intervals(self, worlds: np.ndarray) -> np.ndarray:
+        """The next spawn interval (ms) per entry of worlds."""
+        lo, hi = self.spawn_interval_ms
+        return self.rng.integers(lo, hi + 1, size=len(worlds)).astype(np.float64)
+
+    def _enemy_moves(self, w: np.ndarray, e: np.ndarray) -> np.ndarray:
+        """A new direction (MOVE_X index 0..3) for every due enemy (w, e); rows come
+        world by world, slots in any order (enemy_seq gives the spawn order)."""
+        return self.rng.integers(0, 4, size=len(w))
+
+    def spawn_enemies(self, worlds: np.ndarray) -> None:
+        """One new enemy at a random position per entry of worlds."""
+        worlds = np.asarray(worlds, dtype=np.int64)
+        if len(worlds) == 0:
+            return
+        slots = self._claim("enemy", worlds)
+        x, y = self._random_positions(worlds)
+        self.enemy_x[worlds, slots] = x
+        self.enemy_y[worlds, slots] = y
+        self.enemy_rect_x[worlds, slots] = x
+        self.enemy_rect_y[worlds, slots] = y
+        self.enemy_move[worlds, slots] = NO_MOVE
+        self.enemy_aim[worlds, slots] = 0
+        self.enemy_shot[worlds, slots] = 0
+        self.enemy_acted[worlds, slots] = 0
+        self.enemy_seq[worlds, slots] = self._next_seq + np.arange(len(worlds))
+        self.enemy_alive[worlds, slots] = True
+        self._next_seq += len(worlds)
+
+    def spawn_bullets(self, worlds, x, y, angle, is_friendly: bool) -> None:
+        """Bullets at (x, y) heading angle degrees, one per entry of worlds, like BulletPool.spawn."""
+        worlds = np.asarray(worlds, dtype=np.int64)
+        if len(worlds) == 0:
+            return
+        slots = self._claim("bullet", worlds)
+        speed = BULLET_SPEED_PLAYER if is_friendly else BULLET_SPEED_ENEMY
+        rad = np.radians(angle)
+        self.bullet_x[worlds, slots] = x
+        self.bullet_y[worlds, slots] = y
+        self.bullet_vx[worlds, slots] = np.cos(rad) * speed
+        self.bullet_vy[worlds, slots] = np.sin(rad) * speed
+        # Spawn rects are truncated, later ones rounded (pygame.Rect semantics)
+        rect_x = np.asarray(x, dtype=np.float64).astype(np.int64)
+        rect_y = np.asarray(y, dtype=np.float64).astype(np.int64)
+        self.bullet_rect_x[worlds, slots] = rect_x
+        self.bullet_rect_y[worlds, slots] = rect_y
+        self.bullet_prev_x[worlds, slots] = rect_x
+        self.bullet_prev_y[worlds, slots] = rect_y
+        self.bullet_friendly[worlds, slots] = is_friendly
+        self.bullet_seq[worlds, slots] = self._next_seq + np.arange(len(worlds))
+        self.bullet_alive[worlds, slots] = True
+        self._next_seq += len(worlds)
+
+    # ------------------------------------------------------------------ reset
+    def reset(self, mask: np.ndarray | None = None) -> None:
+        """Start fresh episodes in the masked worlds (all by default): player at a random
+        position with full health, initial_enemies random enemies, no bullets."""
+        worlds = np.arange(self.num_worlds) if mask is None else np.flatnonzero(mask)
+        k = len(worlds)
+        if k == 0:
+            return
+        self.current_time[worlds] = 0
+        self.tick_count[worlds] = 0
+        x, y = self._random_positions(worlds)
+        self.player_x[worlds] = x
+        self.player_y[worlds] = y
+        self.player_rect_x[worlds] = x
+        self.player_rect_y[worlds] = y
+        self.player_vx[worlds] = 0
+        self.player_vy[worlds] = 0
+        self.player_aim[worlds] = 0
+        self.player_shot[worlds] = 0
+        self.health[worlds] = PLAYER_HEALTH_MAX
+        self.kill_totals[worlds] = 0
+        self.damage_totals[worlds] = 0
+        self.spawns_skipped[worlds] = 0
+        self.bullets_evicted[worlds] = 0
+        self.last_enemy_spawn_time[worlds] = 0
+        self.next_spawn_interval[worlds] = self._next_intervals(worlds)
+        self.enemy_alive[worlds] = False
+        self.bullet_alive[worlds] = False
+        self.spawn_enemies(np.repeat(worlds, self.initial_enemies))
+
+    # ------------------------------------------------------------------ collisions
+    def _hits(self, rect_x, rect_y, idx) -> tuple[np.ndarray, ...]:
+        """The candidate pairs of the index tuple idx (world, [entity,] bullet) whose bullet
+        touches the entity rect this tick: rect overlap or, swept, a path through it
+        (BulletPool.overlapping)."""
+        w, b = idx[0], idx[-1]
+        rx = rect_x[idx[:-1]]
+        ry = rect_y[idx[:-1]]
+        bx = self.bullet_rect_x[w, b]
+        by = self.bullet_rect_y[w, b]
+        hit = (
+            (bx < rx + ENTITY_SIZE) & (rx < bx + BULLET_SIZE)
+            & (by < ry + ENTITY_SIZE) & (ry < by + BULLET_SIZE)
+        )
+        grown = ENTITY_SIZE + BULLET_SIZE
+        hit |= _swept_hits(
+            self.bullet_prev_x[w, b], self.bullet_prev_y[w, b], bx, by,
+            rx - BULLET_SIZE, ry - BULLET_SIZE, grown, grown,
+        )
+        return tuple(i[hit] for i in idx)
+
+    def _path_boxes(self):
+        """Bounding boxes of every bullet's last move, grown by the bullet size."""
+        x0 = np.minimum(self.bullet_prev_x, self.bullet_rect_x)
+        y0 = np.minimum(self.bullet_prev_y, self.bullet_rect_y)
+        x1 = np.maximum(self.bullet_prev_x, self.bullet_rect_x) + BULLET_SIZE
+        y1 = np.maximum(self.bullet_prev_y, self.bullet_rect_y) + BULLET_SIZE
+        return x0, y0, x1, y1
+
+    def _enemy_candidates(self, enemies, bullets, path) -> tuple[np.ndarray, ...]:
+        """Index tuple (world, enemy, bullet) of the masked enemies and bullets whose rect and
+        path box overlap. Enemies are bucketed by (world, cell of the rect corner) in one
+        sorted key array, and each bullet looks up the cells its box can reach a row of
+        cells at a time, so the work follows the live pairs that are close, not N x E x B."""
+        we, ee = np.nonzero(enemies)
+        wb, bb = np.nonzero(bullets)
+        if len(we) == 0 or len(wb) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        cs = DEFAULT_CELL_SIZE
+        cols = self.world_width // cs + 1
+        rows = self.world_height // cs + 1
+        ex = self.enemy_rect_x[we, ee]
+        ey = self.enemy_rect_y[we, ee]
+        keys = (we * rows + np.clip(ey // cs, 0, rows - 1)) * cols + np.clip(ex // cs, 0, cols - 1)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        x0, y0, x1, y1 = (a[wb, bb] for a in path)
+        # An enemy rect [r, r + ENTITY_SIZE) meets the box [lo, hi) iff lo - ENTITY_SIZE < r < hi
+        cx0 = np.clip((x0 - ENTITY_SIZE + 1) // cs, 0, cols - 1)
+        cx1 = np.clip((x1 - 1) // cs, 0, cols - 1)
+        cy0 = np.clip((y0 - ENTITY_SIZE + 1) // cs, 0, rows - 1)
+        spans = np.clip((y1 - 1) // cs, 0, rows - 1) - cy0 + 1
+        queries, starts, stops = [], [], []
+        for dy in range(int(spans.max())):
+            q = np.flatnonzero(spans > dy)
+            row = (wb[q] * rows + cy0[q] + dy) * cols
+            queries.append(q)
+            starts.append(np.searchsorted(keys, row + cx0[q]))
+            stops.append(np.searchsorted(keys, row + cx1[q] + 1))
+        q, start = np.concatenate(queries), np.concatenate(starts)
+        counts = np.concatenate(stops) - start
+        first = np.cumsum(counts) - counts
+        q = np.repeat(q, counts)
+        enemy = order[np.arange(len(q)) + np.repeat(start - first, counts)]
+        w, e, b = wb[q], ee[enemy], bb[q]
+        rx, ry = ex[enemy], ey[enemy]
+        x0, y0, x1, y1 = x0[q], y0[q], x1[q], y1[q]
+        close = (x0 < rx + ENTITY_SIZE) & (rx < x1) & (y0 < ry + ENTITY_SIZE) & (ry < y1)
+        return w[close], e[close], b[close]
+
+    # ------------------------------------------------------------------ stepping
+    def step(self, move: np.ndarray, angle: np.ndarray, active: np.ndarray | None = None) -> None:
+        """Advance every active world one tick; move (N,) indexes MOVE_X / MOVE_Y and angle
+        (N,) is the player's aim in degrees. Inactive worlds (default: none) stay frozen."""
+        n = self.num_worlds
+        if active is None:
+            active = np.ones(n, dtype=bool)
+        # Frozen worlds get a zero timestep: nothing moves and no timer comes due.
+        dt = np.where(active, self.delta_time, 0.0)
+        self.current_time += np.where(active, self.tick_ms, 0.0)
+        self.tick_count += active
+        now = self.current_time
+        path = None
+
+        # Spawn: at the cap the spawn is skipped but the cadence kept
+        due = active & (now - self.last_enemy_spawn_time >= self.next_spawn_interval)
+        if due.any():
+            worlds = np.flatnonzero(due)
+            if self.max_enemies is not None:
+                room = self.enemy_counts()[worlds] < self.max_enemies
+                self.spawns_skipped[worlds[~room]] += 1
+                self.spawn_enemies(worlds[room])
+            else:
+                self.spawn_enemies(worlds)
+            self.last_enemy_spawn_time[worlds] = now[worlds]
+            self.next_spawn_interval[worlds] = self._next_intervals(worlds)
+
+        # Players: move, collide with enemy bullets, shoot
+        move_x = MOVE_X[move]
+        move_y = MOVE_Y[move]
+        self.player_aim = np.where(active, angle, self.player_aim)
+        step = PLAYER_SPEED * dt
+        self.player_x = np.maximum(0, np.minimum(self.world_width - ENTITY_SIZE, self.player_x + move_x * step))
+        self.player_y = np.maximum(0, np.minimum(self.world_height - ENTITY_SIZE, self.player_y + move_y * step))
+        self.player_vx = np.where(active, move_x, self.player_vx)
+        self.player_vy = np.where(active, move_y, self.player_vy)
+        self.player_rect_x = _round_half_away(self.player_x)
+        self.player_rect_y = _round_half_away(self.player_y)
+        if self.bullet_alive.any():
+            x0, y0, x1, y1 = path = self._path_boxes()
+            rx = self.player_rect_x[:, None]
+            ry = self.player_rect_y[:, None]
+            candidates = (
+                active[:, None] & self.bullet_alive & ~self.bullet_friendly
+                & (x0 < rx + ENTITY_SIZE) & (rx < x1) & (y0 < ry + ENTITY_SIZE) & (ry < y1)
+            )
+            if candidates.any():
+                w, b = self._hits(self.player_rect_x, self.player_rect_y, np.nonzero(candidates))
+                if len(w):
+                    self.bullet_alive[w, b] = False
+                    damage = np.bincount(w, minlength=n) * BULLET_DAMAGE
+                    self.health -= damage
+                    self.damage_totals += damage
+        shooting = active & (now - self.player_shot >= SHOOT_INTERVAL_PLAYER)
+        if shooting.any():
+            worlds = np.flatnonzero(shooting)
+            self.spawn_bullets(
+                worlds, self.player_x[worlds] + _HALF, self.player_y[worlds] + _HALF,
+                self.player_aim[worlds], True,
+            )
+            self.player_shot[worlds] = now[worlds]
+            path = None
+
+        # Enemies: shoot (from the pre-move position, at last tick's aim), roll directions,
+        # move, aim. Timers only run while the player is alive.
+        living = active & (self.health > 0)
+        alive = self.enemy_alive
+        if alive.any():
+            since = now[:, None]
+            fighting = living[:, None] & alive
+            w, e = np.nonzero(fighting & (since - self.enemy_shot >= SHOOT_INTERVAL_ENEMY))
+            if len(w):
+                # Fire in spawn order, as WorldSimulator does: bullet_seq decides which
+                # bullets the max_bullets cap evicts and how distance ties sort
+                order = np.lexsort((self.enemy_seq[w, e], w))
+                w, e = w[order], e[order]
+                self.spawn_bullets(w, self.enemy_x[w, e] + _HALF, self.enemy_y[w, e] + _HALF, self.enemy_aim[w, e], False)
+                self.enemy_shot[w, e] = now[w]
+                path = None
+            w, e = np.nonzero(fighting & (since - self.enemy_acted >= ENEMY_ACTION_INTERVAL))
+            if len(w):
+                self.enemy_move[w, e] = self._enemy_moves(w, e)
+                self.enemy_acted[w, e] = now[w]
+            step = (ENEMY_SPEED * dt)[:, None]
+            self.enemy_x = np.maximum(0, np.minimum(self.world_width - ENTITY_SIZE, self.enemy_x + MOVE_X[self.enemy_move] * step))
+            self.enemy_y = np.maximum(0, np.minimum(self.world_height - ENTITY_SIZE, self.enemy_y + MOVE_Y[self.enemy_move] * step))
+            self.enemy_rect_x = _round_half_away(self.enemy_x)
+            self.enemy_rect_y = _round_half_away(self.enemy_y)
+            dx = (self.player_x + _HALF)[:, None] - (self.enemy_x + _HALF)
+            dy = (self.player_y + _HALF)[:, None] - (self.enemy_y + _HALF)
+            self.enemy_aim = np.where(living[:, None], np.degrees(np.arctan2(dy, dx)), self.enemy_aim)
+
+            # Enemy collisions with the player's bullets; one hit kills (enemies have 1
+            # health), an enemy stops at its first bullet and that bullet is spent.
+            friendly = self.bullet_alive & self.bullet_friendly
+            if friendly.any():
+                candidates = self._enemy_candidates(
+                    living[:, None] & alive, friendly, path if path is not None else self._path_boxes()
+                )
+                if len(candidates[0]):
+                    self._resolve_kills(*self._hits(self.enemy_rect_x, self.enemy_rect_y, candidates))
+
+        # Bullets: integrate, cull off-screen, enforce the cap
+        moving = active[:, None]
+        self.bullet_prev_x = np.where(moving, self.bullet_rect_x, self.bullet_prev_x)
+        self.bullet_prev_y = np.where(moving, self.bullet_rect_y, self.bullet_prev_y)
+        self.bullet_x += self.bullet_vx * dt[:, None]
+        self.bullet_y += self.bullet_vy * dt[:, None]
+        self.bullet_rect_x = _round_half_away(self.bullet_x)
+        self.bullet_rect_y = _round_half_away(self.bullet_y)
+        x = self.bullet_x
+        y = self.bullet_y
+        self.bullet_alive &= (x >= 0) & (x <= self.world_width) & (y >= 0) & (y <= self.world_height)
+        if self.max_bullets is not None:
+            over = self.bullet_counts() - self.max_bullets
+            for world in np.flatnonzero(over > 0).tolist():
+                seq = np.where(self.bullet_alive[world], self.bullet_seq[world], _DEAD_SEQ)
+                self.bullet_alive[world, np.argsort(seq, kind="stable")[: over[world]]] = False
+                self.bullets_evicted[world] += over[world]
+
+    def _resolve_kills(self, w: np.ndarray, e: np.ndarray, b: np.ndarray) -> None:
+        """Apply (world, enemy, bullet) hits the way WorldSimulator's per-enemy loop does:
+        enemies in spawn order, each taking its earliest live bullet."""
+        if len(w) == 0:
+            return
+        order = np.lexsort((self.bullet_seq[w, b], self.enemy_seq[w, e], w))
+        dead, spent = set(), set()
+        kill_worlds, kill_enemies, kill_bullets = [], [], []
+        for world, enemy, bullet in zip(w[order].tolist(), e[order].tolist(), b[order].tolist()):
+            if (world, enemy) in dead or (world, bullet) in spent:
+                continue
+            dead.add((world, enemy))
+            spent.add((world, bullet))
+            kill_worlds.append(world)
+            kill_enemies.append(enemy)
+            kill_bullets.append(bullet)
+        self.enemy_alive[kill_worlds, kill_enemies] = False
+        self.bullet_alive[kill_worlds, kill_bullets] = False
+        self.kill_totals += np.bincount(kill_worlds, minlength=self.num_worlds)
+
+
+__all__ = ["BatchedWorlds", "MOVE_X", "MOVE_Y", "NO_MOVE"]
@@ -1,9 +1,18 @@
-import pygame
+"""
+Bullet Hell game core: constants, bullets, entities and the standalone game loop.
+
+The simulation is headless: collisions use integer rects held in plain attributes and
+NumPy arrays, so importing this module never imports or initialises pygame. pygame is
+imported lazily by the drawing code, ``rect`` helpers, keyboard input and ``main``.
+Kills and damage are reported back by the collision code (hit info) rather than through
+a process-global event queue, so any number of worlds can share one process.
+"""
 import math
 import random
 
-# Initialize Pygame
-pygame.init()
+import numpy as np
+
+from bullet_hell_rl.spatial_hash import SpatialHash
 
 # Constants
 WORLD_WIDTH = 1000
@@ -23,9 +32,11 @@ ENEMY_SPAWN_MIN = 250  # milliseconds
 ENEMY_SPAWN_MAX = 2050  # milliseconds
 ENEMY_ACTION_INTERVAL = 666  # milliseconds
 PLAYER_HEALTH_MAX = 100
-
-#Events
-ENEMY_KILLED = pygame.USEREVENT + 1
+NO_OWNER = -1  # owner_id stored for bullets that no player fired
+# Fixed-point mode: bullet velocities snap to multiples of 2**-FIXED_POINT_BITS px/s. With a
+# power-of-two timestep every position then stays on a dyadic grid, so all position math is
+# exact in float64 and bit-identical on every machine (see WorldSimulator(fixed_point=True)).
+FIXED_POINT_BITS = 8
 
 
 # Colors
@@ -35,41 +46,474 @@ WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 GREEN = (0, 255, 50)
 
+def _round_half_away(v):
+    """Round to the nearest integer, halves away from zero, the way pygame.Rect stores floats."""
+    return np.where(v >= 0, np.floor(v + 0.5), np.ceil(v - 0.5)).astype(np.int64)
+
+
+def _round_half_away_scalar(v):
+    """Scalar version of _round_half_away (NumPy call overhead dominates for one value)."""
+    return int(math.floor(v + 0.5)) if v >= 0 else int(math.ceil(v - 0.5))
+
+
+def _swept_hits(x0, y0, x1, y1, box_x, box_y, box_w, box_h):
+    """Which moving points (x0, y0) -> (x1, y1) pass through the open box, vectorized.
+
+    Slab test on the segment parameter t in [0, 1]: the point is strictly inside the box
+    for t in (t_enter, t_exit). Sweeping a bullet's rect corner against the entity rect
+    grown by the bullet size (Minkowski sum) gives the swept version of colliderect.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tx_a = (box_x - x0) / dx
+        tx_b = (box_x + box_w - x0) / dx
+        ty_a = (box_y - y0) / dy
+        ty_b = (box_y + box_h - y0) / dy
+    # An axis without motion is either inside its slab for every t or for none.
+    still_x = dx == 0
+    still_y = dy == 0
+    in_x = (box_x < x0) & (x0 < box_x + box_w)
+    in_y = (box_y < y0) & (y0 < box_y + box_h)
+    tx_lo = np.where(still_x, np.where(in_x, -np.inf, np.inf), np.minimum(tx_a, tx_b))
+    tx_hi = np.where(still_x, np.where(in_x, np.inf, -np.inf), np.maximum(tx_a, tx_b))
+    ty_lo = np.where(still_y, np.where(in_y, -np.inf, np.inf), np.minimum(ty_a, ty_b))
+    ty_hi = np.where(still_y, np.where(in_y, np.inf, -np.inf), np.maximum(ty_a, ty_b))
+    t_enter = np.maximum(tx_lo, ty_lo)
+    t_exit = np.minimum(tx_hi, ty_hi)
+    return (t_enter < t_exit) & (t_enter < 1) & (t_exit > 0)
+
+
+def quantize(v):
+    """Snap a value to the fixed-point grid (multiples of 2**-FIXED_POINT_BITS)."""
+    scale = 1 << FIXED_POINT_BITS
+    return round(v * scale) / scale
+
+
+def _rects_overlap(ax, ay, asize, bx, by, bsize):
+    """pygame.Rect.colliderect for two squares: rects that only share an edge don't collide."""
+    return ax < bx + bsize and bx < ax + asize and ay < by + bsize and by < ay + asize
+
+
 class Bullet:
-    def __init__(self, x, y, angle, damage, is_friendly):
-        self.x = x
-        self.y = y
-        self.size = BULLET_SIZE
-        self.angle = angle  # in degrees
-        self.speed = BULLET_SPEED_PLAYER if is_friendly else BULLET_SPEED_ENEMY
-        self.damage = damage
-        self.is_friendly = is_friendly
-        # Convert angle to radians and calculate direction vector
-        angle_rad = math.radians(angle)
-        self.vel_x = math.cos(angle_rad) * self.speed
-        self.vel_y = math.sin(angle_rad) * self.speed
-        self.rect = pygame.Rect(x, y, self.size, self.size)
+    """Thin view onto one slot of a BulletPool.
+
+    All state lives in the pool's arrays; the view only remembers its slot, so rendering,
+    observation and server code can keep reading ``bullet.x`` / ``bullet.vel_x`` etc.
+    Constructing a Bullet without a pool gives it a private one-slot pool; appending it
+    to another pool moves its state there.
+    """
+
+    __slots__ = ("_pool", "_slot")
+
+    size = BULLET_SIZE
+
+    def __init__(self, x, y, angle, damage, is_friendly, owner_id=None, pool=None):
+        if pool is None:
+            pool = BulletPool(capacity=1)
+        pool._insert(self, x, y, angle, damage, is_friendly, owner_id)
+
+    @property
+    def x(self):
+        return float(self._pool.x[self._slot])
+
+    @x.setter
+    def x(self, value):
+        self._pool.x[self._slot] = value
+        self._pool._hash.invalidate()
+
+    @property
+    def y(self):
+        return float(self._pool.y[self._slot])
+
+    @y.setter
+    def y(self, value):
+        self._pool.y[self._slot] = value
+        self._pool._hash.invalidate()
+
+    @property
+    def vel_x(self):
+        return float(self._pool.vel_x[self._slot])
+
+    @property
+    def vel_y(self):
+        return float(self._pool.vel_y[self._slot])
+
+    @property
+    def angle(self):
+        return float(self._pool.angle[self._slot])
+
+    @property
+    def damage(self):
+        return int(self._pool.damage[self._slot])
+
+    @property
+    def is_friendly(self):
+        return bool(self._pool.is_friendly[self._slot])
+
+    @property
+    def speed(self):
+        return BULLET_SPEED_PLAYER if self.is_friendly else BULLET_SPEED_ENEMY
+
+    @property
+    def owner_id(self):
+        owner = int(self._pool.owner_id[self._slot])
+        return None if owner == NO_OWNER else owner
+
+    @owner_id.setter
+    def owner_id(self, value):
+        self._pool.owner_id[self._slot] = NO_OWNER if value is None else value
+
+    @property
+    def rect_x(self):
+        return int(self._pool.rect_x[self._slot])
+
+    @property
+    def rect_y(self):
+        return int(self._pool.rect_y[self._slot])
+
+    @property
+    def rect(self):
+        """A pygame.Rect copy of the collision rect (imports pygame)."""
+        import pygame
+
+        return pygame.Rect(self.rect_x, self.rect_y, self.size, self.size)
 
     def update(self, delta_time):
         # Update position based on velocity
-        self.x += self.vel_x * delta_time
-        self.y += self.vel_y * delta_time
-        self.rect.x = self.x
-        self.rect.y = self.y
+        pool = self._pool
+        slot = self._slot
+        pool.prev_rect_x[slot] = pool.rect_x[slot]
+        pool.prev_rect_y[slot] = pool.rect_y[slot]
+        pool.x[slot] += pool.vel_x[slot] * delta_time
+        pool.y[slot] += pool.vel_y[slot] * delta_time
+        pool.rect_x[slot] = _round_half_away(pool.x[slot])
+        pool.rect_y[slot] = _round_half_away(pool.y[slot])
+        pool._max_step = max(
+            pool._max_step,
+            abs(int(pool.rect_x[slot]) - int(pool.prev_rect_x[slot])),
+            abs(int(pool.rect_y[slot]) - int(pool.prev_rect_y[slot])),
+        )
+        pool._hash.invalidate()
     
     def is_off_screen(self):
         # Check if bullet is outside world bounds
-        return (self.x < 0 or self.x > WORLD_WIDTH or 
-                self.y < 0 or self.y > WORLD_HEIGHT)
+        x = self.x
+        y = self.y
+        pool = self._pool
+        return (x < 0 or x > pool.world_width or
+                y < 0 or y > pool.world_height)
     
     def draw(self, screen, camera_x, camera_y):
         # Draw bullet relative to camera
         screen_x = self.x - camera_x
         screen_y = self.y - camera_y
+        import pygame
+
         color = BLUE if self.is_friendly else RED
         pygame.draw.circle(screen, color, (int(screen_x + self.size/2), int(screen_y + self.size/2)), self.size//2)
 
+
+class BulletPool:
+    """Structure-of-arrays store for all live bullets in one world.
+
+    Positions, velocities, damage, friendliness and owner ids sit in preallocated NumPy
+    arrays; released slots go on a free-list and are reused by later shots. The pool
+    quacks like the old ``list[Bullet]`` (append, remove, ``in``, ``len``, iteration in
+    spawn order) so existing callers keep working, while ``update`` and
+    ``remove_off_screen`` touch every bullet in a single vectorized operation.
+
+    With ``swept`` on, collision tests also sweep each bullet's rect along the path of its
+    last update (``prev_rect_*`` -> ``rect_*``), so fast bullets cannot tunnel through an
+    entity between ticks and larger timesteps stay correct. With ``fixed_point`` on, new
+    bullets get velocities snapped to the fixed-point grid (see ``quantize``), so trig
+    results that differ in the last bit between platforms cannot change the game.
+    """
+
+    def __init__(self, capacity=256, use_spatial_hash=True, swept=False, fixed_point=False,
+                 world_width=WORLD_WIDTH, world_height=WORLD_HEIGHT):
+        self.capacity = 0
+        self.x = np.empty(0, dtype=np.float64)
+        self.y = np.empty(0, dtype=np.float64)
+        self.vel_x = np.empty(0, dtype=np.float64)
+        self.vel_y = np.empty(0, dtype=np.float64)
+        self.angle = np.empty(0, dtype=np.float64)
+        # Integer collision rect corner, following pygame.Rect: truncated when the bullet
+        # is created, rounded once it has moved (what ``rect.x = self.x`` used to do).
+        self.rect_x = np.empty(0, dtype=np.int64)
+        self.rect_y = np.empty(0, dtype=np.int64)
+        # Rect corner before the last update; the swept test covers prev_rect -> rect.
+        self.prev_rect_x = np.empty(0, dtype=np.int64)
+        self.prev_rect_y = np.empty(0, dtype=np.int64)
+        self.damage = np.empty(0, dtype=np.int64)
+        self.is_friendly = np.empty(0, dtype=bool)
+        self.owner_id = np.empty(0, dtype=np.int64)
+        self.seq = np.empty(0, dtype=np.int64)  # spawn order, keeps list semantics
+        self.alive = np.empty(0, dtype=bool)
+        self._views = np.empty(0, dtype=object)
+        self._free = np.empty(0, dtype=np.int64)  # stack of free slots
+        self._n_free = 0
+        self._high_water = 0  # one past the highest slot ever used
+        self._count = 0
+        self._next_seq = 0
+        # Collision broadphase over rect corners; rebuilt lazily after bullets move.
+        self.use_spatial_hash = use_spatial_hash
+        self.world_width = world_width  # bullets leaving [0, world_width] x [0, world_height] are culled
+        self.world_height = world_height
+        self._hash = SpatialHash(world_width, world_height)
+        self.swept = swept
+        self.fixed_point = fixed_point
+        self._max_step = 0  # largest per-axis rect move in the last update (pads hash queries)
+        self._grow(max(1, int(capacity)))
+
+    def _grow(self, new_capacity):
+        old = self.capacity
+        for name in ("x", "y", "vel_x", "vel_y", "angle", "rect_x", "rect_y", "prev_rect_x", "prev_rect_y",
+                     "damage", "is_friendly", "owner_id", "seq", "alive", "_views"):
+            arr = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=arr.dtype) if arr.dtype != object else np.empty(new_capacity, dtype=object)
+            grown[:old] = arr
+            setattr(self, name, grown)
+        free = np.empty(new_capacity, dtype=np.int64)
+        # New slots go underneath the existing free stack, lowest index on top.
+        added = np.arange(new_capacity - 1, old - 1, -1, dtype=np.int64)
+        free[:len(added)] = added
+        free[len(added):len(added) + self._n_free] = self._free[:self._n_free]
+        self._free = free
+        self._n_free += len(added)
+        self.capacity = new_capacity
+
+    def _insert(self, view, x, y, angle, damage, is_friendly, owner_id=None):
+        if self._n_free == 0:
+            self._grow(self.capacity * 2)
+        self._n_free -= 1
+        slot = int(self._free[self._n_free])
+        speed = BULLET_SPEED_PLAYER if is_friendly else BULLET_SPEED_ENEMY
+        angle_rad = math.radians(angle)
+        self.x[slot] = x
+        self.y[slot] = y
+        vel_x = math.cos(angle_rad) * speed
+        vel_y = math.sin(angle_rad) * speed
+        if self.fixed_point:
+            vel_x = quantize(vel_x)
+            vel_y = quantize(vel_y)
+        self.vel_x[slot] = vel_x
+        self.vel_y[slot] = vel_y
+        self.angle[slot] = angle
+        self.rect_x[slot] = int(x)
+        self.rect_y[slot] = int(y)
+        self.prev_rect_x[slot] = self.rect_x[slot]
+        self.prev_rect_y[slot] = self.rect_y[slot]
+        self.damage[slot] = damage
+        self.is_friendly[slot] = is_friendly
+        self.owner_id[slot] = NO_OWNER if owner_id is None else owner_id
+        self.seq[slot] = self._next_seq
+        self.alive[slot] = True
+        self._views[slot] = view
+        self._next_seq += 1
+        self._count += 1
+        if slot >= self._high_water:
+            self._high_water = slot + 1
+        if self._hash.valid:
+            self._hash.add_pending(slot)
+        view._pool = self
+        view._slot = slot
+
+    def spawn(self, x, y, angle, damage, is_friendly, owner_id=None):
+        """Create a bullet directly in this pool and return its view."""
+        return Bullet(x, y, angle, damage, is_friendly, owner_id, pool=self)
+
+    def append(self, bullet):
+        """Adopt a bullet. Bullets already live in this pool are left untouched."""
+        if bullet in self:
+            return
+        src = bullet._pool
+        slot = bullet._slot
+        state = (src.x[slot], src.y[slot], src.vel_x[slot], src.vel_y[slot])
+        self._insert(
+            bullet, state[0], state[1], float(src.angle[slot]), int(src.damage[slot]),
+            bool(src.is_friendly[slot]), None,
+        )
+        self.vel_x[bullet._slot] = state[2]
+        self.vel_y[bullet._slot] = state[3]
+        self.rect_x[bullet._slot] = src.rect_x[slot]
+        self.rect_y[bullet._slot] = src.rect_y[slot]
+        self.prev_rect_x[bullet._slot] = src.prev_rect_x[slot]
+        self.prev_rect_y[bullet._slot] = src.prev_rect_y[slot]
+        self._max_step = max(self._max_step, src._max_step)
+        self.owner_id[bullet._slot] = src.owner_id[slot]
+        if src._views[slot] is bullet:
+            src._release(np.array([slot], dtype=np.int64))
+
+    def remove(self, bullet):
+        if bullet not in self:
+            raise ValueError("bullet is not in this pool")
+        self._release(np.array([bullet._slot], dtype=np.int64))
+
+    def _release(self, slots):
+        """Free the given (live, unique) slots in one batch."""
+        if len(slots) == 0:
+            return
+        self.alive[slots] = False
+        self._views[slots] = None
+        n = len(slots)
+        self._free[self._n_free:self._n_free + n] = slots[::-1]
+        self._n_free += n
+        self._count -= n
+
+    def remove_many(self, bullets):
+        """Remove every listed bullet that is still live here; ignores the rest."""
+        slots = [b._slot for b in bullets if b in self]
+        if slots:
+            self._release(np.unique(np.asarray(slots, dtype=np.int64)))
+
+    def live_slots(self, ordered=True):
+        """Slots of live bullets, in spawn order (in slot order with ordered=False)."""
+        slots = np.flatnonzero(self.alive[:self._high_water])
+        if ordered and len(slots) > 1:
+            slots = slots[np.argsort(self.seq[slots], kind="stable")]
+        return slots
+
+    def update(self, delta_time):
+        """Integrate every bullet's position by one timestep."""
+        hw = self._high_water
+        self.prev_rect_x[:hw] = self.rect_x[:hw]
+        self.prev_rect_y[:hw] = self.rect_y[:hw]
+        self.x[:hw] += self.vel_x[:hw] * delta_time
+        self.y[:hw] += self.vel_y[:hw] * delta_time
+        self.rect_x[:hw] = _round_half_away(self.x[:hw])
+        self.rect_y[:hw] = _round_half_away(self.y[:hw])
+        if hw:
+            alive = self.alive[:hw]
+            step = np.maximum(
+                np.abs(self.rect_x[:hw] - self.prev_rect_x[:hw]),
+                np.abs(self.rect_y[:hw] - self.prev_rect_y[:hw]),
+            )
+            self._max_step = int(step[alive].max()) if self._count else 0
+        self._hash.invalidate()
+
+    def remove_off_screen(self):
+        """Release every bullet outside world bounds; returns how many were culled."""
+        hw = self._high_water
+        x = self.x[:hw]
+        y = self.y[:hw]
+        off = self.alive[:hw] & ((x < 0) | (x > self.world_width) | (y < 0) | (y > self.world_height))
+        slots = np.flatnonzero(off)
+        self._release(slots)
+        return len(slots)
+
+    def retire_oldest(self, n):
+        """Release the n oldest (earliest spawned) live bullets; returns how many were released."""
+        n = min(int(n), self._count)
+        if n <= 0:
+            return 0
+        live = np.flatnonzero(self.alive[:self._high_water])
+        if n < len(live):
+            live = live[np.argpartition(self.seq[live], n - 1)[:n]]
+        self._release(np.sort(live))
+        return n
+
+    def overlapping(self, rect_x, rect_y, width, height):
+        """Views of live bullets whose rect overlaps the given rect, in spawn order.
+
+        Uses pygame.Rect semantics: integer coordinates (see ``rect_x``), and rects that
+        only share an edge do not collide. Candidates come from the spatial hash unless
+        ``use_spatial_hash`` is off, in which case every live bullet is tested. With
+        ``swept`` on, a bullet also hits if its rect passed through the given rect during
+        its last update.
+        """
+        if not self.use_spatial_hash:
+            slots = np.flatnonzero(self.alive[:self._high_water])
+        else:
+            if not self._hash.valid:
+                live = np.flatnonzero(self.alive[:self._high_water])
+                self._hash.rebuild(live, self.rect_x[live], self.rect_y[live])
+            # A swept bullet now sits at most _max_step from any point of its path.
+            pad = self._max_step if self.swept else 0
+            slots = self._hash.query(
+                rect_x - BULLET_SIZE - pad, rect_y - BULLET_SIZE - pad,
+                rect_x + width + pad, rect_y + height + pad,
+            )
+            slots = slots[self.alive[slots]]
+        if len(slots) == 0:
+            return []
+        bx = self.rect_x[slots]
+        by = self.rect_y[slots]
+        hit = (
+            (bx < rect_x + width) & (rect_x < bx + BULLET_SIZE)
+            & (by < rect_y + height) & (rect_y < by + BULLET_SIZE)
+        )
+        if self.swept:
+            # Minkowski sum: the bullet's corner must pass strictly inside the grown rect.
+            hit |= _swept_hits(
+                self.prev_rect_x[slots], self.prev_rect_y[slots], bx, by,
+                rect_x - BULLET_SIZE, rect_y - BULLET_SIZE, width + BULLET_SIZE, height + BULLET_SIZE,
+            )
+        slots = slots[hit]
+        if len(slots) > 1:
+            slots = np.unique(slots)
+            slots = slots[np.argsort(self.seq[slots], kind="stable")]
+        return list(self._views[slots])
+
+    def clear(self):
+        self._release(np.flatnonzero(self.alive[:self._high_water]))
+
+    # Per-bullet state that fully determines future behaviour (slots and seq numbers don't:
+    # only the spawn order matters, and columns() lists bullets in that order).
+    STATE_COLUMNS = ("x", "y", "vel_x", "vel_y", "angle", "rect_x", "rect_y", "prev_rect_x",
+                     "prev_rect_y", "damage", "is_friendly", "owner_id")
+
+    def columns(self):
+        """Live bullet state as {column: array}, in spawn order."""
+        slots = self.live_slots()
+        return {name: getattr(self, name)[slots] for name in self.STATE_COLUMNS}
+
+    def load_columns(self, columns, max_step=0):
+        """Replace the pool's contents with bullets given as columns (spawn order)."""
+        self.clear()
+        n = len(columns["x"])
+        if n > self._n_free:
+            self._grow(max(self.capacity * 2, n))
+        # Take n slots off the free stack in one go, in the order _insert would.
+        slots = self._free[self._n_free - n:self._n_free][::-1].copy()
+        self._n_free -= n
+        for name in self.STATE_COLUMNS:
+            getattr(self, name)[slots] = columns[name]
+        self.seq[slots] = np.arange(self._next_seq, self._next_seq + n)
+        self._next_seq += n
+        self.alive[slots] = True
+        views = []
+        for slot in slots.tolist():
+            view = Bullet.__new__(Bullet)
+            view._pool = self
+            view._slot = slot
+            views.append(view)
+        if n:
+            self._views[slots] = views
+            self._high_water = max(self._high_water, int(slots.max()) + 1)
+        self._count += n
+        self._max_step = int(max_step)
+        self._hash.invalidate()
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __contains__(self, bullet):
+        if not isinstance(bullet, Bullet) or bullet._pool is not self:
+            return False
+        return self._views[bullet._slot] is bullet
+
+    def __iter__(self):
+        return iter(self._views[self.live_slots()].tolist())
+
 class Entity:
+    # Movement bounds; a WorldSimulator of another size overrides them per entity.
+    world_width = WORLD_WIDTH
+    world_height = WORLD_HEIGHT
+
     def __init__(self, x, y, speed, health, is_friendly, shoot_timer_max):
         self.x = x
         self.y = y
@@ -83,52 +527,87 @@ class Entity:
         self.shoot_timer_max = shoot_timer_max
         self.is_friendly = is_friendly
         self.action = None  # 'left', 'right', 'up', 'down', or None
-        self.rect = pygame.Rect(x, y, self.size, self.size)
+        # Integer collision rect corner (pygame.Rect semantics: truncated here, rounded on move)
+        self.rect_x = int(x)
+        self.rect_y = int(y)
 
         self.kill_count = 0 #for player, to track kills in env for rewards
+
+    @property
+    def rect(self):
+        """A pygame.Rect copy of the collision rect (imports pygame)."""
+        import pygame
+
+        return pygame.Rect(self.rect_x, self.rect_y, self.size, self.size)
+
+    def set_position(self, x, y):
+        """Teleport the entity (e.g. a respawn), keeping the collision rect in sync."""
+        self.x = x
+        self.y = y
+        self.rect_x = _round_half_away_scalar(x)
+        self.rect_y = _round_half_away_scalar(y)
     
     def is_colliding(self, bullets, return_hit_info=False):
         """Check if the entity is colliding with any bullets this update.
         If colliding, check if the bullet has the correct friendly relationship to cause damage.
         Returns list of bullets that should be destroyed.
-        If return_hit_info=True, also returns metadata for kill attribution."""
+        If return_hit_info=True, also returns the hit events: damage taken this call,
+        whether it killed the entity and the owner of the killing bullet."""
         bullets_to_remove = []
+        damage = 0
         killed = False
         killer_owner_id = None
-        for bullet in bullets:
-            if self.rect.colliderect(bullet.rect):
-                # A friendly bullet can hit the enemy. Unfriendly bullets can hit the player.
-                if (self.is_friendly and not bullet.is_friendly) or (not self.is_friendly and bullet.is_friendly):
-                    # Take damage
-                    self.health -= bullet.damage
-                    if self.is_friendly:
-                        pass
-                        # print("hit the player")
-                    else:
-                        # print("hit enemy")
-                        if self.health <= 0 and not killed:
-                            killed = True
-                            # Server can tag bullets with owner_id; local/env bullets may not have it.
-                            killer_owner_id = getattr(bullet, "owner_id", None)
-                            pygame.event.post(pygame.event.Event(ENEMY_KILLED))
-                    bullets_to_remove.append(bullet)
-                    if killed:
-                        # Enemy is dead; stop processing additional hits this tick.
-                        break
+        if isinstance(bullets, BulletPool):
+            # Vectorized rect test over the pool; returns only overlapping bullets, in spawn order.
+            touching = bullets.overlapping(self.rect_x, self.rect_y, self.size, self.size)
+        else:
+            touching = [
+                b for b in bullets
+                if _rects_overlap(self.rect_x, self.rect_y, self.size, b.rect_x, b.rect_y, b.size)
+            ]
+        for bullet in touching:
+            # A friendly bullet can hit the enemy. Unfriendly bullets can hit the player.
+            if (self.is_friendly and not bullet.is_friendly) or (not self.is_friendly and bullet.is_friendly):
+                # Take damage
+                self.health -= bullet.damage
+                damage += bullet.damage
+                if self.is_friendly:
+                    pass
+                    # print("hit the player")
+                else:
+                    # print("hit enemy")
+                    if self.health <= 0 and not killed:
+                        killed = True
+                        # Server can tag bullets with owner_id; local/env bullets may not have it.
+                        killer_owner_id = getattr(bullet, "owner_id", None)
+                bullets_to_remove.append(bullet)
+                if killed:
+                    # Enemy is dead; stop processing additional hits this tick.
+                    break
         if return_hit_info:
             return bullets_to_remove, {
+                "damage": damage,
                 "killed": killed,
                 "killer_owner_id": killer_owner_id,
             }
         return bullets_to_remove
     
-    def spawn_bullet(self, damage):
+    def spawn_bullet(self, damage, bullets=None):
         """Spawns bullet at the AimAngle of the entity.
         Takes in a damage parameter that is applied to the bullet class.
-        Uses the aimangle and the entity position to create the direction vector."""
+        Uses the aimangle and the entity position to create the direction vector.
+        If a BulletPool is given the bullet is created directly inside it."""
         bullet_x = self.x + self.size // 2
         bullet_y = self.y + self.size // 2
+        if bullets is not None:
+            return bullets.spawn(bullet_x, bullet_y, self.aim_angle, damage, self.is_friendly)
         return Bullet(bullet_x, bullet_y, self.aim_angle, damage, self.is_friendly)
+
+    def fire(self, current_time, bullets=None):
+        """Shoot now and restart the shoot timer. shoot() calls this once the interval has
+        passed; a world scheduler that already knows the timer is due calls it directly."""
+        self.shoot_timer = current_time
+        return self.spawn_bullet(BULLET_DAMAGE, bullets)
     
     def update_position(self, delta_time):
         """Update position based on current action."""
@@ -154,17 +633,19 @@ class Entity:
         
         
         # Keep entity within world bounds
-        self.x = max(0, min(WORLD_WIDTH - self.size, self.x))
-        self.y = max(0, min(WORLD_HEIGHT - self.size, self.y))
+        self.x = max(0, min(self.world_width - self.size, self.x))
+        self.y = max(0, min(self.world_height - self.size, self.y))
         
         # Update rect
-        self.rect.x = self.x
-        self.rect.y = self.y
+        self.rect_x = _round_half_away_scalar(self.x)
+        self.rect_y = _round_half_away_scalar(self.y)
     
     def draw(self, screen, camera_x, camera_y):
         # Draw entity relative to camera
         screen_x = self.x - camera_x
         screen_y = self.y - camera_y
+        import pygame
+
         color = BLUE if self.is_friendly else RED
         pygame.draw.rect(screen, color, (screen_x, screen_y, self.size, self.size))
 
@@ -173,35 +654,28 @@ class Player(Entity):
         super().__init__(x, y, PLAYER_SPEED, PLAYER_HEALTH_MAX, True, SHOOT_INTERVAL_PLAYER)
         self.action = None
         self.is_env = is_env
-    def update(self, delta_time, keys, bullets, action="", ):
+    def update(self, delta_time, keys, bullets, action="", return_hit_info=False):
         # Handle movement based on keys
         self.action = None
         if self.is_env:
             self.action = action
         else:
-            if keys[pygame.K_w] or keys[pygame.K_UP]:
-                self.action = 'up'
-            elif keys[pygame.K_s] or keys[pygame.K_DOWN]:
-                self.action = 'down'
-            elif keys[pygame.K_a] or keys[pygame.K_LEFT]:
-                self.action = 'left'
-            elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-                self.action = 'right'
+            self.action = move_from_keys(keys)
         
         self.update_position(delta_time)
         
         # Check collisions
-        bullets_to_remove = self.is_colliding(bullets)
+        bullets_to_remove = self.is_colliding(bullets, return_hit_info=return_hit_info)
         return bullets_to_remove
     
-    def shoot(self, current_time):
-        """Handle shooting at timed intervals with random angle."""
+    def shoot(self, current_time, bullets=None):
+        """Handle shooting at timed intervals with random angle.
+        Pass the world's BulletPool to spawn straight into it."""
         if current_time - self.shoot_timer >= self.shoot_timer_max:
             # Random angle from 0 to 360 degrees
             # self.aim_angle = random.uniform(0, 360)
             #Environment will choose the aim angle. 
-            self.shoot_timer = current_time
-            return self.spawn_bullet(BULLET_DAMAGE)
+            return self.fire(current_time, bullets)
         return None
 
 class Enemy(Entity):
@@ -210,6 +684,7 @@ class Enemy(Entity):
         self.action = None
         self.last_action_time = 0
         self.action_interval = ENEMY_ACTION_INTERVAL
+        self.timer_key = None  # set by the WorldSimulator that owns this enemy
     
     def update(self, delta_time, player, current_time, bullets, return_hit_info=False):
         # Choose a new action every action_interval
@@ -230,98 +705,59 @@ class Enemy(Entity):
         bullets_to_remove = self.is_colliding(bullets, return_hit_info=return_hit_info)
         return bullets_to_remove
     
-    def shoot(self, current_time):
-        """Handle shooting at timed intervals towards player."""
+    def shoot(self, current_time, bullets=None):
+        """Handle shooting at timed intervals towards player.
+        Pass the world's BulletPool to spawn straight into it."""
         if current_time - self.shoot_timer >= self.shoot_timer_max:
-            self.shoot_timer = current_time
-            return self.spawn_bullet(BULLET_DAMAGE)
+            return self.fire(current_time, bullets)
         return None
 
+def move_from_keys(keys):
+    """Map keyboard state (WASD / arrows) to a move string, or None when no key is held."""
+    import pygame
+
+    if keys[pygame.K_w] or keys[pygame.K_UP]:
+        return 'up'
+    elif keys[pygame.K_s] or keys[pygame.K_DOWN]:
+        return 'down'
+    elif keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        return 'left'
+    elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        return 'right'
+    return None
+
 def main():
+    import pygame
+
+    from bullet_hell_rl.world import WorldSimulator
+
+    pygame.init()
+
     # Set up the screen
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Bullet Hell Environment")
     clock = pygame.time.Clock()
 
-    previous_time = pygame.time.get_ticks()
-    current_time = previous_time
-    # Initialize player at random position
-    player = Player(
-        random.randint(0, WORLD_WIDTH - ENTITY_SIZE),
-        random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-    )
-    
-    # Entity and bullet management
-    enemies = []
-    bullets = []
-    last_shot_time = 0
-    last_enemy_spawn_time = 0
-    next_spawn_interval = random.randint(ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX)
+    # Fixed 60 Hz world with the player at a random position (no starting enemies)
+    world = WorldSimulator(tick_ms=1000 / 60, player_ids=(0,), initial_enemies=0)
+    player = world.players[0]
     
     running = True
     while running:
-        # Get current time
-        current_time = pygame.time.get_ticks()
-        delta_time = (current_time-previous_time)/1000
-        previous_time = current_time
-        print(delta_time)
-
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
         
-
-        
-        # Handle player shooting
+        # Advance the world one tick with the player's keyboard move
         keys = pygame.key.get_pressed()
-        player_bullet = player.shoot(current_time)
-        if player_bullet:
-            bullets.append(player_bullet)
-        
-        # Spawn enemies at random intervals
-        if current_time - last_enemy_spawn_time >= next_spawn_interval:
-            # Spawn enemy at random position
-            enemy_x = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-            enemy_y = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-            enemies.append(Enemy(enemy_x, enemy_y))
-            last_enemy_spawn_time = current_time
-            next_spawn_interval = random.randint(ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX)
-        
-        # Update player
-        bullets_to_remove = player.update(delta_time, keys, bullets)
-        for bullet in bullets_to_remove:
-            if bullet in bullets:
-                bullets.remove(bullet)
-        
-        # Update enemies
-        for enemy in enemies[:]:
-            # Enemy shooting
-            enemy_bullet = enemy.shoot(current_time)
-            if enemy_bullet:
-                bullets.append(enemy_bullet)
-            
-            # Enemy update
-            bullets_to_remove = enemy.update( delta_time, player, current_time, bullets,)
-            for bullet in bullets_to_remove:
-                if bullet in bullets:
-                    bullets.remove(bullet)
-            
-            # Remove dead enemies
-            if enemy.health <= 0:
-                enemies.remove(enemy)
+        world.step({0: (move_from_keys(keys), None)})
         
         # Check if player is dead
         if player.health <= 0:
             print("Game Over!")
             running = False
         
-        # Update bullets
-        for bullet in bullets[:]:
-            bullet.update(delta_time)
-            if bullet.is_off_screen():
-                bullets.remove(bullet)
-        
         # Camera follows player (centered on player)
         camera_x = player.x + player.size // 2 - SCREEN_WIDTH // 2
         camera_y = player.y + player.size // 2 - SCREEN_HEIGHT // 2
@@ -337,11 +773,11 @@ def main():
         player.draw(screen, camera_x, camera_y)
         
         # Draw enemies
-        for enemy in enemies:
+        for enemy in world.enemies:
             enemy.draw(screen, camera_x, camera_y)
         
         # Draw bullets
-        for bullet in bullets:
+        for bullet in world.bullets:
             bullet.draw(screen, camera_x, camera_y)
         
         # Update display
@@ -53,7 +53,7 @@ if len(sys.argv) == 2: # the script is run with no arguments
 
     # create environment
     # env=gym.make('CartPole-v1')
-    env = BulletHellEnv(render_mode="human")
+    env = BulletHellEnv(render_mode="human", flat=True, reuse_obs=True)
 
     # select the parameters
     gamma=.99
@@ -0,0 +1,104 @@
+"""
+Batched enemy controller.
+
+Enemy.update re-rolls, moves and aims one enemy at a time (random.choice, update_position,
+math.atan2 per enemy, plus a nearest-player scan per enemy on the server). EnemyController
+does the same work for every enemy of a world at once:
+
+  - every enemy whose ENEMY_ACTION_INTERVAL has elapsed gets its new direction from one
+    RNG call,
+  - movement, world-bounds clamping and the integer collision rect are computed as arrays,
+  - the nearest living player of every enemy comes from one (enemies x players) squared
+    distance matrix, and all aim angles from one arctan2.
+
+Shooting and collisions stay with the entities (Enemy.shoot, Entity.is_colliding); the
+shoot timer is untouched here.
+"""
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+from bullet_hell_rl.bullethell import WORLD_HEIGHT, WORLD_WIDTH, _round_half_away
+
+ENEMY_ACTIONS = ("left", "right", "up", "down")
+# Unit move per action, as Entity.update_position applies it; any other action stands still.
+_MOVE_X = {"left": -1, "right": 1}
+_MOVE_Y = {"up": -1, "down": 1}
+
+
+class EnemyController:
+    """
+    Drives all enemies of one world per tick.
+
+    rng: anything with random.Random's choices(), normally the world's RandomStream
+        (defaults to the global random module).
+    world_width / world_height: the bounds enemies are clamped to.
+    """
+
+    def __init__(self, rng=None, world_width=WORLD_WIDTH, world_height=WORLD_HEIGHT):
+        self.rng = rng if rng is not None else random
+        self.world_width = world_width
+        self.world_height = world_height
+
+    def update(self, enemies, players, current_time, delta_time, due=None) -> None:
+        """Re-roll due directions, move every enemy and aim it at its nearest living player.
+
+        due: enemies whose action interval has elapsed, in list order (the world passes its
+        scheduler's result); scanned from the enemies when not given. With no living players
+        the enemies only keep moving in their current direction, as the per-enemy loop
+        always did.
+        """
+        n = len(enemies)
+        if n == 0:
+            return
+        if players:
+            if due is None:
+                due = [e for e in enemies if current_time - e.last_action_time >= e.action_interval]
+            if due:
+                for enemy, action in zip(due, self.rng.choices(ENEMY_ACTIONS, k=len(due))):
+                    enemy.action = action
+                    enemy.last_action_time = current_time
+
+        state = np.array(
+            [(e.x, e.y, e.speed, e.size, _MOVE_X.get(e.action, 0), _MOVE_Y.get(e.action, 0)) for e in enemies],
+            dtype=np.float64,
+        )
+        size = state[:, 3]
+        move_x = state[:, 4]
+        move_y = state[:, 5]
+        step = state[:, 2] * delta_time
+        # Keep entities within world bounds (same clamp as update_position)
+        x = np.maximum(0, np.minimum(self.world_width - size, state[:, 0] + move_x * step))
+        y = np.maximum(0, np.minimum(self.world_height - size, state[:, 1] + move_y * step))
+        rect_x = _round_half_away(x).tolist()
+        rect_y = _round_half_away(y).tolist()
+        vx = move_x.astype(np.int64).tolist()
+        vy = move_y.astype(np.int64).tolist()
+
+        if players:
+            half = size // 2
+            ex = x + half
+            ey = y + half
+            centers = np.array([(p.x + p.size // 2, p.y + p.size // 2) for p in players], dtype=np.float64)
+            dx = centers[:, 0][None, :] - ex[:, None]
+            dy = centers[:, 1][None, :] - ey[:, None]
+            # argmin keeps the first of equally near players, like the old linear scan
+            nearest = np.argmin(dx * dx + dy * dy, axis=1)
+            rows = np.arange(n)
+            aim = np.degrees(np.arctan2(dy[rows, nearest], dx[rows, nearest])).tolist()
+        else:
+            aim = [e.aim_angle for e in enemies]
+
+        for enemy, ex_, ey_, rx, ry, vx_, vy_, angle in zip(enemies, x.tolist(), y.tolist(), rect_x, rect_y, vx, vy, aim):
+            enemy.x = ex_
+            enemy.y = ey_
+            enemy.rect_x = rx
+            enemy.rect_y = ry
+            enemy.vx = vx_
+            enemy.vy = vy_
+            enemy.aim_angle = angle
+
+
+__all__ = ["ENEMY_ACTIONS", "EnemyController"]
@@ -0,0 +1,431 @@
+import multiprocessing
+import os
+import time
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from gymnasium.error import AlreadyPendingCallError, ClosedEnvironmentError, NoAsyncCallError
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+from bullet_hell_rl.envs.BulletHellVecEnv import (
+    OBS_DIM,
+    BulletHellVecEnv,
+    flatten_observation,
+    make_action_space,
+    make_observation_space,
+)
+
+# Info entries, one float64 column each in the shared block
+INFO_KEYS = (
+    "frames",
+    "current_time",
+    "step_count",
+    "player_health",
+    "kill_count",
+    "damage_taken",
+    "spawns_skipped",
+    "bullets_evicted",
+)
+_FLOAT_INFO = {"current_time"}
+
+
+def _layout(n: int) -> tuple[dict, int]:
+    """Offsets of every shared array for n envs (8-byte aligned) and the block size."""
+    fields = (
+        ("obs", (n, OBS_DIM), np.float32),
+        ("rewards", (n,), np.float64),
+        ("terminations", (n,), np.bool_),
+        ("truncations", (n,), np.bool_),
+        ("move", (n,), np.int64),
+        ("angle", (n,), np.float64),
+        ("infos", (n, len(INFO_KEYS)), np.float64),
+    )
+    layout, offset = {}, 0
+    for name, shape, dtype in fields:
+        layout[name] = (shape, dtype, offset)
+        offset += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+    return layout, offset
+
+
+def _views(buf, layout: dict, start: int = 0, stop: int | None = None) -> dict:
+    """numpy views of the shared block, rows start:stop of every array."""
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)[start:stop]
+        for name, (shape, dtype, offset) in layout.items()
+    }
+
+
+def _worker_seed(seed: int, index: int) -> int:
+    """Independent seed for one worker's batched worlds."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1)[0])
+
+
+class _BatchedSlice:
+    """A worker's envs as one BulletHellVecEnv."""
+
+    def __init__(self, index, start, n, env_kwargs):
+        self.index = index
+        seed = env_kwargs.get("seed")
+        if seed is not None:
+            env_kwargs = {**env_kwargs, "seed": _worker_seed(seed, index)}
+        self.env = BulletHellVecEnv(num_envs=n, **env_kwargs)
+
+    def reset(self, out, seed, mask):
+        seed = None if seed is None else _worker_seed(seed, self.index)
+        obs, _ = self.env.reset(seed=seed, options=None if mask is None else {"reset_mask": mask})
+        rows = slice(None) if mask is None else mask
+        out["obs"][rows] = obs[rows]
+        out["rewards"][rows] = 0
+        out["terminations"][rows] = False
+        out["truncations"][rows] = False
+        self._write_infos(out, self.env._infos(np.zeros(self.env.num_envs, dtype=np.int64)), rows)
+
+    def step(self, out):
+        obs, rewards, terminations, truncations, infos = self.env.step(
+            {"move": out["move"], "fire_angle": out["angle"]}
+        )
+        out["obs"][:] = obs
+        out["rewards"][:] = rewards
+        out["terminations"][:] = terminations
+        out["truncations"][:] = truncations
+        self._write_infos(out, infos, slice(None))
+
+    @staticmethod
+    def _write_infos(out, infos, rows):
+        for j, key in enumerate(INFO_KEYS):
+            out["infos"][rows, j] = infos[key][rows]
+
+
+class _EnvSlice:
+    """A worker's envs as separate BulletHellEnv instances (the exact single-env game),
+    auto-reset on the next step like BulletHellVecEnv."""
+
+    def __init__(self, index, start, n, env_kwargs):
+        env_kwargs = dict(env_kwargs)
+        self.max_steps = env_kwargs.pop("max_steps", None)
+        self.max_episode_steps = env_kwargs.pop("max_episode_steps", None)
+        env_kwargs.pop("seed", None)
+        # Observations are copied into shared memory right away, so skip the env's own copy
+        env_kwargs["reuse_obs"] = True
+        self.start = start
+        self.envs = [BulletHellEnv(**env_kwargs) for _ in range(n)]
+        for env in self.envs:
+            if self.max_steps is not None:
+                env.max_steps = self.max_steps
+        self.needs_reset = np.zeros(n, dtype=bool)
+
+    def reset(self, out, seed, mask):
+        for i, env in enumerate(self.envs):
+            if mask is None or mask[i]:
+                self._reset(out, i, None if seed is None else seed + self.start + i)
+
+    def _reset(self, out, i, seed=None):
+        env = self.envs[i]
+        obs, _ = env.reset(seed=seed)
+        flatten_observation(obs, out["obs"][i])
+        out["rewards"][i] = 0
+        out["terminations"][i] = False
+        out["truncations"][i] = False
+        world = env.world
+        out["infos"][i] = (
+            0, env.current_time, env.step_count, env.player.health, world.kill_totals[PLAYER_ID],
+            world.damage_totals[PLAYER_ID], world.spawns_skipped, world.bullets_evicted,
+        )
+        self.needs_reset[i] = False
+
+    def step(self, out):
+        move = out["move"].tolist()
+        angle = out["angle"].astype(np.int16)
+        for i, env in enumerate(self.envs):
+            if self.needs_reset[i]:
+                self._reset(out, i)
+                continue
+            obs, reward, terminated, truncated, info = env.step({"move": move[i], "fire_angle": angle[i:i + 1]})
+            if self.max_episode_steps is not None and env.step_count >= self.max_episode_steps:
+                truncated = True
+            flatten_observation(obs, out["obs"][i])
+            out["rewards"][i] = reward
+            out["terminations"][i] = terminated
+            out["truncations"][i] = truncated
+            out["infos"][i] = [info[key] for key in INFO_KEYS]
+            self.needs_reset[i] = terminated or truncated
+
+
+def _worker(index, pipe, parent_pipe, shm_name, num_envs, start, stop, env_kwargs, batched, cpu):
+    """Worker loop: run commands from the parent against its rows of the shared block."""
+    parent_pipe.close()
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    shm = shared_memory.SharedMemory(name=shm_name)
+    layout, _ = _layout(num_envs)
+    out = _views(shm.buf, layout, start, stop)
+    try:
+        envs = (_BatchedSlice if batched else _EnvSlice)(index, start, stop - start, env_kwargs)
+        while True:
+            command, data = pipe.recv()
+            if command == "step":
+                envs.step(out)
+            elif command == "reset":
+                seed, mask = data
+                envs.reset(out, seed, mask)
+            elif command == "close":
+                pipe.send(("ok", None))
+                break
+            pipe.send(("ok", None))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        pipe.send(("error", traceback.format_exc()))
+    finally:
+        # Views must go before the mapping can close
+        del out
+        shm.close()
+        pipe.close()
+
+
+class BulletHellAsyncVecEnv(VectorEnv):
+    """
+    ## Description
+
+    num_envs Bullet Hell games spread over worker processes, for collecting on several
+    cores. Each worker owns a contiguous slice of the envs and writes observations,
+    rewards, dones and infos straight into one multiprocessing.shared_memory block; the
+    parent writes actions there too. The pipes only carry "step" / "reset" commands and
+    one-word acknowledgements, so nothing per env is pickled on the hot path.
+
+    Observations, actions, rewards and auto-reset are BulletHellVecEnv's: (num_envs, 63)
+    float32 rows, the batched Dict action, next-step auto-reset.
+
+    ## Status
+
+    Experimental. The multi-core speedup has not been measured yet: it has only run on a
+    single core, where the IPC costs about 10% (34k vs 38k env steps/s for 64 envs against
+    an in-process BulletHellVecEnv). Measure with benchmarks/bench_async_vec_env.py on the
+    target machine before relying on it; BulletHellVecEnv in one process is the supported
+    path until then.
+
+    ## Arguments
+
+    num_workers: worker processes (default: one per usable core, at most num_envs).
+
+    batched: True runs each worker's slice as one BulletHellVecEnv (array-stepped worlds,
+    the fast path); False runs separate BulletHellEnv instances, the exact single-env game.
+
+    pin_workers: pin worker i to the i-th usable core (os.sched_setaffinity, Linux), so
+    workers don't migrate between cores or pile up on one.
+
+    context: multiprocessing start method (default: the platform's).
+
+    copy: return copies of the shared observation/reward/done arrays (default). With
+    copy=False step_wait returns views of the shared block, which the next step
+    overwrites in place: zero-copy, as long as the caller is done with them by then.
+
+    Other keyword arguments (tick_ms, frame_skip, max_enemies, max_bullets, world_width,
+    world_height, max_steps, max_episode_steps) configure every env.
+
+    ## Usage
+
+    step() is step_async() followed by step_wait(); call them separately to overlap
+    the workers' stepping with work in the parent (e.g. a learner update).
+
+    A worker that raises or dies makes the pending call raise RuntimeError (with the
+    worker's traceback); every later call raises too, and close() cleans up.
+    """
+
+    metadata = {
+        "render_modes": [],
+        "autoreset_mode": AutoresetMode.NEXT_STEP,
+    }
+
+    def __init__(
+        self,
+        num_envs: int = 8,
+        num_workers: int | None = None,
+        batched: bool = True,
+        pin_workers: bool = True,
+        context: str | None = None,
+        copy: bool = True,
+        **env_kwargs,
+    ):
+        if hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(os.cpu_count() or 1))
+            pin_workers = False
+        if num_workers is None:
+            num_workers = len(cpus)
+        num_workers = max(1, min(num_workers, num_envs))
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.copy = copy
+        self.render_mode = None
+        self.single_action_space = make_action_space()
+        self.single_observation_space = make_observation_space()
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._slices = [slice(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+        layout, size = _layout(num_envs)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._buffers = _views(self._shm.buf, layout)
+        self._waiting = None
+        self._failed = None  # why the workers can't be used any more (close() tears down)
+
+        ctx = multiprocessing.get_context(context)
+        self._pipes = []
+        self._processes = []
+        for index, rows in enumerate(self._slices):
+            parent_pipe, child_pipe = ctx.Pipe()
+            cpu = cpus[index % len(cpus)] if pin_workers else None
+            process = ctx.Process(
+                target=_worker,
+                name=f"BulletHellAsyncVecEnv-{index}",
+                args=(index, child_pipe, parent_pipe, self._shm.name, num_envs, rows.start, rows.stop,
+                      env_kwargs, batched, cpu),
+                daemon=True,
+            )
+            process.start()
+            child_pipe.close()
+            self._pipes.append(parent_pipe)
+            self._processes.append(process)
+
+    # ------------------------------------------------------------------ commands
+    def _send(self, commands) -> None:
+        for index, (pipe, command) in enumerate(zip(self._pipes, commands)):
+            try:
+                pipe.send(command)
+            except (BrokenPipeError, ConnectionResetError):
+                self._fail(index, "the worker process exited")
+
+    def _fail(self, index: int, reason: str) -> None:
+        """Mark the env failed (close() tears the workers down) and raise RuntimeError."""
+        self._waiting = None
+        self._failed = f"BulletHellAsyncVecEnv worker {index} failed:\n{reason}"
+        raise RuntimeError(self._failed)
+
+    def _receive(self, timeout: float | None) -> None:
+        """Wait for every worker's acknowledgement. A worker error or death marks the env
+        failed and raises RuntimeError; the caller's close() then tears the workers down."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for index, pipe in enumerate(self._pipes):
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not pipe.poll(remaining):
+                raise multiprocessing.TimeoutError(f"worker {index} did not answer within {timeout} s")
+            try:
+                status, payload = pipe.recv()
+            except (EOFError, ConnectionResetError):
+                status, payload = "error", "the worker process exited"
+            if status == "error":
+                self._fail(index, payload)
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ClosedEnvironmentError("BulletHellAsyncVecEnv is closed")
+        if self._failed is not None:
+            raise RuntimeError(f"{self._failed}\nclose() the env and build a new one")
+
+    def reset_async(self, seed: int | None = None, options: dict | None = None) -> None:
+        self._check_open()
+        if self._waiting is not None:
+            raise AlreadyPendingCallError(f"still waiting for a pending {self._waiting}", self._waiting)
+        mask = None if options is None else options.get("reset_mask")
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+        self._send(("reset", (seed, None if mask is None else mask[rows])) for rows in self._slices)
+        self._waiting = "reset"
+
+    def reset_wait(self, timeout: float | None = None):
+        if self._waiting != "reset":
+            raise NoAsyncCallError("reset_wait without a pending reset_async", "reset")
+        self._receive(timeout)
+        self._waiting = None
+        return self._out(self._buffers["obs"]), {}
+
+    def reset(self, *, seed: int | None = None, options: dict | None = None):
+        """Reset every env, or only options["reset_mask"]'s. Worker slices are seeded
+        independently from seed."""
+        super().reset(seed=seed)
+        self.reset_async(seed=seed, options=options)
+        return self.reset_wait()
+
+    def step_async(self, actions) -> None:
+        """Write the actions into the shared block and start every worker stepping."""
+        self._check_open()
+        if self._waiting is not None:
+            raise AlreadyPendingCallError(f"still waiting for a pending {self._waiting}", self._waiting)
+        self._buffers["move"][:] = np.asarray(actions["move"]).reshape(self.num_envs)
+        self._buffers["angle"][:] = np.asarray(actions["fire_angle"]).reshape(self.num_envs)
+        self._send(("step", None) for _ in self._pipes)
+        self._waiting = "step"
+
+    def step_wait(self, timeout: float | None = None):
+        """Wait for the workers; multiprocessing.TimeoutError if one takes over timeout seconds."""
+        if self._waiting != "step":
+            raise NoAsyncCallError("step_wait without a pending step_async", "step")
+        self._receive(timeout)
+        self._waiting = None
+        buffers = self._buffers
+        infos = {}
+        for j, key in enumerate(INFO_KEYS):
+            column = buffers["infos"][:, j]
+            infos[key] = column.copy() if key in _FLOAT_INFO else column.astype(np.int64)
+            infos[f"_{key}"] = np.ones(self.num_envs, dtype=bool)
+        return (
+            self._out(buffers["obs"]),
+            self._out(buffers["rewards"]),
+            self._out(buffers["terminations"]),
+            self._out(buffers["truncations"]),
+            infos,
+        )
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def _out(self, array: np.ndarray) -> np.ndarray:
+        return array.copy() if self.copy else array
+
+    # ------------------------------------------------------------------ shutdown
+    def close_extras(self, timeout: float | None = None, terminate: bool = False) -> None:
+        """Stop the workers (terminate=True kills them without waiting) and free the block.
+        Safe to call again, and after a worker failed."""
+        if self._shm is None:
+            return
+        if self._failed is not None:
+            terminate = True
+        if self._waiting is not None and not terminate:
+            try:
+                self._receive(timeout)
+            except (multiprocessing.TimeoutError, RuntimeError):
+                terminate = True
+            self._waiting = None
+        if not terminate:
+            for pipe, process in zip(self._pipes, self._processes):
+                if process.is_alive():
+                    try:
+                        pipe.send(("close", None))
+                        if pipe.poll(timeout):
+                            pipe.recv()
+                    except (BrokenPipeError, ConnectionResetError, EOFError):
+                        pass
+        for pipe, process in zip(self._pipes, self._processes):
+            if terminate and process.is_alive():
+                process.terminate()
+            process.join(timeout)
+            pipe.close()
+        self._buffers = None
+        shm, self._shm = self._shm, None
+        shm.close()
+        shm.unlink()
+
+    def __del__(self):
+        if not getattr(self, "closed", True) and getattr(self, "_shm", None) is not None:
+            self.close(terminate=True)
+
+
+__all__ = ["BulletHellAsyncVecEnv", "INFO_KEYS"]
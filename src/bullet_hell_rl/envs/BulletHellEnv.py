@@ -1,3 +1,5 @@
+import pickle
+
 import numpy as np
 
 import gymnasium as gym
@@ -7,6 +9,61 @@ from gymnasium.error import DependencyNotInstalled
 from typing import Optional, Union
 
 from bullet_hell_rl.bullethell import * 
+from bullet_hell_rl.DQN.actor_learner_rl_bridge import (
+    GRID_CHANNELS,
+    GRID_SIZE,
+    STATE_DIM as BRIDGE_OBS_DIM,
+    additive_reward,
+    build_grid_from_arrays,
+    build_obs_from_arrays,
+    count_nearby_allies,
+)
+from bullet_hell_rl.net.protocol import FLAT_ACTION_COUNT, flat_action_to_move_and_angle
+from bullet_hell_rl.world import WorldSimulator
+
+PLAYER_ID = 0  # the env's single player in its WorldSimulator
+ENV_TICK_MS = 60  # default simulated milliseconds per env step
+MOVE_LOOKUP = ("left", "right", "up", "down", "none")  # move action -> Entity.action
+_PARTITION_MIN = 512  # below this many bullets one lexsort beats argpartition + sort
+#flat action -> (Entity.action, fire angle), as net.protocol encodes it
+FLAT_ACTIONS = tuple(
+    (MOVE_LOOKUP[move], angle)
+    for move, angle in map(flat_action_to_move_and_angle, range(FLAT_ACTION_COUNT))
+)
+
+
+def _is_plain_action(action) -> bool:
+    """Cheap check for the common well-formed action: {"move": int in 0..4, "fire_angle":
+    int16 array of shape (1,) in 0..270}. Anything else goes to action_space.contains."""
+    if type(action) is not dict or len(action) != 2:
+        return False
+    move = action.get("move")
+    angle = action.get("fire_angle")
+    return (
+        isinstance(move, (int, np.integer)) and 0 <= move < 5
+        and type(angle) is np.ndarray and angle.dtype == np.int16 and angle.shape == (1,)
+        and 0 <= angle[0] <= 270
+    )
+
+
+def _nearest(dist: np.ndarray, order: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k smallest distances, ascending, ties broken by order (spawn
+    sequence): the first k of a stable sort in spawn order. For large inputs
+    np.argpartition picks the k candidates; entries tied with the k-th are added so ties
+    at the cut resolve exactly as the full sort would."""
+    if len(dist) > max(k, _PARTITION_MIN):
+        candidates = np.argpartition(dist, k - 1)[:k]
+        kth = dist[candidates].max()
+        if np.count_nonzero(dist <= kth) > k:
+            candidates = np.flatnonzero(dist <= kth)
+        return candidates[np.lexsort((order[candidates], dist[candidates]))[:k]]
+    return np.lexsort((order, dist))[:k]
+
+
+def _entity_rows(entities) -> np.ndarray:
+    """(n, 4) float rows (x, y, vx, vy) of players or enemies."""
+    return np.array([(e.x, e.y, e.vx, e.vy) for e in entities], dtype=np.float64).reshape(-1, 4)
+
 
 class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
     """
@@ -28,9 +85,9 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
     The observation space is only a segment of what information is actually visible for the agent here. 
     The observation space will consist of the 5 nearest enemy positions + their velocity(vx,vy). 
     Additionally it will consist of the 10 nearest bullet positions and their velocities(vx,vy).
-    Finally, it will also contain the player's health and position. for a total of 60 observations
+    Finally, it will also contain the player's health and position, for a total of 63 observations:
 
-    5*4 + 10 * 4 = 60 + 3 for player 
+    3 for the player + 5*4 + 10*4 = 63
 
     *We may need to design further some more careful observations that are more actionable. Rather than direct world observations but fuck it lets try
 
@@ -61,23 +118,99 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
 
     ## Arguments
 
-    render_mode as a keyword for gymnasium.make(). 
-    The user can either choose "human" or "terminal"
+    render_mode: "human", "terminal" or "rgb_array" (a gymnasium.make() keyword).
+    "rgb_array" draws offscreen (no window, no frame rate cap) and render() returns the
+    frame as a (screen_height, screen_width, 3) uint8 array. The array is reused: every
+    render() redraws it in place, so copy frames you keep (RecordVideo does). It is
+    shared with the Surface drawn on through pygame.image.frombuffer, not a
+    pygame.surfarray view: pixels3d keeps its Surface locked while the array lives, and
+    blits onto a locked Surface fail.
+
+    tick_ms: simulated milliseconds per step (default 60). Bullet collisions are swept
+    along each bullet's path, so 2-4x larger ticks stay correct and cover more game time
+    per step.
+
+    frame_skip: world ticks per step (default 1). The action is held for every tick,
+    rewards are summed, the step ends early if the player dies, and the observation is
+    built once at the end. Works through gymnasium.make("BulletHell-v0", frame_skip=4).
+
+    max_enemies / max_bullets: caps on live enemies (spawning pauses at the cap) and live
+    bullets (oldest retired first). None means unbounded. info reports how often each cap
+    triggered this episode as "spawns_skipped" and "bullets_evicted".
+
+    world_width / world_height: world size in pixels (default 1000 x 1000). Observations
+    are normalized by it.
+
+    flat: False (default) for the Dict observation and action above. True makes the env
+    speak what a DQN consumes: the observation is one float32 Box of 63 (player, then the
+    enemies rows, then the bullets rows; BulletHellVecEnv's layout) and the action a
+    Discrete(20) index, move * 4 + fire_angle / 90 as net.protocol.FLAT_ACTION_COUNT
+    encodes it.
+
+    obs_mode / reward_mode: "default" for the above, or "bridge" for the networked actors'
+    own features and reward (DQN.actor_learner_rl_bridge), computed from the world
+    instead of from JSON updates so a policy pretrained here runs unchanged on the
+    actor / learner fleet. The bridge observation is a float32 Box of 49 (density cones,
+    hostile bullets, allies, enemies, health); the bridge reward is the additive reward
+    between the end of the previous step and the end of this one, as the actor computes it
+    between consecutive updates. Pair them with flat=True for the actors' Discrete(20)
+    actions. obs_mode="grid" is the bridge's occupancy grid instead: float32 counts of
+    hostile bullets, enemies and other players per cell of a 16 x 16 window centred on the
+    player, shape (3, 16, 16). It covers every bullet near the player, not the nearest
+    10, and takes no sort.
+
+    ## Observation buffers
+
+    The observation arrays are allocated once and refilled in place by every step and
+    reset (env.state). By default step and reset return a copy, so observations can be
+    kept as they are. reuse_obs=True returns env.state itself and skips the copy: the
+    returned dict (or array) is then overwritten by the next step or reset, so copy or
+    flatten whatever you keep past it, as the DQN code and the FrameStack wrappers do.
+
+    ## Saving and restoring state
+
+    get_state() returns the whole episode (world, RNG, step count, reward trackers and the
+    current observation) as a compact bytes blob; set_state(blob) puts the env back there,
+    after which env.state is the restored observation and steps replay exactly. Use it to
+    reset into saved hard states, fork an episode for lookahead, or skip warm-up ticks.
+    The blob records obs_mode and flat; restoring it into an env with other values raises
+    ValueError.
 
     ## Vectorized environment
 
-    ** Could be cool to investigate Looks liek you need to write your very own Vector Environment
+    For many envs in one process use envs.BulletHellVecEnv (N worlds stepped together on
+    batched arrays, next-step auto-reset); BulletHellAsyncVecEnv splits those worlds over
+    worker processes.
 
     """
 
     metadata = {
-        "render_modes": ["human", "terminal"],
+        "render_modes": ["human", "terminal", "rgb_array"],
         "render_fps": 50,
     }
 
-    def __init__(self, render_mode: str | None = "terminal"):
-        self.world_width = WORLD_WIDTH
-        self.world_height = WORLD_HEIGHT
+    def __init__(
+        self,
+        render_mode: str | None = "terminal",
+        tick_ms: float = ENV_TICK_MS,
+        frame_skip: int = 1,
+        max_enemies: int | None = None,
+        max_bullets: int | None = None,
+        world_width: int = WORLD_WIDTH,
+        world_height: int = WORLD_HEIGHT,
+        flat: bool = False,
+        obs_mode: str = "default",
+        reward_mode: str = "default",
+        reuse_obs: bool = False,
+    ):
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be >= 1, got {frame_skip}")
+        if obs_mode not in ("default", "bridge", "grid"):
+            raise ValueError(f"obs_mode must be 'default', 'bridge' or 'grid', got {obs_mode!r}")
+        if reward_mode not in ("default", "bridge"):
+            raise ValueError(f"reward_mode must be 'default' or 'bridge', got {reward_mode!r}")
+        self.world_width = world_width
+        self.world_height = world_height
         self.screen_width = SCREEN_WIDTH
         self.screen_height = SCREEN_HEIGHT
         self.entity_size = 20
@@ -97,8 +230,16 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
         self.player_previous_kill_count = 0
 
 
-        self.previous_time = 0
         self.current_time = 0
+        self.tick_ms = tick_ms
+        self.frame_skip = frame_skip
+        self.max_enemies = max_enemies
+        self.max_bullets = max_bullets
+        self.flat = flat
+        self.obs_mode = obs_mode
+        self.reward_mode = reward_mode
+        self.reuse_obs = reuse_obs
+        self.world = None
         
         self.max_steps = 10000
         self.step_count = 0
@@ -149,166 +290,84 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
             ),
         })
             
+        #Observation buffers, refilled in place by every step and reset. Flat, the three
+        #are views into the one observation array.
+        if flat:
+            obs_dim = 3 + 4*self.N_enemies + 4*self.N_bullets
+            low = np.full(obs_dim, -1.0, dtype=np.float32)
+            low[:3] = 0.0
+            self.observation_space = spaces.Box(low=low, high=1.0, shape=(obs_dim,), dtype=np.float32)
+            self.action_space = spaces.Discrete(FLAT_ACTION_COUNT)
+            self.flat_obs = np.zeros(obs_dim, dtype=np.float32)
+            self._bind_flat_views()
+        else:
+            self.player_obs = np.zeros(3)
+            self.enemies_obs = np.zeros((self.N_enemies, 4), dtype=np.float32)
+            self.bullet_obs = np.zeros((self.N_bullets, 4), dtype=np.float32)
+        if obs_mode == "bridge":
+            self.observation_space = spaces.Box(
+                low=-np.inf, high=np.inf, shape=(BRIDGE_OBS_DIM,), dtype=np.float32
+            )
+            self.bridge_obs = np.zeros(BRIDGE_OBS_DIM, dtype=np.float32)
+        elif obs_mode == "grid":
+            shape = (GRID_CHANNELS, GRID_SIZE, GRID_SIZE)
+            self.observation_space = spaces.Box(low=0.0, high=np.inf, shape=shape, dtype=np.float32)
+            self.grid_obs = np.zeros(shape, dtype=np.float32)
+        #Center region for the reward (see _tick_reward): half the world, centered
+        c_x = self.world_width/2
+        c_y = self.world_height/2
+        self._center = (c_x/2, c_x/2 + c_x, c_y/2, c_y/2 + c_y)
+
         self.state = None
         self.render_mode = render_mode
+        self.screen = None
+        #Offscreen frame for render(): a Surface drawing straight into the frame array
+        self.frame = None
+        self._frame_surface = None
+        self._sprites = {}
 
         # print(f"{render_mode}")
 
+    def _bind_flat_views(self):
+        """Point the player / enemies / bullets buffers at their slices of flat_obs."""
+        enemies_end = 3 + 4*self.N_enemies
+        self.player_obs = self.flat_obs[:3]
+        self.enemies_obs = self.flat_obs[3:enemies_end].reshape(self.N_enemies, 4)
+        self.bullet_obs = self.flat_obs[enemies_end:].reshape(self.N_bullets, 4)
+
     def step(self, action): 
-        err_msg = f"{action!r} ({type(action)}) invalid"
-        assert self.action_space.contains(action), err_msg
         assert self.state is not None, "Call reset before using step method."
 
-        # Get current time
-        
-        current_time = self.current_time + (60)
-
-        self.current_time = current_time
-        delta_time = (current_time - self.previous_time) / 1000
-
-        self.previous_time = current_time
-        
-         # Spawn enemies at random intervals
-        if current_time - self.last_enemy_spawn_time >= self.next_spawn_interval:
-            # Spawn enemy at random position
-            enemy_x = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-            enemy_y = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-            self.enemies.append(Enemy(enemy_x, enemy_y))
-            self.last_enemy_spawn_time = current_time
-            self.next_spawn_interval = random.randint(ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX)
-
-
         #Get actions for the player
-        MOVE_LOOKUP = {
-            0: 'left',  # Left
-            1: 'right',   # Right
-            2: 'up',   # Up
-            3: 'down',  # Down
-            4: 'none',   # No movement
-        }
-
-        dir = MOVE_LOOKUP[action["move"]]
-        angle = action["fire_angle"][0]
-
-        #Update player and apply action
-        bullets_to_remove = self.player.update(delta_time, None, self.bullets, dir)
-        #Set the player's aim angle
-        self.player.aim_angle = angle
-        for bullet in bullets_to_remove:
-            if bullet in self.bullets:
-                self.bullets.remove(bullet)
-        
-        #Make the player shoot
-        player_bullet = self.player.shoot(current_time)
-        if player_bullet:
-            self.bullets.append(player_bullet)
-
-        #Update enemies and apply their actions
-        for enemy in self.enemies[:]:
-            # Enemy shooting
-            enemy_bullet = enemy.shoot(current_time)
-            if enemy_bullet:
-                self.bullets.append(enemy_bullet)
-            
-            # Enemy update
-            bullets_to_remove = enemy.update(delta_time, self.player, current_time, self.bullets)
-            for bullet in bullets_to_remove:
-                if bullet in self.bullets:
-                    self.bullets.remove(bullet)
-            
-            # Remove dead enemies
-            if enemy.health <= 0:
-                self.enemies.remove(enemy)
-
-        #Update bullets 
-        for bullet in self.bullets[:]:
-            bullet.update(delta_time)
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
-
-        #TODO: Update the observation state
-        ## Collect the state of the environment. 
-        #Collect the N_bullets closest bullets
-        closest_bullets = self.get_closest_entities(self.player.x, self.player.y, self.bullets, self.N_bullets)
-        #Remove any friendly bullets from the list
-        closest_bullets = [b for b in closest_bullets if not b.is_friendly]
-        #Pass the bullets into a np.array
-        #Create a padded np array for the bullets
-        self.bullet_obs = np.zeros((self.N_bullets, 4), dtype=np.float32)
-        for i, b in enumerate(closest_bullets[:self.N_bullets]):
-            #Create relative coordinates and grab velocities with normalization
-            self.bullet_obs[i] = np.array(
-                [
-                    (b.x - self.player.x)/WORLD_WIDTH,
-                    (b.y - self.player.y)/WORLD_HEIGHT,
-                    b.vel_x / BULLET_SPEED_ENEMY,
-                    b.vel_y / BULLET_SPEED_ENEMY
-                ],
-            dtype=np.float32
-            )
-        
-        
-        #Collect the N_enemies closest enemies
-        closest_enemies = self.get_closest_entities(self.player.x, self.player.y, self.enemies, self.N_enemies)
-
-        #Create a padded np array for the enemies
-        self.enemies_obs = np.zeros((self.N_enemies, 4), dtype=np.float32)
-        for i, enemy in enumerate(closest_enemies[:self.N_enemies]):
-            #Create relative to the player cooridnates by subtracting x from p.x and y from p.y
-            self.enemies_obs[i] = np.array(
-                [
-                    (enemy.x - self.player.x)/WORLD_WIDTH,
-                    (enemy.y - self.player.y)/WORLD_HEIGHT,
-                    enemy.vx,
-                    enemy.vy
-                ], 
-            dtype=np.float32
-            ) 
- 
-
-        self.state = {
-                "player"  : np.array((self.player.health/PLAYER_HEALTH_MAX, self.player.x/WORLD_WIDTH, self.player.y/WORLD_HEIGHT)),
-                "enemies" : self.enemies_obs,
-                "bullets" : self.bullet_obs,
-        }
-
-        def is_player_in_center(x,y):
-            #Center is center of world
-            c_x = WORLD_WIDTH/2
-            c_y = WORLD_HEIGHT/2
-            #Check if player is in halfworld radius center
-            if x > c_x/2 and x < c_x/2 + c_x:
-                if y > c_y/2 and y < c_y/2 + c_y:
-                    return True
-            return False
-        reward = 0
-        #Supply positive reward for killing enemies
-        for event in pygame.event.get():
-            if event.type == ENEMY_KILLED:
-                self.player.kill_count += 1
-        if self.player.kill_count > self.player_previous_kill_count: 
-            reward = 100
-            self.player_previous_kill_count = self.player.kill_count
-            # print(f"we dun got em {self.player.kill_count} ++++100")
-            
-
-
-        #Supply negative reward for getting hit
-        elif self.player.health < self.player_previous_health:
-            reward = -300
-            self.player_previous_health = self.player.health
-            # print("took damage -100")
-        
-        #Supply small positive reward for playing near the world center
-        #Specifically if it is WorldWidth/4 radius from world center which is (worldwidth/2,worldheight/2)
-       
-        elif is_player_in_center(self.player.x, self.player.y):
-            reward = 10
-        #Supply positive reward for not getting hit
+        if self.flat:
+            if not (isinstance(action, (int, np.integer)) and 0 <= action < FLAT_ACTION_COUNT):
+                assert self.action_space.contains(action), f"{action!r} ({type(action)}) invalid"
+            dir, angle = FLAT_ACTIONS[action]
         else:
-            reward = 1
-        
+            if not _is_plain_action(action):
+                assert self.action_space.contains(action), f"{action!r} ({type(action)}) invalid"
+            dir = MOVE_LOOKUP[action["move"]]
+            angle = action["fire_angle"][0]
+
+        #Advance the shared world simulation frame_skip ticks holding the action. Rewards
+        #are summed per tick and the episode stops early if the player dies; the observation
+        #below is only built once, after the last tick.
+        reward = 0
+        frames = 0
+        for _ in range(self.frame_skip):
+            self.world.step({PLAYER_ID: (dir, angle)})
+            if self.reward_mode == "default":
+                reward += self._tick_reward()
+            frames += 1
+            if self.player.health <= 0:
+                break
+        if self.reward_mode == "bridge":
+            reward = self._bridge_reward()
+        current_time = self.world.current_time
+        delta_time = self.world.delta_time
+        self.current_time = current_time
 
+        self._observe()
 
         #Determine if the game is over 
         terminated = False
@@ -323,10 +382,6 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
 
         self.step_count += 1
 
-        # if self.step_count % 100 == 0:
-        #     for i in range(0,len(closest_bullets)):
-        #         print(f"Bullet obs: {closest_bullets[i].vel_x}, {closest_bullets[i].vel_y}, isfriendly: {closest_bullets[i].is_friendly}")
-        #     print(f"State {self.state}")
         if self.render_mode == "human":
             self.render()
 
@@ -337,14 +392,171 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
         # Build Gymnasium-style info dict
         info = {
             "dt": delta_time,
+            "frames": frames,
             "current_time": current_time,
             "step_count": self.step_count,
             "player_health": self.player.health,
             "kill_count": self.player.kill_count,
+            "damage_taken": self.world.damage_totals[PLAYER_ID],
+            "spawns_skipped": self.world.spawns_skipped,
+            "bullets_evicted": self.world.bullets_evicted,
         }
 
         # Return observations, reward, terminated, truncated, and info
-        return self.state, reward, terminated, truncated, info
+        return self._returned_obs(), reward, terminated, truncated, info
+
+    def _tick_reward(self):
+        """Reward for the world tick that just ran (summed over ticks when frame skipping)."""
+        reward = 0
+        #Kills come from this env's own world accumulator (no shared event queue), so several
+        #envs can run in one process without stealing each other's kills.
+        kill_total = self.world.kill_totals[PLAYER_ID]
+        #Supply positive reward for killing enemies
+        if kill_total > self.player_previous_kill_count: 
+            reward = 100
+            self.player_previous_kill_count = kill_total
+            # print(f"we dun got em {self.player.kill_count} ++++100")
+            
+
+
+        #Supply negative reward for getting hit
+        elif self.player.health < self.player_previous_health:
+            reward = -300
+            self.player_previous_health = self.player.health
+            # print("took damage -100")
+        
+        #Supply small positive reward for playing near the world center
+        #Specifically if it is WorldWidth/4 radius from world center which is (worldwidth/2,worldheight/2)
+       
+        elif (self._center[0] < self.player.x < self._center[1]
+              and self._center[2] < self.player.y < self._center[3]):
+            reward = 10
+        #Supply positive reward for not getting hit
+        else:
+            reward = 1
+
+        return reward
+
+    def _bridge_reward(self):
+        """actor_learner_rl_bridge's additive reward from the previous step's end to now."""
+        player = self.player
+        reward = additive_reward(
+            self._bridge_previous[0],
+            player.health,
+            self._bridge_previous[1],
+            player.kill_count,
+            player.x,
+            player.y,
+            count_nearby_allies(player.x, player.y, self._bridge_allies()),
+        )[0]
+        self._bridge_previous = (player.health, player.kill_count)
+        return reward
+
+    def _bridge_allies(self):
+        """(n, 4) rows (x, y, vel_x, vel_y) of the world's other living players."""
+        return _entity_rows(
+            [p for pid, p in self.world.players.items() if pid != PLAYER_ID and p.health > 0]
+        )
+
+    def _observe_bridge(self):
+        """Refill bridge_obs with build_obs_from_update's features, read from the world."""
+        player = self.player
+        pool = self.world.bullets
+        slots = pool.live_slots()
+        slots = slots[~pool.is_friendly[slots]]
+        bullets = np.empty((len(slots), 4))
+        bullets[:, 0] = pool.x[slots]
+        bullets[:, 1] = pool.y[slots]
+        bullets[:, 2] = pool.vel_x[slots]
+        bullets[:, 3] = pool.vel_y[slots]
+        build_obs_from_arrays(
+            (player.x, player.y, float(player.vx), float(player.vy), player.health),
+            bullets,
+            self._bridge_allies(),
+            _entity_rows(self.world.enemies),
+            out=self.bridge_obs,
+        )
+
+    def _observe_grid(self):
+        """Refill grid_obs with the bridge's occupancy grid, read from the world."""
+        pool = self.world.bullets
+        slots = pool.live_slots(ordered=False)
+        slots = slots[~pool.is_friendly[slots]]
+        bullets = np.empty((len(slots), 2))
+        bullets[:, 0] = pool.x[slots]
+        bullets[:, 1] = pool.y[slots]
+        build_grid_from_arrays(
+            (self.player.x, self.player.y),
+            bullets,
+            self._bridge_allies(),
+            _entity_rows(self.world.enemies),
+            out=self.grid_obs,
+        )
+
+    def _observe(self):
+        """Refill the observation buffers (self.state's arrays) from the world.
+
+        Entities are ranked by squared distance to the player's corner, ties in list /
+        spawn order, exactly as get_closest_entities sorts them. Bullets, which can number
+        in the thousands, are selected with np.argpartition over the pool's coordinate
+        arrays; the few enemies are sorted by index. Rows are written in place.
+        """
+        if self.obs_mode == "bridge":
+            self._observe_bridge()
+            return
+        if self.obs_mode == "grid":
+            self._observe_grid()
+            return
+        player = self.player
+        px = player.x
+        py = player.y
+        self.player_obs[0] = player.health/PLAYER_HEALTH_MAX
+        self.player_obs[1] = px/self.world_width
+        self.player_obs[2] = py/self.world_height
+
+        #The N_enemies closest enemies: relative position and velocity
+        enemies_obs = self.enemies_obs
+        enemies_obs.fill(0)
+        enemies = self.world.enemies
+        if enemies:
+            dist = [(e.x - px) ** 2 + (e.y - py) ** 2 for e in enemies]
+            closest = sorted(range(len(enemies)), key=dist.__getitem__)[:self.N_enemies]
+            enemies_obs[:len(closest)] = [
+                (
+                    (enemies[i].x - px)/self.world_width,
+                    (enemies[i].y - py)/self.world_height,
+                    enemies[i].vx,
+                    enemies[i].vy,
+                )
+                for i in closest
+            ]
+
+        #Of the N_bullets closest bullets, the enemy ones (friendly bullets are dropped and
+        #the rest move up): relative position and normalized velocity
+        bullet_obs = self.bullet_obs
+        bullet_obs.fill(0)
+        pool = self.world.bullets
+        if pool:
+            slots = pool.live_slots(ordered=False)
+            dx = pool.x[slots] - px
+            dy = pool.y[slots] - py
+            nearest = _nearest(dx*dx + dy*dy, pool.seq[slots], self.N_bullets)
+            nearest = nearest[~pool.is_friendly[slots[nearest]]]
+            if len(nearest):
+                chosen = slots[nearest]
+                rows = bullet_obs[:len(nearest)]
+                rows[:, 0] = dx[nearest]/self.world_width
+                rows[:, 1] = dy[nearest]/self.world_height
+                rows[:, 2] = pool.vel_x[chosen]/BULLET_SPEED_ENEMY
+                rows[:, 3] = pool.vel_y[chosen]/BULLET_SPEED_ENEMY
+
+    @property
+    def enemies(self):
+        return self.world.enemies
+
+    @property
+    def bullets(self):
+        return self.world.bullets
 
     def get_closest_entities(self, ref_x, ref_y, entity_list, num_of_entities):
         if len(entity_list) == 0:
@@ -368,95 +580,190 @@ class BulletHellEnv(gym.Env[np.ndarray, np.ndarray]):
         #Lets set the initial state of the world here 
         self.step_count = 0
 
-        self.previous_time = 0
         self.current_time = 0
 
-        #Initialize player at random position
-        self.player = Player(
-            random.randint(0, WORLD_WIDTH - ENTITY_SIZE),
-            random.randint(0, WORLD_HEIGHT - ENTITY_SIZE),
-            True
-        )
-
-        #Entity and bullet management
-        self.enemies = []
-        self.bullets = []
-        self.last_shot_time = 0
-        self.last_enemy_spawn_time = 0
-        self.next_spawn_interval = random.randint(ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX)
-        
-        for i in range(0,3):
-            enemy_x = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-            enemy_y = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-            e = Enemy(enemy_x, enemy_y)
-            self.enemies.append(e)
-            # print(f"enemy i: {e.x} , {e.y}")
+        #Build a fresh world: player at a random position plus 3 random enemies. The world
+        #draws from the env's np_random, so reset(seed=...) makes the episode reproducible
+        #and every env instance has its own stream.
+        self.world = self._new_world(seed)
+        self.player = self.world.players[PLAYER_ID]
+        #Comparatory values follow the new world's accumulators
+        self.player_previous_health = PLAYER_HEALTH_MAX
+        self.player_previous_kill_count = 0
+        self._bridge_previous = (self.player.health, self.player.kill_count)
         
-        #Get the enemies that we will use for observations
-        enemy_obs_list = self.get_closest_entities(self.player.x, self.player.y, self.enemies, self.N_enemies)
-
-        #Convert the enemy list into np format
-        self.enemies_obs = np.zeros((self.N_enemies, 4), dtype=np.float32)
-        for i, enemy in enumerate(enemy_obs_list[:self.N_enemies]):
-            #Create relative to the player cooridnates by subtracting x from p.x and y from p.y
-            self.enemies_obs[i] = np.array(
-                [
-                    (enemy.x - self.player.x)/WORLD_WIDTH,
-                    (enemy.y - self.player.y)/WORLD_HEIGHT,
-                    enemy.vx,
-                    enemy.vy
-                ],
-            dtype=np.float32
-            )
-
         self.running = True
 
-        bullets = np.zeros((self.N_bullets, 4), dtype=np.float32)
+        # Define state: the observation buffers, filled for the new world (no bullets yet)
+        if self.obs_mode == "bridge":
+            self.state = self.bridge_obs
+        elif self.obs_mode == "grid":
+            self.state = self.grid_obs
+        elif self.flat:
+            self.state = self.flat_obs
+        else:
+            self.state = {
+                "player": self.player_obs,
+                "enemies": self.enemies_obs,
+                "bullets": self.bullet_obs,
+            }
+        self._observe()
 
-        # Define state
-        self.state = {
-            "player": np.array(
-                (
-                    self.player.health / PLAYER_HEALTH_MAX,
-                    self.player.x / WORLD_WIDTH,
-                    self.player.y / WORLD_HEIGHT,
-                )
+        # Return initial observation and empty info dict (Gymnasium API)
+        return self._returned_obs(), {}
+
+    def _returned_obs(self):
+        """What step / reset return: env.state itself with reuse_obs, else a copy of it."""
+        if self.reuse_obs:
+            return self.state
+        if isinstance(self.state, dict):
+            return {key: value.copy() for key, value in self.state.items()}
+        return self.state.copy()
+
+    def _new_world(self, seed: Optional[int]) -> WorldSimulator:
+        """The world reset() starts an episode in (seed is reset's, already applied to
+        np_random). golden.baseline_env_engine overrides it."""
+        return WorldSimulator(
+            tick_ms=self.tick_ms,
+            player_ids=(PLAYER_ID,),
+            initial_enemies=3,
+            max_enemies=self.max_enemies,
+            max_bullets=self.max_bullets,
+            seed=self.np_random,
+            world_width=self.world_width,
+            world_height=self.world_height,
+        )
+
+    def get_state(self) -> bytes:
+        """Snapshot of the running episode (see set_state). Cheap enough to take every step."""
+        assert self.state is not None, "Call reset before using get_state method."
+        return pickle.dumps(
+            (
+                (self.obs_mode, self.flat),
+                self.world.get_state(),
+                self.step_count,
+                self.current_time,
+                self.player_previous_health,
+                self.player_previous_kill_count,
+                self.state,
             ),
-            "enemies": self.enemies_obs,
-            "bullets": bullets,
-        }
+            pickle.HIGHEST_PROTOCOL,
+        )
 
-        # Return initial observation and empty info dict (Gymnasium API)
-        return self.state, {}
+    def set_state(self, state: bytes) -> None:
+        """Continue from a get_state() blob, taken from this or another env instance with the
+        same obs_mode and flat (ValueError otherwise)."""
+        layout, world_state, step_count, current_time, previous_health, previous_kill_count, obs = pickle.loads(state)
+        if layout != (self.obs_mode, self.flat):
+            raise ValueError(
+                f"state was taken with obs_mode={layout[0]!r}, flat={layout[1]}; this env has "
+                f"obs_mode={self.obs_mode!r}, flat={self.flat}"
+            )
+        if self.world is None:
+            self.world = self._new_world(None)
+        self.world.set_state(world_state)
+        self.player = self.world.players[PLAYER_ID]
+        self.step_count = step_count
+        self.current_time = current_time
+        self.player_previous_health = previous_health
+        self.player_previous_kill_count = previous_kill_count
+        self._bridge_previous = (self.player.health, self.player.kill_count)
+        if self.obs_mode == "bridge":
+            self.bridge_obs = obs
+        elif self.obs_mode == "grid":
+            self.grid_obs = obs
+        elif self.flat:
+            self.flat_obs = obs
+            self._bind_flat_views()
+        else:
+            self.player_obs = obs["player"]
+            self.enemies_obs = obs["enemies"]
+            self.bullet_obs = obs["bullets"]
+        self.state = obs
 
     def render(self):
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Bullet Hell Environment")
+        import pygame
+
+        self._draw_frame()
+        if self.render_mode == "rgb_array":
+            return self.frame
+
+        if self.screen is None:
+            if not pygame.get_init():
+                pygame.init()
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("Bullet Hell Environment")
+        pygame.event.pump()
+        self.screen.blit(self._frame_surface, (0, 0))
+        pygame.display.flip()
 
-        camera_x = self.player.x + self.player.size // 2 - SCREEN_WIDTH // 2
-        camera_y = self.player.y + self.player.size // 2 - SCREEN_HEIGHT // 2
+    def _sprite(self, color, size, circle=False):
+        """Cached size x size square (or circle) sprite, black transparent."""
+        import pygame
+
+        key = (color, size, circle)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size, size))
+            sprite.set_colorkey(BLACK)
+            if circle:
+                pygame.draw.circle(sprite, color, (size//2, size//2), size//2)
+            else:
+                sprite.fill(color)
+            self._sprites[key] = sprite
+        return sprite
+
+    def _draw_frame(self):
+        """Redraw the world into the offscreen frame: one fill and one Surface.blits of
+        cached sprites, positioned as Entity.draw / Bullet.draw place them."""
+        import pygame
+
+        if self._frame_surface is None:
+            self.frame = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
+            #A Surface over the array rather than a surfarray.pixels3d view, which would
+            #keep the Surface locked (and every blit failing) while the view lives
+            self._frame_surface = pygame.image.frombuffer(
+                self.frame, (self.screen_width, self.screen_height), "RGB"
+            )
+        player = self.player
+        camera_x = player.x + player.size // 2 - self.screen_width // 2
+        camera_y = player.y + player.size // 2 - self.screen_height // 2
         #Clamp camera to world bounds
-        camera_x = max(0, min(self.screen_width - self.screen_width, camera_x))
-        camera_y = max(0, min(self.screen_height - self.screen_height, camera_y))
-        
-        #Draw player
-        self.player.draw(self.screen, camera_x, camera_y)
-        
-        #Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(self.screen, camera_x, camera_y)
-        
-        #Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(self.screen, camera_x, camera_y)
+        camera_x = max(0, min(self.world_width - self.screen_width, camera_x))
+        camera_y = max(0, min(self.world_height - self.screen_height, camera_y))
+
+        draws = [(self._sprite(BLUE, player.size), (player.x - camera_x, player.y - camera_y))]
+        draws += [
+            (self._sprite(RED, enemy.size), (enemy.x - camera_x, enemy.y - camera_y))
+            for enemy in self.enemies
+        ]
+        pool = self.bullets
+        if pool:
+            slots = pool.live_slots()
+            radius = BULLET_SIZE//2
+            #Bullet.draw centers the circle on int(screen position + size/2)
+            left = (pool.x[slots] - camera_x + BULLET_SIZE/2).astype(np.int64) - radius
+            top = (pool.y[slots] - camera_y + BULLET_SIZE/2).astype(np.int64) - radius
+            friendly = self._sprite(BLUE, BULLET_SIZE, circle=True)
+            hostile = self._sprite(RED, BULLET_SIZE, circle=True)
+            draws += [
+                (friendly if is_friendly else hostile, (x, y))
+                for x, y, is_friendly in zip(left.tolist(), top.tolist(), pool.is_friendly[slots].tolist())
+            ]
+
+        self._frame_surface.fill(BLACK)
+        self._frame_surface.blits(draws, doreturn=False)
 
-        pygame.display.flip()
     def close(self):
         if self.screen is not None:
+            import pygame
 
             pygame.display.quit()
             pygame.quit()
+            self.screen = None
             self.isopen = False
+        self._frame_surface = None
+        self._sprites = {}
 
 
 if __name__ == "__main__":
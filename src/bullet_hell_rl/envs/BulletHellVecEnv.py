@@ -0,0 +1,260 @@
+import numpy as np
+
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from bullet_hell_rl.batched import BatchedWorlds
+from bullet_hell_rl.bullethell import BULLET_SPEED_ENEMY, PLAYER_HEALTH_MAX, WORLD_HEIGHT, WORLD_WIDTH
+from bullet_hell_rl.envs.BulletHellEnv import ENV_TICK_MS
+
+N_ENEMIES = 5  # nearest enemies observed, as BulletHellEnv.N_enemies
+N_BULLETS = 10  # nearest bullets considered, as BulletHellEnv.N_bullets
+OBS_DIM = 3 + 4 * N_ENEMIES + 4 * N_BULLETS
+MAX_STEPS = 10000  # BulletHellEnv.max_steps
+
+
+def make_action_space() -> spaces.Dict:
+    """BulletHellEnv's action space, for one env of a vector env."""
+    return spaces.Dict({
+        "move": spaces.Discrete(5),
+        "fire_angle": spaces.Box(low=0.0, high=270, shape=(1,), dtype=np.int16),
+    })
+
+
+def make_observation_space() -> spaces.Box:
+    """The flat (OBS_DIM,) observation space, for one env of a vector env."""
+    low = np.full(OBS_DIM, -1.0, dtype=np.float32)
+    low[:3] = 0.0
+    return spaces.Box(low=low, high=1.0, shape=(OBS_DIM,), dtype=np.float32)
+
+
+def flatten_observation(obs: dict, out: np.ndarray | None = None) -> np.ndarray:
+    """BulletHellEnv's Dict observation as one OBS_DIM float32 row (BulletHellVecEnv's layout)."""
+    if out is None:
+        out = np.empty(OBS_DIM, dtype=np.float32)
+    out[:3] = obs["player"]
+    out[3:3 + 4 * N_ENEMIES] = obs["enemies"].ravel()
+    out[3 + 4 * N_ENEMIES:] = obs["bullets"].ravel()
+    return out
+
+
+class BulletHellVecEnv(VectorEnv):
+    """
+    ## Description
+
+    num_envs Bullet Hell games stepped together. Where SyncVectorEnv would loop over
+    BulletHellEnv.step, this keeps every world in stacked arrays (bullet_hell_rl.batched)
+    and advances all of them with a few array operations per tick. The game, the
+    actions, the rewards and the episode ends are BulletHellEnv's.
+
+    ## Action Space
+
+    The batched BulletHellEnv action: {"move": (num_envs,) ints in 0..4, "fire_angle":
+    (num_envs, 1) int16 angles}.
+
+    ## Observation Space
+
+    (num_envs, 63) float32, BulletHellEnv's observation flattened per env:
+    player (health, x, y), then the 5 nearest enemies (dx, dy, vx, vy), then the enemy
+    bullets among the 10 nearest bullets (dx, dy, vx, vy), zero padded.
+
+    ## Episode End and Auto-reset
+
+    terminated when the player's health reaches <= 0, truncated after max_steps steps
+    (BulletHellEnv's 10000) or max_episode_steps (what gym.make_vec passes from the
+    registration). Auto-reset is next-step: the step after an episode ends resets that
+    env, ignores its action and returns the first observation with reward 0.
+
+    ## Arguments
+
+    tick_ms, frame_skip, max_enemies, max_bullets, world_width, world_height: as for
+    BulletHellEnv. seed: initial seed of the worlds' shared random stream (reset(seed=...)
+    reseeds it). Through gymnasium:
+    gym.make_vec("BulletHell-v0", num_envs=64, vectorization_mode="vector_entry_point").
+    """
+
+    metadata = {
+        "render_modes": [],
+        "autoreset_mode": AutoresetMode.NEXT_STEP,
+    }
+
+    def __init__(
+        self,
+        num_envs: int = 8,
+        tick_ms: float = ENV_TICK_MS,
+        frame_skip: int = 1,
+        max_enemies: int | None = None,
+        max_bullets: int | None = None,
+        world_width: int = WORLD_WIDTH,
+        world_height: int = WORLD_HEIGHT,
+        max_steps: int = MAX_STEPS,
+        max_episode_steps: int | None = None,
+        render_mode: str | None = None,
+        seed=None,
+    ):
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be >= 1, got {frame_skip}")
+        if render_mode is not None:
+            raise ValueError(f"BulletHellVecEnv does not render, got render_mode={render_mode!r}")
+        self.num_envs = num_envs
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.max_episode_steps = max_episode_steps
+        self.world_width = world_width
+        self.world_height = world_height
+        self.render_mode = render_mode
+        self.worlds = BatchedWorlds(
+            num_envs,
+            tick_ms=tick_ms,
+            max_enemies=max_enemies,
+            max_bullets=max_bullets,
+            seed=seed,
+            world_width=world_width,
+            world_height=world_height,
+        )
+
+        self.single_action_space = make_action_space()
+        self.single_observation_space = make_observation_space()
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self.step_count = np.zeros(num_envs, dtype=np.int64)
+        # Reward trackers, as BulletHellEnv.player_previous_health / _kill_count
+        self.previous_health = np.full(num_envs, PLAYER_HEALTH_MAX, dtype=np.int64)
+        self.previous_kill_count = np.zeros(num_envs, dtype=np.int64)
+        self._autoreset = np.zeros(num_envs, dtype=bool)
+
+    def reset(self, *, seed=None, options: dict | None = None):
+        """Reset every env, or only options["reset_mask"]'s; returns (observations, {})."""
+        super().reset(seed=seed)
+        if seed is not None:
+            self.worlds.rng = np.random.default_rng(seed)
+        mask = None if options is None else options.get("reset_mask")
+        mask = np.ones(self.num_envs, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        self._reset_worlds(mask)
+        return self._observe(), {}
+
+    def _reset_worlds(self, mask: np.ndarray) -> None:
+        self.worlds.reset(mask)
+        self.step_count[mask] = 0
+        self.previous_health[mask] = PLAYER_HEALTH_MAX
+        self.previous_kill_count[mask] = 0
+        self._autoreset[mask] = False
+
+    def step(self, actions):
+        worlds = self.worlds
+        n = self.num_envs
+        move = np.asarray(actions["move"], dtype=np.int64).reshape(n)
+        angle = np.asarray(actions["fire_angle"], dtype=np.float64).reshape(n)
+
+        resetting = self._autoreset.copy()
+        if resetting.any():
+            self._reset_worlds(resetting)
+        stepping = ~resetting
+
+        # frame_skip ticks holding the action; a world stops early once its player dies.
+        rewards = np.zeros(n)
+        frames = np.zeros(n, dtype=np.int64)
+        active = stepping.copy()
+        for _ in range(self.frame_skip):
+            worlds.step(move, angle, active)
+            rewards += self._tick_reward(active)
+            frames += active
+            active &= worlds.health > 0
+            if not active.any():
+                break
+
+        terminations = stepping & (worlds.health <= 0)
+        truncations = stepping & (self.step_count >= self.max_steps)
+        self.step_count += stepping
+        if self.max_episode_steps is not None:
+            truncations |= stepping & (self.step_count >= self.max_episode_steps)
+        self._autoreset = terminations | truncations
+
+        return self._observe(), rewards, terminations, truncations, self._infos(frames)
+
+    def _infos(self, frames: np.ndarray) -> dict:
+        """BulletHellEnv's info entries as (num_envs,) arrays, each with its all-true mask."""
+        worlds = self.worlds
+        infos = {
+            "frames": frames,
+            "current_time": worlds.current_time.copy(),
+            "step_count": self.step_count.copy(),
+            "player_health": worlds.health.copy(),
+            "kill_count": worlds.kill_totals.copy(),
+            "damage_taken": worlds.damage_totals.copy(),
+            "spawns_skipped": worlds.spawns_skipped.copy(),
+            "bullets_evicted": worlds.bullets_evicted.copy(),
+        }
+        for key in list(infos):
+            infos[f"_{key}"] = np.ones(self.num_envs, dtype=bool)
+        return infos
+
+    def _tick_reward(self, active: np.ndarray) -> np.ndarray:
+        """BulletHellEnv._tick_reward for every active world: +100 for a kill, else -300 for
+        damage, else +10 in the center region, else +1."""
+        worlds = self.worlds
+        killed = active & (worlds.kill_totals > self.previous_kill_count)
+        hurt = active & ~killed & (worlds.health < self.previous_health)
+        self.previous_kill_count = np.where(killed, worlds.kill_totals, self.previous_kill_count)
+        self.previous_health = np.where(hurt, worlds.health, self.previous_health)
+        c_x = self.world_width / 2
+        c_y = self.world_height / 2
+        x = worlds.player_x
+        y = worlds.player_y
+        center = (x > c_x / 2) & (x < c_x / 2 + c_x) & (y > c_y / 2) & (y < c_y / 2 + c_y)
+        reward = np.where(killed, 100, np.where(hurt, -300, np.where(center, 10, 1)))
+        return np.where(active, reward, 0)
+
+    def _observe(self) -> np.ndarray:
+        """(num_envs, OBS_DIM) observations, BulletHellEnv's per row."""
+        worlds = self.worlds
+        n = self.num_envs
+        rows = np.arange(n)[:, None]
+        px = worlds.player_x[:, None]
+        py = worlds.player_y[:, None]
+        obs = np.zeros((n, OBS_DIM), dtype=np.float32)
+        obs[:, 0] = worlds.health / PLAYER_HEALTH_MAX
+        obs[:, 1] = worlds.player_x / self.world_width
+        obs[:, 2] = worlds.player_y / self.world_height
+
+        # Nearest enemies by squared distance, ties in list (spawn) order
+        dx = worlds.enemy_x - px
+        dy = worlds.enemy_y - py
+        dist = np.where(worlds.enemy_alive, dx * dx + dy * dy, np.inf)
+        order = np.lexsort((worlds.enemy_seq, dist))[:, :N_ENEMIES]
+        found = np.isfinite(dist[rows, order])
+        enemies = np.stack(
+            (
+                dx[rows, order] / self.world_width,
+                dy[rows, order] / self.world_height,
+                worlds.enemy_vx[rows, order],
+                worlds.enemy_vy[rows, order],
+            ),
+            axis=-1,
+        ) * found[..., None]
+        obs[:, 3:3 + 4 * order.shape[1]] = enemies.reshape(n, -1)
+
+        # The N_BULLETS nearest bullets, then the player's own dropped (and the rest moved up)
+        dx = worlds.bullet_x - px
+        dy = worlds.bullet_y - py
+        dist = np.where(worlds.bullet_alive, dx * dx + dy * dy, np.inf)
+        order = np.lexsort((worlds.bullet_seq, dist))[:, :N_BULLETS]
+        keep = np.isfinite(dist[rows, order]) & ~worlds.bullet_friendly[rows, order]
+        if keep.any():
+            r, c = np.nonzero(keep)
+            slot = order[r, c]
+            dest = (np.cumsum(keep, axis=1) - 1)[r, c]
+            bullets = np.zeros((n, N_BULLETS, 4))
+            bullets[r, dest] = np.stack(
+                (
+                    dx[r, slot] / self.world_width,
+                    dy[r, slot] / self.world_height,
+                    worlds.bullet_vx[r, slot] / BULLET_SPEED_ENEMY,
+                    worlds.bullet_vy[r, slot] / BULLET_SPEED_ENEMY,
+                ),
+                axis=-1,
+            )
+            obs[:, 3 + 4 * N_ENEMIES:] = bullets.reshape(n, -1)
+        return obs
@@ -0,0 +1,114 @@
+import numpy as np
+
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.vector import VectorWrapper
+from gymnasium.vector.utils import batch_space
+
+
+def _stacked_space(space: gym.Space, k: int) -> spaces.Box:
+    """k frames of a Box observation space, oldest first."""
+    if not isinstance(space, spaces.Box):
+        raise ValueError(
+            f"frame stacking needs a Box observation (BulletHellEnv with flat=True or "
+            f"obs_mode='bridge' / 'grid', or a vector env), got {space}"
+        )
+    return spaces.Box(
+        low=np.broadcast_to(space.low, (k, *space.shape)),
+        high=np.broadcast_to(space.high, (k, *space.shape)),
+        dtype=space.dtype,
+    )
+
+
+class FrameStack(gym.Wrapper):
+    """
+    The last k observations of a Box-observation env, shape (k, *obs_shape), oldest first.
+
+    Frames live in a ring of 2k slots and every observation is written twice, to slot i
+    and slot i + k, so the newest k frames are always the contiguous slots i + 1 .. i + k.
+    A step therefore copies one observation, never the whole stack, and returns a view
+    into the ring: it is overwritten by later steps, so copy stacks you keep (or keep only
+    stack[-1] in a FrameStackReplay, see DQN.frame_replay). stack.reshape(-1) is still a
+    view, for networks that take flat input. reset fills all k frames with the first
+    observation.
+
+    env = FrameStack(BulletHellEnv(flat=True, reuse_obs=True), k=4)
+    """
+
+    def __init__(self, env: gym.Env, k: int = 4):
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+        super().__init__(env)
+        self.k = k
+        self.observation_space = _stacked_space(env.observation_space, k)
+        self._ring = np.zeros((2 * k, *env.observation_space.shape), dtype=env.observation_space.dtype)
+        self._slot = k - 1
+
+    def _push(self, obs: np.ndarray) -> np.ndarray:
+        k = self.k
+        slot = self._slot = (self._slot + 1) % k
+        self._ring[slot] = obs
+        self._ring[slot + k] = obs
+        return self._ring[slot + 1:slot + k + 1]
+
+    def reset(self, *, seed=None, options=None):
+        obs, info = self.env.reset(seed=seed, options=options)
+        self._ring[:] = obs
+        self._slot = self.k - 1
+        return self._ring[self.k:], info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        return self._push(obs), reward, terminated, truncated, info
+
+
+class VecFrameStack(VectorWrapper):
+    """
+    FrameStack for vector envs (BulletHellVecEnv, BulletHellAsyncVecEnv): observations
+    (num_envs, k, *obs_shape), each env's stack oldest first, from one shared
+    (num_envs, 2k, ...) ring. Every step writes each env's new observation twice and
+    returns a strided view; the same copy-to-keep caveat as FrameStack applies.
+
+    Next-step auto-reset is honoured: the step that returns an env's first observation
+    after its episode ended (and reset(options={"reset_mask": ...}) for the masked envs)
+    fills that env's stack with the new observation instead of pushing it.
+    """
+
+    def __init__(self, env: gym.vector.VectorEnv, k: int = 4):
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}")
+        super().__init__(env)
+        self.k = k
+        self.single_observation_space = _stacked_space(env.single_observation_space, k)
+        self.observation_space = batch_space(self.single_observation_space, env.num_envs)
+        single = env.single_observation_space
+        self._ring = np.zeros((env.num_envs, 2 * k, *single.shape), dtype=single.dtype)
+        self._slot = k - 1
+        self._restart = np.zeros(env.num_envs, dtype=bool)
+
+    def _stack(self) -> np.ndarray:
+        return self._ring[:, self._slot + 1:self._slot + self.k + 1]
+
+    def reset(self, *, seed=None, options=None):
+        obs, info = self.env.reset(seed=seed, options=options)
+        mask = None if options is None else options.get("reset_mask")
+        if mask is None:
+            self._ring[:] = obs[:, None]
+            self._slot = self.k - 1
+            self._restart[:] = False
+        else:
+            mask = np.asarray(mask, dtype=bool)
+            self._ring[mask] = obs[mask, None]
+            self._restart[mask] = False
+        return self._stack(), info
+
+    def step(self, actions):
+        obs, rewards, terminations, truncations, infos = self.env.step(actions)
+        k = self.k
+        slot = self._slot = (self._slot + 1) % k
+        self._ring[:, slot] = obs
+        self._ring[:, slot + k] = obs
+        if self._restart.any():
+            self._ring[self._restart] = obs[self._restart, None]
+        self._restart = terminations | truncations
+        return self._stack(), rewards, terminations, truncations, infos
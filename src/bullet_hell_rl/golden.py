@@ -0,0 +1,498 @@
+"""
+Golden-trace equivalence harness.
+
+A golden trace is a seeded recording of what the reference simulation does: the actions
+that went in and, after every step, what came out (player position, health and kills,
+every enemy and bullet position, rewards and observations). Two kinds are recorded:
+
+  env    - BulletHellEnv episodes (reset(seed) + step(action)), as agents see the game
+  server - run_server's tick on a WorldSimulator: joins, leaves and flat actions from
+           several clients, respawns and kills
+
+replay_trace() runs the same inputs through any engine with the same interface and
+returns the first TraceDivergence (trace, episode, step and the path of the first field
+that differs beyond the float tolerance) or None. check_golden_traces.py in the project
+root records the traces and runs this as the acceptance check for faster backends:
+
+  python check_golden_traces.py                       # reference engine vs golden files
+  python check_golden_traces.py --env-engine my.fast:FastBulletHellEnv
+  python check_golden_traces.py --record              # only after an intended change
+
+Engines are factories: an env engine is called with the env kwargs and must behave like
+BulletHellEnv (reset/step plus .player, .enemies and .bullets); a world engine is called
+with the WorldSimulator kwargs and must provide add_player/remove_player/step/players/
+enemies/bullets like WorldSimulator.
+
+GOLDEN_TRACES are recorded from the current engine, so they pin down its behaviour from
+here on; they cannot show that it still plays like the original game. That is what
+BASELINE_TRACES are for: they are recorded from the engine at BASELINE_REVISION (the
+commit before the simulation rewrite) by running that tree's own BulletHellEnv in a
+child interpreter:
+
+  git worktree add /tmp/bullethell-baseline 44f6be3
+  python check_golden_traces.py --record-baseline /tmp/bullethell-baseline/src
+
+and replayed against baseline_env_engine: the current BulletHellEnv with the intentional
+changes below switched back where the engine has a switch. Behaviour that changed on
+purpose since the baseline:
+
+  - Randomness: every world draws from its own seeded RandomStream instead of the global
+    random module, and enemy direction re-rolls take one choices(k) call per tick instead
+    of one random.choice per enemy. baseline_env_engine uses PythonRandomStream, which
+    reproduces the baseline's draws (the recording seeds random with the episode seed).
+  - Swept bullet collisions: bullets that pass through an entity within one tick now hit
+    it. baseline_env_engine turns them off (swept_collisions=False).
+  - Reward trackers: reset() clears the kill / health values rewards compare against;
+    the baseline carried them into the next episode. The recording uses a fresh baseline
+    env per episode, so every episode starts from the values a new env has.
+  - No living player: enemies don't shoot, re-roll directions or re-aim on a tick without
+    a living player (the server's rule, now shared by the env). In the env that is only
+    the tick the player dies, so on that terminal frame the baseline traces don't check
+    the enemy and bullet positions or the enemy and bullet observations. Everything else,
+    including that frame's reward, flags and player state, must match.
+
+The server trace has no baseline counterpart: the baseline server ticked inside
+run_server's socket loop and drew join positions from the global random module on the
+accept thread, so its ticks cannot be replayed from recorded inputs.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from bullet_hell_rl.bullethell import ENTITY_SIZE, WORLD_HEIGHT, WORLD_WIDTH, Player
+
+TRACE_VERSION = 1
+DEFAULT_ATOL = 1e-6  # absolute tolerance for floats (positions are in pixels)
+DEFAULT_RTOL = 1e-9
+
+# The traces checked in under golden_traces/ (name -> recording settings)
+GOLDEN_TRACES = {
+    "env": {"kind": "env", "seeds": [0, 1, 2], "steps": 250, "env_kwargs": {}},
+    "env_frameskip": {
+        "kind": "env",
+        "seeds": [3],
+        "steps": 150,
+        "env_kwargs": {"frame_skip": 4, "max_enemies": 8, "max_bullets": 40},
+    },
+    "server": {
+        "kind": "server",
+        "seed": 0,
+        "ticks": 900,
+        "world_kwargs": {"tick_ms": 1000 / 60, "initial_enemies": 3, "respawn_dead_players": True},
+        # tick -> client ids joining / leaving before that tick is stepped
+        "joins": {1: [0, 1], 200: [2], 500: [3]},
+        "leaves": {400: [1]},
+        "clients": 4,
+    },
+}
+
+# Commit the baseline traces are recorded from, and those traces (same settings format)
+BASELINE_REVISION = "44f6be3"
+BASELINE_TRACES = {
+    "baseline_env": {"kind": "env", "seeds": list(range(10)), "steps": 400, "env_kwargs": {}},
+}
+
+
+@dataclass
+class TraceDivergence:
+    """Where a replay first disagreed with the golden trace."""
+
+    trace: str
+    episode: int
+    step: int
+    path: str
+    expected: Any
+    actual: Any
+
+    def __str__(self) -> str:
+        return (
+            f"{self.trace}: episode {self.episode}, step {self.step}: {self.path} "
+            f"expected {self.expected!r}, got {self.actual!r}"
+        )
+
+
+# ------------------------------------------------------------------ frames
+def _positions(entities) -> list[list[float]]:
+    return [[float(e.x), float(e.y)] for e in entities]
+
+
+def _env_frame(env, obs, reward=0.0, terminated=False, truncated=False) -> dict[str, Any]:
+    player = env.player
+    return {
+        "reward": float(reward),
+        "terminated": bool(terminated),
+        "truncated": bool(truncated),
+        "player": [float(player.x), float(player.y), float(player.health), int(player.kill_count)],
+        "enemies": _positions(env.enemies),
+        "bullets": _positions(env.bullets),
+        "obs": {key: np.asarray(value, dtype=np.float64).ravel().tolist() for key, value in obs.items()},
+    }
+
+
+def _world_frame(world, events=None) -> dict[str, Any]:
+    return {
+        "players": [
+            [pid, float(p.x), float(p.y), float(p.health), int(p.kill_count)] for pid, p in world.players.items()
+        ],
+        "enemies": _positions(world.enemies),
+        "bullets": _positions(world.bullets),
+        "kills": [k.killer_id for k in events.kills] if events else [],
+        "respawns": sorted(events.respawns) if events else [],
+    }
+
+
+# ------------------------------------------------------------------ inputs
+def _env_inputs(settings: dict) -> dict[str, Any]:
+    episodes = []
+    for seed in settings["seeds"]:
+        rng = np.random.default_rng(seed)
+        actions = [[int(rng.integers(5)), int(rng.integers(0, 271))] for _ in range(settings["steps"])]
+        episodes.append({"seed": seed, "actions": actions})
+    return {"kind": "env", "env_kwargs": settings["env_kwargs"], "episodes": episodes}
+
+
+def _server_inputs(settings: dict) -> dict[str, Any]:
+    rng = np.random.default_rng(settings["seed"])
+    n = settings["clients"]
+    # Clients change their flat action every few ticks, like a human or a polled agent.
+    actions, current = [], rng.integers(0, 20, size=n)
+    for _ in range(settings["ticks"]):
+        change = rng.random(n) < 0.2
+        current = np.where(change, rng.integers(0, 20, size=n), current)
+        actions.append(current.tolist())
+    # Join positions are inputs too (the server draws them on its accept thread).
+    joins = {
+        str(tick): [
+            [cid, int(rng.integers(0, WORLD_WIDTH - ENTITY_SIZE + 1)), int(rng.integers(0, WORLD_HEIGHT - ENTITY_SIZE + 1))]
+            for cid in ids
+        ]
+        for tick, ids in settings["joins"].items()
+    }
+    leaves = {str(tick): ids for tick, ids in settings["leaves"].items()}
+    return {
+        "kind": "server",
+        "seed": settings["seed"],
+        "world_kwargs": settings["world_kwargs"],
+        "actions": actions,
+        "joins": joins,
+        "leaves": leaves,
+    }
+
+
+def _default_env_engine(**env_kwargs):
+    from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+    return BulletHellEnv(**env_kwargs)
+
+
+def baseline_env_engine(**env_kwargs):
+    """BulletHellEnv with the switchable intentional changes since BASELINE_REVISION turned
+    back: the baseline's random draws (PythonRandomStream) and discrete collisions."""
+    from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+    from bullet_hell_rl.rng import PythonRandomStream
+    from bullet_hell_rl.world import WorldSimulator
+
+    env = BulletHellEnv(**env_kwargs)
+
+    def new_world(seed):
+        return WorldSimulator(
+            tick_ms=env.tick_ms,
+            player_ids=(PLAYER_ID,),
+            initial_enemies=3,
+            swept_collisions=False,
+            max_enemies=env.max_enemies,
+            max_bullets=env.max_bullets,
+            seed=PythonRandomStream(seed),
+            world_width=env.world_width,
+            world_height=env.world_height,
+        )
+
+    env._new_world = new_world
+    return env
+
+
+class _BaselineRecorderEnv:
+    """Records with the baseline tree's BulletHellEnv: a new instance per episode (its reset
+    kept the reward trackers) with the global random module seeded by the episode seed."""
+
+    def __init__(self, env_cls, **env_kwargs):
+        self.env_cls = env_cls
+        self.env_kwargs = env_kwargs
+        self.env = None
+
+    def reset(self, seed=None, options=None):
+        random.seed(seed)
+        self.env = self.env_cls(**self.env_kwargs)
+        return self.env.reset(seed=seed, options=options)
+
+    def __getattr__(self, name):
+        return getattr(self.env, name)
+
+    def close(self) -> None:
+        pass  # the baseline's close() reads self.screen, which only render() sets
+
+
+def _default_world_engine(**world_kwargs):
+    from bullet_hell_rl.world import WorldSimulator
+
+    return WorldSimulator(**world_kwargs)
+
+
+# ------------------------------------------------------------------ running
+def _run_env(trace: dict, engine: Callable, on_frame: Callable) -> None:
+    """Play the trace's episodes; on_frame(episode, step, frame) returns False to stop."""
+    env = engine(**trace["env_kwargs"])
+    try:
+        for episode, spec in enumerate(trace["episodes"]):
+            obs, _ = env.reset(seed=spec["seed"])
+            if on_frame(episode, 0, _env_frame(env, obs)) is False:
+                return
+            for step, (move, angle) in enumerate(spec["actions"], start=1):
+                action = {"move": move, "fire_angle": np.array([angle], dtype=np.int16)}
+                obs, reward, terminated, truncated, _ = env.step(action)
+                if on_frame(episode, step, _env_frame(env, obs, reward, terminated, truncated)) is False:
+                    return
+                if terminated or truncated:
+                    break
+    finally:
+        env.close()
+
+
+def _run_server(trace: dict, engine: Callable, on_frame: Callable) -> None:
+    """run_server's tick: apply leaves, then joins, then step with every client's flat action."""
+    from bullet_hell_rl.net.input_sync import world_actions
+
+    world = engine(seed=trace["seed"], **trace["world_kwargs"])
+    if on_frame(0, 0, _world_frame(world)) is False:
+        return
+    connected: list[int] = []
+    for tick, flat in enumerate(trace["actions"], start=1):
+        for cid in trace["leaves"].get(str(tick), ()):
+            connected.remove(cid)
+            world.remove_player(cid)
+        for cid, x, y in trace["joins"].get(str(tick), ()):
+            connected.append(cid)
+            world.add_player(cid, Player(x, y, is_env=True))
+        events = world.step(world_actions({cid: flat[cid] for cid in connected}))
+        if on_frame(0, tick, _world_frame(world, events)) is False:
+            return
+
+
+def _runner(trace: dict):
+    return _run_env if trace["kind"] == "env" else _run_server
+
+
+def _default_engine(trace: dict):
+    if trace["name"] in BASELINE_TRACES:
+        return baseline_env_engine
+    return _default_env_engine if trace["kind"] == "env" else _default_world_engine
+
+
+def _baseline_checked(frame: dict) -> dict:
+    """The part of a baseline env frame the current engine must reproduce: all of it except
+    enemies and bullets on the frame the player dies (see the module docstring)."""
+    if not (frame["terminated"] and frame["player"][2] <= 0):
+        return frame
+    checked = {key: value for key, value in frame.items() if key not in ("enemies", "bullets")}
+    checked["obs"] = {key: value for key, value in frame["obs"].items() if key not in ("enemies", "bullets")}
+    return checked
+
+
+def _frame_mismatch(trace: dict, expected: dict, actual: dict, atol: float, rtol: float):
+    if trace.get("baseline") and expected.get("terminated"):
+        expected, actual = _baseline_checked(expected), _baseline_checked(actual)
+    return first_mismatch(expected, actual, "", atol, rtol)
+
+
+# ------------------------------------------------------------------ record / replay
+def record_trace(name: str, settings: dict | None = None, engine: Callable | None = None) -> dict[str, Any]:
+    """Record a trace with the reference engine (or engine). settings default to
+    GOLDEN_TRACES[name] or BASELINE_TRACES[name]; for the latter the reference engine is
+    baseline_env_engine."""
+    settings = {**GOLDEN_TRACES, **BASELINE_TRACES}[name] if settings is None else settings
+    trace = _env_inputs(settings) if settings["kind"] == "env" else _server_inputs(settings)
+    trace["name"] = name
+    trace["version"] = TRACE_VERSION
+    frames: list[list[dict]] = []
+
+    def on_frame(episode, step, frame):
+        if episode == len(frames):
+            frames.append([])
+        frames[episode].append(frame)
+
+    _runner(trace)(trace, engine or _default_engine(trace), on_frame)
+    trace["frames"] = frames
+    return trace
+
+
+def first_mismatch(expected, actual, path: str = "", atol: float = DEFAULT_ATOL, rtol: float = DEFAULT_RTOL):
+    """(path, expected, actual) of the first difference, or None. Floats compare within
+    atol/rtol; everything else exactly."""
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict) or expected.keys() != actual.keys():
+            return path, sorted(expected), sorted(actual) if isinstance(actual, dict) else actual
+        for key in expected:
+            found = first_mismatch(expected[key], actual[key], f"{path}.{key}" if path else key, atol, rtol)
+            if found:
+                return found
+        return None
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(expected) != len(actual):
+            return f"{path} (length)", len(expected), len(actual) if isinstance(actual, list) else actual
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            found = first_mismatch(e, a, f"{path}[{i}]", atol, rtol)
+            if found:
+                return found
+        return None
+    if isinstance(expected, float) or isinstance(actual, float):
+        if isinstance(actual, (int, float)) and not isinstance(actual, bool) and (
+            math.isclose(expected, actual, rel_tol=rtol, abs_tol=atol)
+            or (math.isinf(expected) and expected == actual)
+        ):
+            return None
+        return path, expected, actual
+    if expected != actual:
+        return path, expected, actual
+    return None
+
+
+def replay_trace(
+    trace: dict,
+    engine: Callable | None = None,
+    atol: float = DEFAULT_ATOL,
+    rtol: float = DEFAULT_RTOL,
+) -> TraceDivergence | None:
+    """Feed the trace's inputs to engine (default: the reference engine) and return the
+    first divergence from the recorded frames, or None if every frame matches."""
+    expected = trace["frames"]
+    divergence: list[TraceDivergence] = []
+    seen: list[int] = [0] * len(expected)
+
+    def on_frame(episode, step, frame):
+        if episode >= len(expected) or step >= len(expected[episode]):
+            divergence.append(TraceDivergence(trace["name"], episode, step, "(frame count)", None, "extra frame"))
+            return False
+        seen[episode] += 1
+        found = _frame_mismatch(trace, expected[episode][step], frame, atol, rtol)
+        if found:
+            divergence.append(TraceDivergence(trace["name"], episode, step, *found))
+            return False
+        return True
+
+    _runner(trace)(trace, engine or _default_engine(trace), on_frame)
+    if divergence:
+        return divergence[0]
+    for episode, frames in enumerate(expected):
+        if seen[episode] != len(frames):
+            return TraceDivergence(
+                trace["name"], episode, seen[episode], "(frame count)", len(frames), seen[episode]
+            )
+    return None
+
+
+def compare_traces(
+    expected: dict,
+    actual: dict,
+    atol: float = DEFAULT_ATOL,
+    rtol: float = DEFAULT_RTOL,
+) -> TraceDivergence | None:
+    """First divergence of a freshly recorded trace (record_trace) from a stored one: their
+    inputs must be identical, their frames equal within tolerance."""
+    for key in ("kind", "env_kwargs", "episodes", "seed", "world_kwargs", "actions", "joins", "leaves"):
+        if expected.get(key) != actual.get(key):
+            return TraceDivergence(expected["name"], 0, 0, f"(inputs) {key}", expected.get(key), actual.get(key))
+    for episode, (want, got) in enumerate(zip(expected["frames"], actual["frames"])):
+        for step, (expected_frame, frame) in enumerate(zip(want, got)):
+            found = _frame_mismatch(expected, expected_frame, frame, atol, rtol)
+            if found:
+                return TraceDivergence(expected["name"], episode, step, *found)
+        if len(want) != len(got):
+            return TraceDivergence(expected["name"], episode, min(len(want), len(got)), "(frame count)", len(want), len(got))
+    if len(expected["frames"]) != len(actual["frames"]):
+        return TraceDivergence(
+            expected["name"], 0, 0, "(episode count)", len(expected["frames"]), len(actual["frames"])
+        )
+    return None
+
+
+# The baseline package shadows this one, so baseline traces are recorded in a child
+# interpreter that imports it and loads this file by path.
+_BASELINE_CHILD = """
+import importlib.util, os, sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, sys.argv[1])
+spec = importlib.util.spec_from_file_location("_golden", sys.argv[2])
+golden = importlib.util.module_from_spec(spec)
+sys.modules["_golden"] = golden
+spec.loader.exec_module(golden)
+golden._record_baseline(sys.argv[3], sys.argv[4:])
+"""
+
+
+def record_baseline_traces(baseline_src: str | Path, out_dir: str | Path, names=None) -> None:
+    """Record BASELINE_TRACES (or names) from the src/ directory of a BASELINE_REVISION
+    checkout into out_dir."""
+    names = list(BASELINE_TRACES) if names is None else list(names)
+    subprocess.run(
+        [sys.executable, "-c", _BASELINE_CHILD, str(baseline_src), os.path.abspath(__file__), str(out_dir), *names],
+        check=True,
+    )
+
+
+def _record_baseline(out_dir: str, names: list[str]) -> None:
+    """Child side of record_baseline_traces: bullet_hell_rl is the baseline tree here."""
+    from functools import partial
+
+    from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+    for name in names:
+        trace = record_trace(name, BASELINE_TRACES[name], engine=partial(_BaselineRecorderEnv, BulletHellEnv))
+        trace["baseline"] = BASELINE_REVISION
+        path = Path(out_dir) / f"{name}.json.gz"
+        save_trace(trace, path)
+        print(f"recorded {name} from {BASELINE_REVISION}: {sum(len(f) for f in trace['frames'])} frames -> {path}")
+
+
+def save_trace(trace: dict, path: str | Path) -> None:
+    """Write a trace as gzipped JSON (byte-identical for identical traces)."""
+    data = json.dumps(trace, separators=(",", ":")).encode("utf-8")
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(data)
+
+
+def load_trace(path: str | Path) -> dict[str, Any]:
+    with gzip.open(path, "rb") as f:
+        trace = json.loads(f.read().decode("utf-8"))
+    if trace.get("version") != TRACE_VERSION:
+        raise ValueError(f"{path}: trace version {trace.get('version')} is not {TRACE_VERSION}; re-record it")
+    return trace
+
+
+__all__ = [
+    "BASELINE_REVISION",
+    "BASELINE_TRACES",
+    "DEFAULT_ATOL",
+    "DEFAULT_RTOL",
+    "GOLDEN_TRACES",
+    "TRACE_VERSION",
+    "TraceDivergence",
+    "baseline_env_engine",
+    "compare_traces",
+    "first_mismatch",
+    "load_trace",
+    "record_baseline_traces",
+    "record_trace",
+    "replay_trace",
+    "save_trace",
+]
@@ -1,6 +1,5 @@
 """Multiplayer client-server networking for Bullet Hell."""
 
-from .client import run_client
 from .protocol import (
     FLAT_ACTION_COUNT,
     flat_action_to_move_and_angle,
@@ -19,6 +18,11 @@ __all__ = [
 
 
 def __getattr__(name: str):
+    # Client and actor render with pygame; import them lazily so the server stays headless.
+    if name == "run_client":
+        from .client import run_client
+
+        return run_client
     if name == "run_actor":
         from .actor import run_actor
 
@@ -9,11 +9,14 @@ from typing import Any
 import queue
 import pygame
 
+from .input_sync import InputSyncReplica
 from .protocol import (
     MSG_ACTION,
     MSG_EXPERIENCE_TUPLE,
+    MSG_INPUTS,
     MSG_JOIN,
     MSG_RESPAWN,
+    MSG_SNAPSHOT,
     MSG_UPDATE,
     MSG_WELCOME,
     MSG_WEIGHTS_READY,
@@ -112,11 +115,16 @@ def run_actor(
     weights_path: str = "shared_weights.h5",
     bootstrap_weights_path: str | None = None,
     rl_config: ActorLearnerRLConfig | None = None,
+    headless: bool = False,
 ) -> None:
     """
     Connect to the game server, then run the render loop and send actions.
     A Pygame window is shown immediately so you always see something; it shows
     "Connecting..." then the game once the server sends updates.
+    Against a lockstep server (run_server(lockstep=True)) the actor acts exactly once per
+    update and tags each action with that update's tick, so transitions line up with ticks.
+    headless: no window and no drawing (SDL's dummy video driver); against a lockstep
+    server the actor then runs as fast as the server and the policy allow.
     """
 
     cfg = rl_config or ACTOR_LEARNER_RL_CONFIG
@@ -134,6 +142,8 @@ def run_actor(
         print("Actor: no learner connection (is the learner running on 127.0.0.1:5556?)")
 
     print("establishing pygame")
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Bullet Hell Multiplayer - Connecting...")
@@ -187,23 +197,32 @@ def run_actor(
     world_height = welcome.get("world_height", 1000)
     entity_size = welcome.get("entity_size", 20)
     bullet_size = 10  # default if not in welcome
+    lockstep = bool(welcome.get("lockstep", False))
 
     # Shared state from server (updated by recv thread)
     last_state: dict[str, Any] = {}
     last_respawn: dict[str, Any] | None = None
-    state_lock = threading.Lock()
+    state_lock = threading.Condition()  # notified on every update (lockstep waits on it)
     respawn_show_until = 0.0  # time (seconds) when to stop showing "Respawned!"
 
+    # Input-sync server: simulate a local replica from the per-tick inputs
+    replica = InputSyncReplica(client_id) if welcome.get("sync") == "input" else None
+
     def recv_loop() -> None:
         nonlocal last_respawn
         while True:
             msg = recv_message(sock)
             if msg is None:
                 break
+            if replica is not None and msg.get("type") in (MSG_INPUTS, MSG_SNAPSHOT):
+                msg = replica.handle(msg)
+                if msg is None:
+                    continue
             if msg.get("type") == MSG_UPDATE:
                 with state_lock:
                     last_state.clear()
                     last_state.update(msg)
+                    state_lock.notify()
                     # print(msg.get("tick"))
             elif msg.get("type") == MSG_RESPAWN:
                 with state_lock:
@@ -221,6 +240,7 @@ def run_actor(
     prev_update: dict[str, Any] | None = None
     prev_obs = None
     prev_action = DEFAULT_FLAT_ACTION
+    acted_tick = None  # lockstep: tick of the update last acted on
     rl_step = 0
     actor_r_sum = 0.0
     actor_r_n = 0
@@ -241,7 +261,12 @@ def run_actor(
         now = pygame.time.get_ticks() / 1000.0
 
         with state_lock:
+            if lockstep and last_state and last_state.get("tick") == acted_tick:
+                # Lockstep: one action per tick; wait for the server's next update
+                state_lock.wait(0.1)
             state = dict(last_state)
+        if lockstep and state and state.get("tick") == acted_tick:
+            continue
         if not state or state.get("type") != MSG_UPDATE:
             screen.fill(BLACK)
             status = font.render("Waiting for game state...", True, WHITE)
@@ -333,9 +358,15 @@ def run_actor(
             actor_r_sum = 0.0
             actor_r_n = 0
 
-        if now - last_send_time >= send_interval:
+        if lockstep or now - last_send_time >= send_interval:
+            action_msg = {"type": MSG_ACTION, "action": flat}
+            if lockstep:
+                acted_tick = action_msg["tick"] = state.get("tick")
             try:
-                send_message(sock, {"type": MSG_ACTION, "action": flat})
+                send_message(sock, action_msg)
+                resync = replica.resync_request() if replica is not None else None
+                if resync is not None:
+                    send_message(sock, resync)
                 last_send_time = now
             except OSError:
                 break
@@ -344,6 +375,11 @@ def run_actor(
         prev_obs = curr_obs
         prev_action = flat
 
+        if headless:
+            if not lockstep:
+                clock.tick(60)
+            continue
+
         players = state.get("players", [])
         enemies = state.get("enemies", [])
         bullets = state.get("bullets", [])
@@ -9,10 +9,13 @@ from typing import Any
 
 import pygame
 
+from .input_sync import InputSyncReplica
 from .protocol import (
     MSG_ACTION,
+    MSG_INPUTS,
     MSG_JOIN,
     MSG_RESPAWN,
+    MSG_SNAPSHOT,
     MSG_UPDATE,
     MSG_WELCOME,
     move_and_angle_to_flat_action,
@@ -131,12 +134,19 @@ def run_client(
     state_lock = threading.Lock()
     respawn_show_until = 0.0  # time (seconds) when to stop showing "Respawned!"
 
+    # Input-sync server: simulate a local replica from the per-tick inputs
+    replica = InputSyncReplica(client_id) if welcome.get("sync") == "input" else None
+
     def recv_loop() -> None:
         nonlocal last_respawn
         while True:
             msg = recv_message(sock)
             if msg is None:
                 break
+            if replica is not None and msg.get("type") in (MSG_INPUTS, MSG_SNAPSHOT):
+                msg = replica.handle(msg)
+                if msg is None:
+                    continue
             if msg.get("type") == MSG_UPDATE:
                 with state_lock:
                     last_state.clear()
@@ -169,6 +179,9 @@ def run_client(
         if now - last_send_time >= send_interval:
             try:
                 send_message(sock, {"type": MSG_ACTION, "action": flat})
+                resync = replica.resync_request() if replica is not None else None
+                if resync is not None:
+                    send_message(sock, resync)
                 last_send_time = now
             except OSError:
                 break
@@ -0,0 +1,143 @@
+"""
+Input-only lockstep networking.
+
+In input-sync mode (run_server(input_sync=True)) the server still runs the authoritative
+world, but instead of serializing every player, enemy and bullet to every client each tick
+it sends only what the world cannot work out by itself: who joined (and where), who left,
+and each player's flat action. Every client keeps an InputSyncReplica, a bit-exact copy of
+the world (WorldSimulator(fixed_point=True)) that it steps with those inputs and renders
+from. A new client starts from a full MSG_SNAPSHOT; every CHECKSUM_INTERVAL ticks the
+server attaches its state_checksum() and a replica that disagrees asks for a fresh snapshot
+with MSG_DESYNC.
+
+Message sizes no longer grow with the number of bullets and enemies, only with players.
+"""
+from typing import Any, Iterable, Mapping
+
+from ..bullethell import Player
+from ..world import WorldSimulator
+from .protocol import (
+    MOVE_LOOKUP,
+    MSG_DESYNC,
+    MSG_INPUTS,
+    MSG_SNAPSHOT,
+    flat_action_to_move_and_angle,
+)
+from .state import bullet_states, build_update, enemy_state
+
+CHECKSUM_INTERVAL = 60  # ticks between checksums sent with the inputs
+
+
+def world_actions(flat_actions: Mapping[int, int]) -> dict:
+    """{player_id: flat action} -> WorldSimulator.step actions."""
+    actions = {}
+    for pid, flat in flat_actions.items():
+        move_idx, angle = flat_action_to_move_and_angle(flat)
+        actions[pid] = (MOVE_LOOKUP[move_idx], angle)
+    return actions
+
+
+def join_entry(player_id: int, player: Player) -> dict[str, Any]:
+    """A player joining this tick, as replicas need it: id and starting position."""
+    return {"id": player_id, "x": player.x, "y": player.y}
+
+
+def inputs_message(
+    world: WorldSimulator,
+    joins: Iterable[dict[str, Any]],
+    leaves: Iterable[int],
+    flat_actions: Mapping[int, int],
+) -> dict[str, Any]:
+    """MSG_INPUTS for the tick the server just stepped (call after world.step).
+    joins are join_entry() dicts, taken when the players were added (before the step)."""
+    msg = {
+        "type": MSG_INPUTS,
+        "tick": world.tick_count,
+        "joins": list(joins),
+        "leaves": list(leaves),
+        "actions": {str(pid): flat for pid, flat in flat_actions.items()},
+    }
+    if world.tick_count % CHECKSUM_INTERVAL == 0:
+        msg["checksum"] = world.state_checksum()
+    return msg
+
+
+def snapshot_message(world: WorldSimulator) -> dict[str, Any]:
+    return {"type": MSG_SNAPSHOT, "world": world.snapshot()}
+
+
+class InputSyncReplica:
+    """
+    Client-side copy of the server world, advanced from MSG_INPUTS.
+
+    handle() takes MSG_SNAPSHOT / MSG_INPUTS messages and returns the MSG_UPDATE dict the
+    server would have sent this client (None while waiting for a snapshot). After a missed
+    tick or checksum mismatch the replica stops stepping; resync_request() then returns the
+    MSG_DESYNC to send (once) and the next snapshot restarts it.
+    """
+
+    def __init__(self, client_id: int):
+        self.client_id = client_id
+        self.world: WorldSimulator | None = None
+        self.desynced = False
+        self.desync_count = 0
+        self._resync_pending = False
+
+    def handle(self, msg: Mapping[str, Any]) -> dict[str, Any] | None:
+        kind = msg.get("type")
+        if kind == MSG_SNAPSHOT:
+            self.world = WorldSimulator.from_snapshot(msg["world"])
+            self.desynced = False
+            self._resync_pending = False
+            return self.update()
+        if kind != MSG_INPUTS or self.world is None or self.desynced:
+            return None
+        world = self.world
+        if msg["tick"] != world.tick_count + 1:
+            self._desync()
+            return None
+        # Same order as the server's tick: leaves, joins, then step.
+        for pid in msg["leaves"]:
+            world.remove_player(pid)
+        for join in msg["joins"]:
+            if join["id"] not in world.players:
+                world.add_player(join["id"], Player(join["x"], join["y"], is_env=True))
+        world.step(world_actions({int(pid): flat for pid, flat in msg["actions"].items()}))
+        checksum = msg.get("checksum")
+        if checksum is not None and checksum != world.state_checksum():
+            self._desync()
+            return None
+        return self.update()
+
+    def update(self) -> dict[str, Any]:
+        """MSG_UPDATE for this client from the replica world."""
+        world = self.world
+        return build_update(
+            self.client_id,
+            world.players.items(),
+            [enemy_state(e) for e in world.enemies],
+            bullet_states(world.bullets),
+            world.tick_count,
+        )
+
+    def resync_request(self) -> dict[str, Any] | None:
+        """MSG_DESYNC to send to the server, once per desync (None otherwise)."""
+        if not self._resync_pending:
+            return None
+        self._resync_pending = False
+        return {"type": MSG_DESYNC, "tick": self.world.tick_count if self.world else None}
+
+    def _desync(self) -> None:
+        self.desynced = True
+        self.desync_count += 1
+        self._resync_pending = True
+
+
+__all__ = [
+    "CHECKSUM_INTERVAL",
+    "InputSyncReplica",
+    "inputs_message",
+    "join_entry",
+    "snapshot_message",
+    "world_actions",
+]
@@ -14,6 +14,12 @@ MSG_JOIN = "join"
 MSG_REJECT = "reject"
 MSG_RESPAWN = "respawn"
 
+## Input-sync (lockstep replica) mode: the server sends joins/leaves/actions per tick
+## instead of full state, plus a full world snapshot on join or after a desync.
+MSG_INPUTS = "inputs"
+MSG_SNAPSHOT = "snapshot"
+MSG_DESYNC = "desync"
+
 
 ## Actor - Learner TCP Packet Definitions 
 MSG_EXPERIENCE_TUPLE = "experience_tuple"
@@ -63,9 +69,9 @@ LENGTH_PREFIX_FMT = ">I"
 def send_message(sock, obj: dict[str, Any]) -> None:
     """Send a JSON-serializable dict as length-prefixed message."""
     payload = json.dumps(obj).encode("utf-8")
-    length = len(payload)
-    sock.sendall(struct.pack(LENGTH_PREFIX_FMT, length))
-    sock.sendall(payload)
+    # One write: prefix and payload as separate writes stall on Nagle + delayed ACK
+    # (~40 ms per message), which caps request/response loops such as lockstep ticks.
+    sock.sendall(struct.pack(LENGTH_PREFIX_FMT, len(payload)) + payload)
 
 
 def recv_message(sock) -> dict[str, Any] | None:
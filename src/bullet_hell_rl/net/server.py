@@ -3,11 +3,18 @@ Authoritative multiplayer Bullet Hell server.
 Manages client connections, validates join, runs shared world simulation, broadcasts updates.
 
 The server runs HEADLESS (no window, no rendering). Only clients render the game;
-the server only simulates and sends state updates.
+the server only simulates and sends state updates. With input_sync=True it sends each tick's
+inputs instead of full state, and clients replay them on their own world replica
+(see input_sync.py).
+
+Ticks run on a fixed-rate deadline grid (see tick_scheduler.py), which reports tick-time
+percentiles and overruns. With lockstep=True and clients connected the fixed-rate
+scheduler is bypassed: it only times the ticks and never sleeps, and the server runs as
+fast as its actors answer, starting a tick once every client has sent an action for the
+last tick it was sent.
 """
 import math
 import os
-import random
 import socket
 import threading
 import time
@@ -17,51 +24,28 @@ from typing import Any
 # os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
 from ..bullethell import (
-    BULLET_DAMAGE,
-    ENEMY_SPAWN_MAX,
-    ENEMY_SPAWN_MIN,
     ENTITY_SIZE,
     PLAYER_HEALTH_MAX,
     WORLD_HEIGHT,
     WORLD_WIDTH,
-    Bullet,
-    Enemy,
     Player,
 )
+from ..world import FIXED_POINT_TICK_RATE, WorldSimulator
 
+from .input_sync import inputs_message, join_entry, snapshot_message, world_actions
 from .protocol import (
     FLAT_ACTION_COUNT,
     MSG_ACTION,
+    MSG_DESYNC,
     MSG_JOIN,
     MSG_REJECT,
     MSG_RESPAWN,
-    MSG_UPDATE,
     MSG_WELCOME,
-    MOVE_LOOKUP,
-    flat_action_to_move_and_angle,
     recv_message,
     send_message,
 )
-
-
-def _nearest_player(enemy: Enemy, players: dict[int, Player]) -> Player | None:
-    """Return the living player nearest to the enemy (by center distance)."""
-    if not players:
-        return None
-    ex = enemy.x + enemy.size // 2
-    ey = enemy.y + enemy.size // 2
-    best = None
-    best_d2 = float("inf")
-    for p in players.values():
-        if p.health <= 0:
-            continue
-        px = p.x + p.size // 2
-        py = p.y + p.size // 2
-        d2 = (px - ex) ** 2 + (py - ey) ** 2
-        if d2 < best_d2:
-            best_d2 = d2
-            best = p
-    return best
+from .state import bullet_states, build_update, enemy_state
+from .tick_scheduler import MAX_CATCH_UP_TICKS, FixedRateScheduler
 
 
 class ClientRecord:
@@ -71,25 +55,31 @@ class ClientRecord:
         self.player = player
         self.latest_action: int = 0  # flat 0-19; default no move + 0°
         self.disconnected = False
+        self.needs_snapshot = True  # input-sync mode: send full world before any inputs
+        self.sent_tick = -1  # lockstep mode: last tick this client was sent
+        self.acted_tick = -1  # lockstep mode: last tick this client sent an action for
 
 
 def _client_recv_loop(
     client_id: int,
     sock: socket.socket,
     message_queue: list[tuple[int, dict | None]],
-    queue_lock: threading.Lock,
+    queue_lock: threading.Condition,
 ) -> None:
-    """Run in thread: read messages and push (client_id, msg) to queue; None on disconnect."""
+    """Run in thread: read messages and push (client_id, msg) to queue; None on disconnect.
+    Waiters on queue_lock (the lockstep tick loop) are woken for every message."""
     try:
         while True:
             msg = recv_message(sock)
             with queue_lock:
                 message_queue.append((client_id, msg))
+                queue_lock.notify()
             if msg is None:
                 break
     except OSError:
         with queue_lock:
             message_queue.append((client_id, None))
+            queue_lock.notify()
     finally:
         try:
             sock.close()
@@ -97,46 +87,111 @@ def _client_recv_loop(
             pass
 
 
-def _build_player_state(player: Player, client_id: int) -> dict[str, Any]:
-    return {
-        "id": client_id,
-        "x": player.x,
-        "y": player.y,
-        "health": player.health,
-        "kill_count": player.kill_count,
-        "size": player.size,
-        "vel_x": float(player.vx),
-        "vel_y": float(player.vy),
-    }
-
-
-def _build_bullet_state(bullet: Bullet) -> dict[str, Any]:
-    return {
-        "x": bullet.x,
-        "y": bullet.y,
-        "vel_x": bullet.vel_x,
-        "vel_y": bullet.vel_y,
-        "is_friendly": bullet.is_friendly,
-        "size": bullet.size,
-        "owner_id": getattr(bullet, "owner_id", None),
-    }
-
-
-def _build_enemy_state(enemy: Enemy) -> dict[str, Any]:
-    return {
-        "x": enemy.x,
-        "y": enemy.y,
-        "vel_x": enemy.vx,
-        "vel_y": enemy.vy,
-        "size": enemy.size,
-        }
+def _process_messages(
+    to_process: list[tuple[int, dict | None]],
+    clients: dict[int, ClientRecord],
+    clients_lock: threading.Lock,
+) -> None:
+    """Apply queued messages: latest_action (and acted_tick), disconnects, resyncs."""
+    for cid, msg in to_process:
+        if msg is None:
+            with clients_lock:
+                if cid in clients:
+                    clients[cid].disconnected = True
+            continue
+        if msg.get("type") == MSG_ACTION:
+            a = msg.get("action", 0)
+            if isinstance(a, int) and 0 <= a < FLAT_ACTION_COUNT:
+                with clients_lock:
+                    if cid in clients:
+                        clients[cid].latest_action = a
+                        tick = msg.get("tick")
+                        if isinstance(tick, int):
+                            clients[cid].acted_tick = max(clients[cid].acted_tick, tick)
+        elif msg.get("type") == MSG_DESYNC:
+            with clients_lock:
+                if cid in clients:
+                    clients[cid].needs_snapshot = True
 
 
-def run_server(host: str = "0.0.0.0", port: int = 5555, secret: str | None = None) -> None:
+def _wait_for_actions(
+    tick: int,
+    clients: dict[int, ClientRecord],
+    clients_lock: threading.Lock,
+    message_queue: list[tuple[int, dict | None]],
+    queue_lock: threading.Condition,
+    timeout: float,
+) -> bool:
+    """Lockstep: process messages until every client sent `tick` has acted on it (or
+    left). False if timeout seconds ran out first."""
+    deadline = time.monotonic() + timeout
+    while True:
+        with queue_lock:
+            to_process = message_queue[:]
+            message_queue.clear()
+        _process_messages(to_process, clients, clients_lock)
+        with clients_lock:
+            waiting = any(
+                rec.sent_tick == tick and rec.acted_tick < tick and not rec.disconnected
+                for rec in clients.values()
+            )
+        if not waiting:
+            return True
+        with queue_lock:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if not message_queue:
+                queue_lock.wait(remaining)
+
+
+TICK_RATE = 60  # default server ticks per second
+CAP_REPORT_SECONDS = 10  # how often entity-cap activity is logged
+STRAGGLER_TIMEOUT = 0.25  # lockstep: seconds a tick waits for missing actions
+
+
+def run_server(
+    host: str = "0.0.0.0",
+    port: int = 5555,
+    secret: str | None = None,
+    tick_rate: float | None = None,
+    max_enemies: int | None = None,
+    max_bullets: int | None = None,
+    seed: int | None = None,
+    input_sync: bool = False,
+    lockstep: bool = False,
+    straggler_timeout: float = STRAGGLER_TIMEOUT,
+    tick_policy: str = "catch_up",
+    max_catch_up: int = MAX_CATCH_UP_TICKS,
+    tick_metrics: bool = False,
+) -> None:
     """
     Run the game server. Listens on host:port.
     If secret is set, clients must send {"type": "join", "token": secret}.
+    tick_rate is simulation ticks (and state updates) per second; None picks TICK_RATE, or
+    FIXED_POINT_TICK_RATE with input_sync.
+    max_enemies / max_bullets cap the live population (None = unbounded); how often the
+    caps trigger is logged every CAP_REPORT_SECONDS.
+    seed seeds the world's random stream (None = fresh entropy).
+    input_sync: send joins/leaves/actions per tick instead of full state; the world runs in
+    fixed-point mode, so tick_rate must give a power-of-two timestep
+    (FIXED_POINT_TICK_RATE, 64, the default then, does).
+    lockstep: don't tick on the wall clock. After sending tick T the server waits until
+    every client it sent T has answered with {"type": "action", "action": a, "tick": T},
+    then applies those actions in tick T + 1 immediately, so (obs, action, next_obs) line
+    up exactly and headless actors run faster than real time. A client that hasn't
+    answered after straggler_timeout seconds keeps its previous action for that tick
+    (timeouts are logged with the cap report). tick_rate still sets the simulated
+    timestep.
+    tick_policy: what the fixed-rate tick loop does when a tick ends past the next
+    deadline: "catch_up" runs overdue ticks back to back (at most max_catch_up owed at
+    once, older deadlines are dropped), "drop" skips every missed deadline (see
+    FixedRateScheduler). Tick-time percentiles are logged with the cap report whenever
+    ticks overran or were dropped; tick_metrics=True also appends them every report to
+    the training metrics CSV (source "server", event "tick_stats").
     """
+    if tick_rate is None:
+        tick_rate = FIXED_POINT_TICK_RATE if input_sync else TICK_RATE
     listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     listener.bind((host, port))
@@ -147,23 +202,29 @@ def run_server(host: str = "0.0.0.0", port: int = 5555, secret: str | None = Non
     next_client_id = 0
     clients_lock = threading.Lock()
     message_queue: list[tuple[int, dict | None]] = []
-    queue_lock = threading.Lock()
-
-    # Shared world (only modified on main thread during tick)
-    enemies: list[Enemy] = []
-    bullets: list[Bullet] = []
-    last_enemy_spawn_time = 0
-    next_spawn_interval = random.randint(ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX)
-    current_time = 0
-    TICK_RATE = 60
-    delta_time = 1.0 / TICK_RATE
-    tick_count = 0
-
-    # Spawn initial enemies (same as env reset: 3 enemies)
-    for _ in range(3):
-        ex = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-        ey = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-        enemies.append(Enemy(ex, ey))
+    queue_lock = threading.Condition()
+
+    scheduler = FixedRateScheduler(tick_rate, policy=tick_policy, max_catch_up=max_catch_up)
+    if tick_metrics:
+        # Lazy: the metrics log needs filelock, which a plain game server doesn't
+        from ..DQN.actor_learner_metrics import log_metrics_record
+
+    # Shared world (only modified on main thread during tick); same 3 starting enemies as env reset
+    world = WorldSimulator(
+        tick_ms=1000 / tick_rate,
+        initial_enemies=3,
+        respawn_dead_players=True,
+        max_enemies=max_enemies,
+        max_bullets=max_bullets,
+        seed=seed,
+        fixed_point=input_sync,
+    )
+    # Join positions are drawn on the accept thread, so they get their own child stream.
+    join_rng = world.rng.spawn()
+    cap_report_ticks = max(1, int(CAP_REPORT_SECONDS * tick_rate))
+    reported_caps = (0, 0)
+    straggler_ticks = 0
+    reported_straggler_ticks = 0
 
     def accept_loop() -> None:
         nonlocal next_client_id
@@ -192,8 +253,8 @@ def run_server(host: str = "0.0.0.0", port: int = 5555, secret: str | None = Non
                 sock.close()
                 continue
             # Spawn player at random position (same bounds as BulletHellEnv.reset)
-            px = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-            py = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
+            px = join_rng.randint(0, WORLD_WIDTH - ENTITY_SIZE)
+            py = join_rng.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
             player = Player(px, py, is_env=True)
             with clients_lock:
                 clients[cid] = ClientRecord(cid, sock, player)
@@ -205,6 +266,8 @@ def run_server(host: str = "0.0.0.0", port: int = 5555, secret: str | None = Non
                 "world_width": WORLD_WIDTH,
                 "world_height": WORLD_HEIGHT,
                 "entity_size": ENTITY_SIZE,
+                "sync": "input" if input_sync else "state",
+                "lockstep": lockstep,
             })
             t = threading.Thread(
                 target=_client_recv_loop,
@@ -218,141 +281,139 @@ def run_server(host: str = "0.0.0.0", port: int = 5555, secret: str | None = Non
 
     try:
         while True:
+            scheduler.begin_tick()
             # Drain message queue and update latest_action or mark disconnect
             with queue_lock:
                 to_process = message_queue[:]
                 message_queue.clear()
-            for cid, msg in to_process:
-                if msg is None:
-                    with clients_lock:
-                        if cid in clients:
-                            clients[cid].disconnected = True
-                    continue
-                if msg.get("type") == MSG_ACTION:
-                    a = msg.get("action", 0)
-                    if isinstance(a, int) and 0 <= a < FLAT_ACTION_COUNT:
-                        with clients_lock:
-                            if cid in clients:
-                                clients[cid].latest_action = a
+            _process_messages(to_process, clients, clients_lock)
 
-            # Remove disconnected clients
+            # Remove disconnected clients; sync world membership on the tick thread
             with clients_lock:
                 to_remove = [cid for cid, rec in clients.items() if rec.disconnected]
                 for cid in to_remove:
                     del clients[cid]
-
-            current_time += delta_time * 1000  # milliseconds for shoot timers
-            tick_count += 1 #Update tick counter 
-
-            with clients_lock:
                 player_list = list(clients.values())
-            if not player_list:
-                time.sleep(delta_time)
-                continue
-
-            # Instant respawn: any dead player gets new position and full health this tick
+            left = [cid for cid in to_remove if cid in world.players]
+            for cid in left:
+                world.remove_player(cid)
+            joined = []
             for rec in player_list:
-                if rec.player.health <= 0:
-                    new_x = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-                    new_y = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-                    rec.player.x = new_x
-                    rec.player.y = new_y
-                    rec.player.health = PLAYER_HEALTH_MAX
-                    rec.player.rect.x = new_x
-                    rec.player.rect.y = new_y
-                    try:
-                        send_message(rec.sock, {
-                            "type": MSG_RESPAWN,
-                            "client_id": rec.client_id,
-                            "x": new_x,
-                            "y": new_y,
-                            "health": PLAYER_HEALTH_MAX,
-                            "world_width": WORLD_WIDTH,
-                            "world_height": WORLD_HEIGHT,
-                            "entity_size": ENTITY_SIZE,
-                        })
-                    except OSError:
-                        rec.disconnected = True
+                if rec.client_id not in world.players:
+                    world.add_player(rec.client_id, rec.player)
+                    joined.append(join_entry(rec.client_id, rec.player))
 
-            # Enemy spawn
-            if current_time - last_enemy_spawn_time >= next_spawn_interval:
-                ex = random.randint(0, WORLD_WIDTH - ENTITY_SIZE)
-                ey = random.randint(0, WORLD_HEIGHT - ENTITY_SIZE)
-                enemies.append(Enemy(ex, ey))
-                last_enemy_spawn_time = current_time
-                next_spawn_interval = random.randint(ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX)
+            if not player_list:
+                world.idle()
+                scheduler.wait()
+                continue
 
-            # Apply player actions and shoot
-            for rec in player_list:
-                move_idx, angle = flat_action_to_move_and_angle(rec.latest_action)
-                dir_str = MOVE_LOOKUP[move_idx]
-                rec.player.aim_angle = angle
-                bullets_to_remove = rec.player.update(
-                    delta_time, None, bullets, action=dir_str
-                )
-                for b in bullets_to_remove:
-                    if b in bullets:
-                        bullets.remove(b)
-                pb = rec.player.shoot(current_time)
-                if pb:
-                    pb.owner_id = rec.client_id
-                    bullets.append(pb)
+            # Apply each client's latest action; the world handles respawn, spawn, players,
+            # enemies (targeting nearest living player) and bullets
+            flat_actions = {rec.client_id: rec.latest_action for rec in player_list}
+            events = world.step(world_actions(flat_actions))
+            tick_count = world.tick_count
 
-            # Enemies: target nearest player
-            for enemy in enemies[:]:
-                target = _nearest_player(enemy, {r.client_id: r.player for r in player_list})
-                if target is None:
-                    enemy.update_position(delta_time)
-                    continue
-                enemy_bullet = enemy.shoot(current_time)
-                if enemy_bullet:
-                    bullets.append(enemy_bullet)
-                bullets_to_remove, hit_info = enemy.update(
-                    delta_time, target, current_time, bullets, return_hit_info=True
-                )
-                for b in bullets_to_remove:
-                    if b in bullets:
-                        bullets.remove(b)
-                if enemy.health <= 0:
-                    killer_owner_id = hit_info.get("killer_owner_id")
-                    if killer_owner_id is not None:
-                        for killer in player_list:
-                            if killer.client_id == killer_owner_id:
-                                killer.player.kill_count += 1
-                                print(f"Player: {killer_owner_id} has new kill_count of {killer.player.kill_count}")
-                                break
-                    enemies.remove(enemy)
+            # Instant respawn: tell respawned players where they came back
+            by_id = {rec.client_id: rec for rec in player_list}
+            for cid, (new_x, new_y) in events.respawns.items():
+                rec = by_id[cid]
+                try:
+                    send_message(rec.sock, {
+                        "type": MSG_RESPAWN,
+                        "client_id": cid,
+                        "x": new_x,
+                        "y": new_y,
+                        "health": PLAYER_HEALTH_MAX,
+                        "world_width": WORLD_WIDTH,
+                        "world_height": WORLD_HEIGHT,
+                        "entity_size": ENTITY_SIZE,
+                    })
+                except OSError:
+                    rec.disconnected = True
 
-            # Bullets
-            for bullet in bullets[:]:
-                bullet.update(delta_time)
-                if bullet.is_off_screen():
-                    bullets.remove(bullet)
+            for kill in events.kills:
+                killer = world.players.get(kill.killer_id)
+                if killer is not None:
+                    print(f"Player: {kill.killer_id} has new kill_count of {killer.kill_count}")
+
+            if tick_count % cap_report_ticks == 0:
+                caps = (world.spawns_skipped, world.bullets_evicted)
+                if caps != reported_caps:
+                    print(
+                        f"Caps over last {cap_report_ticks} ticks: "
+                        f"{caps[0] - reported_caps[0]} spawns skipped (max_enemies={max_enemies}), "
+                        f"{caps[1] - reported_caps[1]} bullets evicted (max_bullets={max_bullets}); "
+                        f"live enemies={len(world.enemies)} bullets={len(world.bullets)}"
+                    )
+                    reported_caps = caps
+                if straggler_ticks != reported_straggler_ticks:
+                    print(
+                        f"Lockstep: {straggler_ticks - reported_straggler_ticks} of the last "
+                        f"{cap_report_ticks} ticks waited {straggler_timeout}s for a straggler"
+                    )
+                    reported_straggler_ticks = straggler_ticks
+                tick_stats = scheduler.report()
+                if tick_stats["tick_overruns"] or tick_stats["ticks_dropped"]:
+                    print(
+                        f"Ticks over last {cap_report_ticks}: "
+                        f"p50={tick_stats['tick_ms_p50']:.2f}ms p95={tick_stats['tick_ms_p95']:.2f}ms "
+                        f"p99={tick_stats['tick_ms_p99']:.2f}ms max={tick_stats['tick_ms_max']:.2f}ms "
+                        f"(budget {1000 / tick_rate:.2f}ms), {tick_stats['tick_overruns']} overran, "
+                        f"{tick_stats['ticks_dropped']} dropped; "
+                        f"{tick_stats['achieved_tick_rate']:.1f} ticks/s of {tick_rate}"
+                    )
+                if tick_metrics:
+                    try:
+                        log_metrics_record("server", "tick_stats", tick_stats)
+                    except Exception as e:
+                        print(f"Server: metrics log failed: {e}")
 
-            # Build and send update per client
             with clients_lock:
                 still_connected = list(clients.values())
-            for rec in still_connected:
-                you = rec.player
-                other_players = [
-                    _build_player_state(r.player, r.client_id)
-                    for r in still_connected
-                    if r.client_id != rec.client_id
-                ]
-                payload = {
-                    "type": MSG_UPDATE,
-                    "you": _build_player_state(you, rec.client_id),
-                    "players": other_players,
-                    "enemies": [_build_enemy_state(e) for e in enemies],
-                    "bullets": [_build_bullet_state(b) for b in bullets],
-                    "tick": tick_count,
-                }
-                try:
-                    send_message(rec.sock, payload)
-                except OSError:
-                    rec.disconnected = True
+            if input_sync:
+                # Everyone already in sync gets only this tick's inputs; new (or desynced)
+                # clients get the full world as of the end of this tick instead.
+                inputs = inputs_message(world, joined, left, flat_actions)
+                snapshot = None
+                for rec in still_connected:
+                    if rec.needs_snapshot:
+                        if rec.client_id not in world.players:
+                            continue  # accepted after this tick's join sync; next tick
+                        if snapshot is None:
+                            snapshot = snapshot_message(world)
+                        payload = snapshot
+                        rec.needs_snapshot = False
+                    else:
+                        payload = inputs
+                    try:
+                        send_message(rec.sock, payload)
+                        rec.sent_tick = tick_count
+                    except OSError:
+                        rec.disconnected = True
+            else:
+                # Build and send update per client; world entities are shared by every payload
+                enemy_states = [enemy_state(e) for e in world.enemies]
+                bullets = bullet_states(world.bullets)
+                # Accepted after this tick's join sync: not in the world yet; next tick
+                in_world = [r for r in still_connected if r.client_id in world.players]
+                members = [(r.client_id, r.player) for r in in_world]
+                for rec in in_world:
+                    payload = build_update(rec.client_id, members, enemy_states, bullets, tick_count)
+                    try:
+                        send_message(rec.sock, payload)
+                        rec.sent_tick = tick_count
+                    except OSError:
+                        rec.disconnected = True
 
-            time.sleep(delta_time)
+            if lockstep:
+                scheduler.end_tick()
+                if not _wait_for_actions(
+                    tick_count, clients, clients_lock, message_queue, queue_lock, straggler_timeout
+                ):
+                    straggler_ticks += 1
+            else:
+                scheduler.wait()
     except KeyboardInterrupt:
         print("Server shutting down.")
     finally:
@@ -0,0 +1,98 @@
+"""
+State update payloads (MSG_UPDATE) built from a WorldSimulator.
+
+The server builds these for every client each tick; in input-sync mode each client builds
+the same dicts from its own replica world instead (see input_sync.py).
+"""
+from typing import Any, Iterable
+
+from ..bullethell import BULLET_SIZE, NO_OWNER, Bullet, BulletPool, Enemy, Player
+from .protocol import MSG_UPDATE
+
+
+def player_state(player: Player, client_id: int) -> dict[str, Any]:
+    return {
+        "id": client_id,
+        "x": player.x,
+        "y": player.y,
+        "health": player.health,
+        "kill_count": player.kill_count,
+        "size": player.size,
+        "vel_x": float(player.vx),
+        "vel_y": float(player.vy),
+    }
+
+
+def bullet_state(bullet: Bullet) -> dict[str, Any]:
+    return {
+        "x": bullet.x,
+        "y": bullet.y,
+        "vel_x": bullet.vel_x,
+        "vel_y": bullet.vel_y,
+        "is_friendly": bullet.is_friendly,
+        "size": bullet.size,
+        "owner_id": getattr(bullet, "owner_id", None),
+    }
+
+
+def bullet_states(bullets: BulletPool) -> list[dict[str, Any]]:
+    """Same dicts as bullet_state, read column-wise from the pool arrays."""
+    slots = bullets.live_slots()
+    return [
+        {
+            "x": x,
+            "y": y,
+            "vel_x": vx,
+            "vel_y": vy,
+            "is_friendly": friendly,
+            "size": BULLET_SIZE,
+            "owner_id": None if owner == NO_OWNER else owner,
+        }
+        for x, y, vx, vy, friendly, owner in zip(
+            bullets.x[slots].tolist(),
+            bullets.y[slots].tolist(),
+            bullets.vel_x[slots].tolist(),
+            bullets.vel_y[slots].tolist(),
+            bullets.is_friendly[slots].tolist(),
+            bullets.owner_id[slots].tolist(),
+        )
+    ]
+
+
+def enemy_state(enemy: Enemy) -> dict[str, Any]:
+    return {
+        "x": enemy.x,
+        "y": enemy.y,
+        "vel_x": enemy.vx,
+        "vel_y": enemy.vy,
+        "size": enemy.size,
+        }
+
+
+def build_update(
+    client_id: int,
+    players: Iterable[tuple[int, Player]],
+    enemies: list[dict[str, Any]],
+    bullets: list[dict[str, Any]],
+    tick: int,
+) -> dict[str, Any]:
+    """MSG_UPDATE for one client. players is every (client_id, player) in the world;
+    enemies/bullets are the shared state lists (built once per tick)."""
+    you = None
+    others = []
+    for cid, player in players:
+        if cid == client_id:
+            you = player_state(player, cid)
+        else:
+            others.append(player_state(player, cid))
+    return {
+        "type": MSG_UPDATE,
+        "you": you,
+        "players": others,
+        "enemies": enemies,
+        "bullets": bullets,
+        "tick": tick,
+    }
+
+
+__all__ = ["bullet_state", "bullet_states", "build_update", "enemy_state", "player_state"]
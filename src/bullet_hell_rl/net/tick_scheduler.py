@@ -0,0 +1,138 @@
+"""
+Fixed-rate tick scheduling for the server loop, with tick-duration telemetry.
+
+Sleeping a fixed 1 / tick_rate after every tick makes each tick last its work time plus
+the sleep, so the real rate is always below tick_rate and falls with load, while the world
+still advances a fixed timestep per tick. FixedRateScheduler instead sleeps until absolute
+deadlines on a grid (start + n * period), so sleep overshoot and work time don't
+accumulate. When a tick finishes past the next deadline the policy decides:
+
+  catch_up - run the overdue ticks back to back until the loop is on the grid again, so
+             simulated time keeps pace with wall time. At most max_catch_up ticks are
+             owed at once; older deadlines are dropped (a long stall never turns into a
+             long fast-forward).
+  drop     - never run ticks back to back: skip every deadline already missed and start
+             the next tick now. The simulation slows down, tick spacing stays regular.
+
+Every tick's duration (begin_tick to end_tick, excluding the sleep) goes into a ring of
+the last `window` ticks. report() returns percentiles over the ticks since the previous
+report together with overrun (tick longer than one period), late (tick started after its
+deadline) and dropped counts; overruns or drops mean the server is saturated.
+
+    scheduler = FixedRateScheduler(60)
+    while True:
+        scheduler.begin_tick()
+        ...  # simulate and send
+        scheduler.wait()
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+TICK_POLICIES = ("catch_up", "drop")
+MAX_CATCH_UP_TICKS = 5  # catch_up: most overdue ticks run back to back
+TICK_STATS_WINDOW = 4096  # tick durations kept for percentiles
+
+
+class FixedRateScheduler:
+    def __init__(
+        self,
+        tick_rate: float,
+        policy: str = "catch_up",
+        max_catch_up: int = MAX_CATCH_UP_TICKS,
+        window: int = TICK_STATS_WINDOW,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if tick_rate <= 0:
+            raise ValueError(f"tick_rate must be > 0, got {tick_rate}")
+        if policy not in TICK_POLICIES:
+            raise ValueError(f"policy must be one of {TICK_POLICIES}, got {policy!r}")
+        if max_catch_up < 1:
+            raise ValueError(f"max_catch_up must be >= 1, got {max_catch_up}")
+        self.tick_rate = tick_rate
+        self.period = 1.0 / tick_rate
+        self.policy = policy
+        # Overdue ticks allowed to run back to back (drop: only the one starting now)
+        self._backlog_limit = max_catch_up if policy == "catch_up" else 1
+        self._clock = clock
+        self._sleep = sleep
+        self._next: float | None = None  # deadline (nominal start) of the next tick
+        self._tick_start = 0.0
+        self._durations = np.zeros(window, dtype=np.float64)
+        self.ticks = 0
+        self.overruns = 0
+        self.late = 0
+        self.dropped = 0
+        self._reported = (0, 0, 0, 0)  # ticks, overruns, late, dropped at the last report
+        self._reported_at: float | None = None
+
+    def begin_tick(self) -> None:
+        """Start timing a tick. The first call starts the deadline grid."""
+        now = self._clock()
+        if self._next is None:
+            self._next = now
+            self._reported_at = now
+        self._tick_start = now
+        self._next += self.period
+
+    def end_tick(self) -> float:
+        """Record the tick's duration (seconds since begin_tick) and return it. Call wait()
+        instead to also sleep to the next deadline; lockstep servers only record."""
+        duration = self._clock() - self._tick_start
+        self._durations[self.ticks % len(self._durations)] = duration
+        self.ticks += 1
+        if duration > self.period:
+            self.overruns += 1
+        return duration
+
+    def wait(self) -> None:
+        """end_tick, then sleep until the next tick's deadline; if that has passed already,
+        return at once and apply the policy to the missed deadlines."""
+        self.end_tick()
+        ahead = self._next - self._clock()
+        if ahead > 0:
+            self._sleep(ahead)
+            return
+        self.late += 1
+        # Deadlines already due, the next tick's included
+        backlog = int(-ahead / self.period) + 1
+        if backlog > self._backlog_limit:
+            skipped = backlog - self._backlog_limit
+            self._next += skipped * self.period
+            self.dropped += skipped
+
+    def report(self) -> dict[str, Any]:
+        """Tick statistics since the previous report (percentiles over at most `window`
+        ticks): durations in ms, achieved tick rate, overrun / late / dropped counts."""
+        now = self._clock()
+        ticks, overruns, late, dropped = self._reported
+        n = min(self.ticks - ticks, len(self._durations))
+        if n > 0:
+            idx = np.arange(self.ticks - n, self.ticks) % len(self._durations)
+            p50, p95, p99 = np.percentile(self._durations[idx], (50, 95, 99)) * 1000.0
+            worst = float(self._durations[idx].max()) * 1000.0
+        else:
+            p50 = p95 = p99 = worst = 0.0
+        elapsed = 0.0 if self._reported_at is None else now - self._reported_at
+        stats = {
+            "tick": self.ticks,
+            "tick_rate": self.tick_rate,
+            "achieved_tick_rate": (self.ticks - ticks) / elapsed if elapsed > 0 else 0.0,
+            "tick_ms_p50": float(p50),
+            "tick_ms_p95": float(p95),
+            "tick_ms_p99": float(p99),
+            "tick_ms_max": worst,
+            "tick_overruns": self.overruns - overruns,
+            "ticks_late": self.late - late,
+            "ticks_dropped": self.dropped - dropped,
+        }
+        self._reported = (self.ticks, self.overruns, self.late, self.dropped)
+        self._reported_at = now
+        return stats
+
+
+__all__ = ["FixedRateScheduler", "MAX_CATCH_UP_TICKS", "TICK_POLICIES", "TICK_STATS_WINDOW"]
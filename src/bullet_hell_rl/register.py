@@ -2,10 +2,20 @@ from gymnasium.envs.registration import register
 
 
 def register_envs() -> None:
-    """Register the Bullet Hell environment with Gymnasium."""
+    """Register the Bullet Hell environment with Gymnasium.
+
+    Constructor options pass straight through gymnasium.make, e.g.
+    gym.make("BulletHell-v0", frame_skip=4, tick_ms=60). max_episode_steps counts env
+    steps (decisions), not world ticks.
+
+    The same id builds the batched BulletHellVecEnv (N worlds stepped with array
+    operations) through gymnasium.make_vec, e.g.
+    gym.make_vec("BulletHell-v0", num_envs=64, vectorization_mode="vector_entry_point").
+    """
     register(
         id="BulletHell-v0",
         entry_point="bullet_hell_rl.envs.BulletHellEnv:BulletHellEnv",
+        vector_entry_point="bullet_hell_rl.envs.BulletHellVecEnv:BulletHellVecEnv",
         max_episode_steps=1000,
     )
 
@@ -0,0 +1,152 @@
+"""
+Per-world random streams.
+
+Every WorldSimulator owns a RandomStream wrapping its own numpy.random.Generator, so
+worlds seeded the same way replay the same game and worlds in one process (parallel envs,
+benchmarks) never share or perturb each other's randomness. Uniform floats are drawn from
+the generator in blocks and handed out from a buffer, which makes the frequent scalar
+draws (spawn positions, spawn intervals, enemy direction changes) cheaper than one
+generator or ``random`` module call each.
+"""
+from __future__ import annotations
+
+import random
+from typing import Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+DEFAULT_BUFFER_SIZE = 256
+
+
+class RandomStream:
+    """
+    Buffered draws from one numpy Generator.
+
+    seed: anything np.random.default_rng accepts (int, SeedSequence, Generator or None for
+    fresh OS entropy). Passing a Generator shares it, e.g. a gymnasium env's np_random.
+    """
+
+    def __init__(self, seed=None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.generator = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self.buffer_size = int(buffer_size)
+        self._buffer: list[float] = []
+        self._pos = 0
+        # Where the buffer came from: the buffer is the generator's stream from state
+        # origin on, minus its first `skip` floats. get_state stores this instead of floats.
+        self._origin = None
+        self._skip = 0
+
+    def _refill(self, rest: list[float], n: int) -> None:
+        """Buffer = rest (the undrawn tail of the old buffer) + n fresh floats."""
+        if rest:
+            # rest continues the old stream, so the old origin still describes the buffer
+            self._skip += self._pos
+        else:
+            self._origin = self.generator.bit_generator.state
+            self._skip = 0
+        self._buffer = rest + self.generator.random(n).tolist()
+        self._pos = 0
+
+    def _take(self, k: int) -> list[float]:
+        """The next k uniform floats in [0, 1)."""
+        if self._pos + k > len(self._buffer):
+            rest = self._buffer[self._pos:]
+            self._refill(rest, max(self.buffer_size, k - len(rest)))
+        out = self._buffer[self._pos:self._pos + k]
+        self._pos += k
+        return out
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)."""
+        if self._pos >= len(self._buffer):
+            self._refill([], self.buffer_size)
+        u = self._buffer[self._pos]
+        self._pos += 1
+        return u
+
+    def randint(self, low: int, high: int) -> int:
+        """Integer in [low, high], both inclusive (like random.randint)."""
+        pos = self._pos
+        if pos >= len(self._buffer):
+            self._refill([], self.buffer_size)
+            pos = 0
+        self._pos = pos + 1
+        return low + int(self._buffer[pos] * (high - low + 1))
+
+    def choices(self, population: Sequence[T], k: int = 1) -> list[T]:
+        """k independent picks from population, drawn in one batch."""
+        n = len(population)
+        if k == 1:
+            return [population[int(self.random() * n)]]
+        return [population[int(u * n)] for u in self._take(k)]
+
+    def get_state(self) -> dict:
+        """JSON-serializable stream state. The buffer is stored as the generator state it was
+        drawn from rather than as floats, which keeps the state a few hundred bytes."""
+        return {
+            "bit_generator": self.generator.bit_generator.state,
+            "origin": self._origin,
+            "skip": self._skip,
+            "length": len(self._buffer),
+            "pos": self._pos,
+            "buffer_size": self.buffer_size,
+        }
+
+    def set_state(self, state: dict) -> None:
+        """Restore a state from get_state; later draws match the original stream exactly."""
+        bit_state = state["bit_generator"]
+        if type(self.generator.bit_generator).__name__ != bit_state["bit_generator"]:
+            self.generator = np.random.Generator(getattr(np.random, bit_state["bit_generator"])())
+        self.buffer_size = int(state["buffer_size"])
+        self._origin = state["origin"]
+        self._skip = skip = state["skip"]
+        if self._origin is None:
+            self._buffer = []
+        else:
+            self.generator.bit_generator.state = self._origin
+            self._buffer = self.generator.random(skip + state["length"]).tolist()[skip:]
+        self._pos = state["pos"]
+        self.generator.bit_generator.state = bit_state
+
+    def spawn(self) -> "RandomStream":
+        """An independent child stream (e.g. for another thread), derived deterministically."""
+        return RandomStream(self.generator.spawn(1)[0], self.buffer_size)
+
+
+class PythonRandomStream(RandomStream):
+    """
+    A RandomStream that draws from random.Random(seed) the way the engine did before worlds
+    had their own streams (baseline 44f6be3 called the global random module, seeded with
+    random.seed). randint and random are random.Random's; choices(k) is k random.choice
+    calls, as the baseline re-rolled enemy directions one enemy at a time. Only
+    golden.baseline_env_engine uses it, to replay traces recorded from that engine.
+    """
+
+    def __init__(self, seed=None):
+        super().__init__(0, buffer_size=0)
+        self.python_random = random.Random(seed)
+
+    def random(self) -> float:
+        return self.python_random.random()
+
+    def randint(self, low: int, high: int) -> int:
+        return self.python_random.randint(low, high)
+
+    def choices(self, population: Sequence[T], k: int = 1) -> list[T]:
+        return [self.python_random.choice(population) for _ in range(k)]
+
+    def get_state(self) -> dict:
+        version, internal, gauss = self.python_random.getstate()
+        return {"python_random": [version, list(internal), gauss]}
+
+    def set_state(self, state: dict) -> None:
+        version, internal, gauss = state["python_random"]
+        self.python_random.setstate((version, tuple(internal), gauss))
+
+    def spawn(self) -> "PythonRandomStream":
+        return PythonRandomStream(self.python_random.getrandbits(64))
+
+
+__all__ = ["DEFAULT_BUFFER_SIZE", "PythonRandomStream", "RandomStream"]
@@ -0,0 +1,75 @@
+"""
+Heap-based timer scheduler for the world's interval timers.
+
+Shoot timers, enemy action re-rolls and enemy spawning all follow the same rule: a timer
+last reset at ``last`` fires once ``current_time - last >= interval``. Polling that for
+every entity every tick is O(entities) even when nothing fires. TimerScheduler keeps one
+heap entry per timer ordered by ``last + interval`` and hands back only the timers that are
+due, so a tick costs O(due * log timers).
+
+The heap is only a filter: every candidate is re-checked with the exact polling expression
+(``last + interval`` can round differently from ``current_time - last``), so firing ticks
+are identical to polling. Cancelled or rescheduled timers are dropped lazily: each key
+remembers the push counter of its live entry, and entries with any other counter are stale.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Hashable
+
+# Relative slack when comparing rounded deadlines; the exact check decides.
+_DEADLINE_SLACK = 1e-9
+
+
+class TimerScheduler:
+    def __init__(self):
+        self._heap: list[tuple] = []
+        self._generation: dict[Hashable, int] = {}  # key -> counter of its live heap entry
+        self._counter = 0  # unique per push: heap tie-break (keys never get compared) and generation
+
+    def schedule(self, key: Hashable, last: float, interval: float) -> None:
+        """(Re)arm key to fire once current_time - last >= interval. Replaces any pending timer."""
+        # Generations must never repeat: a stale entry of a popped or cancelled key would
+        # otherwise match the key's next timer and fire it early.
+        generation = self._counter
+        self._counter += 1
+        self._generation[key] = generation
+        heapq.heappush(self._heap, (last + interval, generation, key, generation, last, interval))
+
+    def cancel(self, key: Hashable) -> None:
+        self._generation.pop(key, None)
+
+    def pop_due(self, current_time: float) -> list:
+        """Keys whose timer has elapsed at current_time, in deadline order. They are disarmed;
+        the caller reschedules the ones that should fire again."""
+        heap = self._heap
+        generation = self._generation
+        limit = current_time + _DEADLINE_SLACK * max(1.0, abs(current_time))
+        due = []
+        not_yet = []
+        while heap and heap[0][0] <= limit:
+            entry = heapq.heappop(heap)
+            key, gen, last, interval = entry[2], entry[3], entry[4], entry[5]
+            if generation.get(key) != gen:
+                continue  # cancelled or rescheduled since this entry was pushed
+            if current_time - last >= interval:
+                del generation[key]
+                due.append(key)
+            else:
+                not_yet.append(entry)
+        for entry in not_yet:
+            heapq.heappush(heap, entry)
+        # Drop the backlog of stale entries once it outweighs the live timers.
+        if len(heap) > 64 and len(heap) > 4 * len(generation):
+            self._heap = [e for e in heap if generation.get(e[2]) == e[3]]
+            heapq.heapify(self._heap)
+        return due
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._generation
+
+    def __len__(self) -> int:
+        return len(self._generation)
+
+
+__all__ = ["TimerScheduler"]
@@ -45,9 +45,10 @@ from bullet_hell_rl.DQN.DQNLegacy import DeepQLearning
 from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
 
 # create the environment
-env = BulletHellEnv(render_mode="human")
+env = BulletHellEnv(render_mode="human", flat=True, reuse_obs=True)
 
 # DQN instance provides _flatten_obs, _flat_action_to_env, and stateDimension
+# (with a flat env these only copy the observation and pass the action through)
 dqn = DeepQLearning(env, gamma=0.99, epsilon=0.0, numberEpisodes=1, modelFileName="")
 # load trained weights into main network
 dqn.mainNetwork = keras.models.load_model(
@@ -0,0 +1,84 @@
+"""
+Uniform-grid spatial hash used as the collision broadphase for bullets.
+
+Bullets are bucketed by the cell containing their rect corner. A rebuild is a counting
+sort of the cell keys (one stable radix argsort + bincount), so it is O(bullets) and runs
+at most once per tick, after the bullets have moved. Bullets spawned after the rebuild are
+kept on a small pending list that every query also returns. Queries hand back candidate
+slots only; callers still run the exact rect test on them.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+DEFAULT_CELL_SIZE = 32
+
+
+class SpatialHash:
+    def __init__(self, world_width: float, world_height: float, cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = int(cell_size)
+        self.cols = max(1, int(np.ceil(world_width / self.cell_size)) + 1)
+        self.rows = max(1, int(np.ceil(world_height / self.cell_size)) + 1)
+        self._sorted_slots = np.empty(0, dtype=np.int64)
+        self._cell_start = np.zeros(self.cols * self.rows + 1, dtype=np.int64)
+        self._cell_start_list: list[int] = self._cell_start.tolist()
+        self._pending: list[int] = []
+        self.valid = False
+
+    def _cell_coords(self, x, y):
+        cx = np.clip(np.floor_divide(x, self.cell_size), 0, self.cols - 1).astype(np.int64)
+        cy = np.clip(np.floor_divide(y, self.cell_size), 0, self.rows - 1).astype(np.int64)
+        return cx, cy
+
+    def rebuild(self, slots: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Bucket the given slots by the cell of (xs, ys)."""
+        cx, cy = self._cell_coords(xs, ys)
+        keys = cy * self.cols + cx
+        order = np.argsort(keys, kind="stable")
+        self._sorted_slots = slots[order]
+        counts = np.bincount(keys, minlength=self.cols * self.rows)
+        self._cell_start[0] = 0
+        np.cumsum(counts, out=self._cell_start[1:])
+        self._cell_start_list = self._cell_start.tolist()
+        self._pending.clear()
+        self.valid = True
+
+    def add_pending(self, slot: int) -> None:
+        """Track a slot filled after the last rebuild."""
+        self._pending.append(slot)
+
+    def invalidate(self) -> None:
+        self.valid = False
+        self._pending.clear()
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """Candidate slots whose cell overlaps [x0, x1] x [y0, y1] (inclusive), plus pending.
+
+        May contain stale or duplicate slots; the caller filters with the exact test.
+        """
+        # Scalar cell math in plain Python: NumPy overhead dominates for a single rect.
+        cs = self.cell_size
+        last_col = self.cols - 1
+        last_row = self.rows - 1
+        cx0 = min(max(int(x0 // cs), 0), last_col)
+        cy0 = min(max(int(y0 // cs), 0), last_row)
+        cx1 = min(max(int(x1 // cs), 0), last_col)
+        cy1 = min(max(int(y1 // cs), 0), last_row)
+        start = self._cell_start_list
+        parts = []
+        for row in range(cy0, cy1 + 1):
+            base = row * self.cols
+            lo = start[base + cx0]
+            hi = start[base + cx1 + 1]
+            if hi > lo:
+                parts.append(self._sorted_slots[lo:hi])
+        if self._pending:
+            parts.append(np.asarray(self._pending, dtype=np.int64))
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+
+__all__ = ["DEFAULT_CELL_SIZE", "SpatialHash"]
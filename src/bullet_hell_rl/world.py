@@ -0,0 +1,571 @@
+"""
+Shared world simulation core.
+
+WorldSimulator owns one world (players, enemies, bullet pool, spawn timer) and advances it
+by a fixed timestep. The standalone game (bullethell.main), BulletHellEnv and the
+multiplayer server all drive the same step(), so there is one hot path to optimise and
+benchmark. Each step returns a TickEvents record (kills with killer id, damage taken,
+respawns) built from the collision code's hit info, and the world keeps running per-player
+totals (kill_totals, damage_totals). Nothing goes through a process-global event queue,
+so many worlds can run side by side in one process.
+
+Tick order: respawn dead players (server only) -> spawn enemies -> per player: move,
+collide, shoot -> enemies shoot -> EnemyController re-rolls, moves and aims all enemies
+at their nearest living player -> per enemy: collide -> integrate and cull bullets.
+
+Spawn, shoot and enemy-action intervals run on TimerSchedulers, so a tick only touches
+the timers that are due instead of polling every entity.
+
+With fixed_point=True and a power-of-two timestep (FIXED_POINT_TICK_RATE ticks per
+second) the simulation is bit-exact: seeded RNG, ordered updates and positions that stay
+on a fixed-point grid. Replicas built from snapshot() and fed the same actions stay
+identical, which state_checksum() verifies cheaply (see net/input_sync.py).
+"""
+from __future__ import annotations
+
+import math
+import pickle
+import time
+import zlib
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from bullet_hell_rl.bullethell import (
+    ENEMY_SPAWN_MAX,
+    ENEMY_SPAWN_MIN,
+    ENTITY_SIZE,
+    PLAYER_HEALTH_MAX,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+    BulletPool,
+    Enemy,
+    Player,
+)
+from bullet_hell_rl.enemy_ai import EnemyController
+from bullet_hell_rl.rng import RandomStream
+from bullet_hell_rl.scheduler import TimerScheduler
+
+_SPAWN_TIMER = "spawn"
+
+# Ticks per second giving a power-of-two timestep (1/64 s), as fixed_point requires.
+FIXED_POINT_TICK_RATE = 64
+
+# Entity attributes carried by snapshot() and get_state(), and hashed by state_checksum().
+_PLAYER_FIELDS = ("x", "y", "health", "aim_angle", "shoot_timer", "kill_count", "vx", "vy",
+                  "rect_x", "rect_y", "action")
+_ENEMY_FIELDS = ("timer_key", "x", "y", "health", "aim_angle", "shoot_timer", "last_action_time",
+                 "action", "vx", "vy", "rect_x", "rect_y")
+# Bump when the get_state() layout changes.
+_STATE_VERSION = 2
+# get_state() packs the bullet columns into one float64 and one int32 block.
+_BULLET_FLOAT_COLUMNS = ("x", "y", "vel_x", "vel_y", "angle")
+_BULLET_INT_COLUMNS = ("rect_x", "rect_y", "prev_rect_x", "prev_rect_y", "damage", "is_friendly", "owner_id")
+
+
+
+def _plain(value):
+    """numpy scalars -> Python numbers, so snapshots stay JSON-serializable."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _PhaseClock:
+    """Adds the time since the previous call to totals[phase] (WorldSimulator.phase_times)."""
+
+    def __init__(self, totals: dict[str, float]):
+        self.totals = totals
+        self.last = time.perf_counter()
+
+    def __call__(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self.last
+        self.last = now
+
+
+# (move, aim_angle): move is "left"/"right"/"up"/"down"/"none" or None; aim None keeps the last angle.
+PlayerAction = tuple[str | None, float | None]
+
+
+@dataclass
+class KillEvent:
+    """An enemy died this tick. killer_id is the owner of the bullet that killed it."""
+
+    killer_id: int | None
+    x: float
+    y: float
+
+
+@dataclass
+class TickEvents:
+    """Everything notable that happened during one WorldSimulator.step."""
+
+    tick: int
+    current_time: float
+    kills: list[KillEvent] = field(default_factory=list)
+    damage_taken: dict[int, int] = field(default_factory=dict)  # player_id -> health lost
+    respawns: dict[int, tuple[int, int]] = field(default_factory=dict)  # player_id -> respawn (x, y)
+    enemies_spawned: int = 0
+    bullets_culled: int = 0
+    spawns_skipped: int = 0  # spawn timer fired while the enemy cap was reached
+    bullets_evicted: int = 0  # oldest bullets retired to stay under the bullet cap
+
+    def kills_by(self, player_id: int) -> int:
+        return sum(1 for k in self.kills if k.killer_id == player_id)
+
+
+class WorldSimulator:
+    """
+    Fixed-timestep simulation of one Bullet Hell world.
+
+    tick_ms: simulated milliseconds per step (shoot/spawn timers run on this clock).
+    player_ids: players created (at random positions) before anything else is drawn.
+    initial_enemies: enemies spawned at construction, as BulletHellEnv.reset always did.
+    respawn_dead_players: server rule; a dead player respawns at the start of the next tick.
+    swept_collisions: also hit bullets that passed through an entity during their last move
+        (see BulletPool), so large tick_ms values don't let fast bullets tunnel.
+    max_enemies: cap on live enemies; at the cap the spawn timer still runs but spawns
+        nothing (None = unbounded).
+    max_bullets: cap on live bullets at the end of each tick; the oldest bullets are
+        retired first (None = unbounded).
+    world_width / world_height: world size in pixels (entities are clamped to it, bullets
+        leaving it are culled).
+    spawn_interval_ms: (min, max) milliseconds between enemy spawns, drawn uniformly.
+    fixed_point: bit-exact mode for lockstep replicas. Requires tick_ms to be a power-of-two
+        fraction of a second (e.g. 1000 / FIXED_POINT_TICK_RATE); bullet velocities are
+        snapped to the fixed-point grid so positions stay exactly representable.
+    seed: seeds the world's own RandomStream (int, SeedSequence, numpy Generator or an
+        existing RandomStream). All spawn positions, spawn intervals and enemy direction
+        changes come from it, so equal seeds replay the same world. None = fresh entropy.
+
+    spawns_skipped and bullets_evicted count how often the caps triggered since construction.
+    Set phase_times to a dict to have step() add the seconds spent in each phase to it
+    (PHASES lists the keys); None, the default, skips the timing.
+    """
+
+    PHASES = ("spawn", "players", "enemy_ai", "enemy_collisions", "bullets")
+
+    def __init__(
+        self,
+        tick_ms: float = 1000 / 60,
+        player_ids: Iterable[int] = (),
+        initial_enemies: int = 3,
+        respawn_dead_players: bool = False,
+        swept_collisions: bool = True,
+        max_enemies: int | None = None,
+        max_bullets: int | None = None,
+        seed=None,
+        fixed_point: bool = False,
+        world_width: int = WORLD_WIDTH,
+        world_height: int = WORLD_HEIGHT,
+        spawn_interval_ms: tuple[int, int] = (ENEMY_SPAWN_MIN, ENEMY_SPAWN_MAX),
+    ):
+        if max_enemies is not None and max_enemies < 0:
+            raise ValueError(f"max_enemies must be >= 0, got {max_enemies}")
+        if max_bullets is not None and max_bullets < 0:
+            raise ValueError(f"max_bullets must be >= 0, got {max_bullets}")
+        self.tick_ms = tick_ms
+        self.delta_time = tick_ms / 1000
+        if fixed_point and math.frexp(self.delta_time)[0] != 0.5:
+            raise ValueError(
+                f"fixed_point needs a power-of-two timestep in seconds, got tick_ms={tick_ms} "
+                f"(use tick_ms=1000/{FIXED_POINT_TICK_RATE})"
+            )
+        self.fixed_point = fixed_point
+        self.world_width = world_width
+        self.world_height = world_height
+        self.spawn_interval_ms = tuple(spawn_interval_ms)
+        self.phase_times: dict[str, float] | None = None
+        self.respawn_dead_players = respawn_dead_players
+        self.rng = seed if isinstance(seed, RandomStream) else RandomStream(seed)
+        self.max_enemies = max_enemies
+        self.max_bullets = max_bullets
+        self.spawns_skipped = 0
+        self.bullets_evicted = 0
+        self.players: dict[int, Player] = {}
+        # Per-world accumulators since the player joined (or the world was built)
+        self.kill_totals: dict[int, int] = {}
+        self.damage_totals: dict[int, int] = {}
+        self.enemies: list[Enemy] = []
+        self.bullets = BulletPool(
+            swept=swept_collisions, fixed_point=fixed_point, world_width=world_width, world_height=world_height
+        )
+        self.enemy_controller = EnemyController(self.rng, world_width, world_height)
+        self.current_time = 0
+        self.tick_count = 0
+        # Interval timers: player shots keyed by player id, enemy shots/actions by timer_key.
+        self.spawn_timer = TimerScheduler()
+        self.player_shot_timers = TimerScheduler()
+        self.enemy_shot_timers = TimerScheduler()
+        self.enemy_action_timers = TimerScheduler()
+        self._enemies_by_key: dict[int, Enemy] = {}
+        self._next_enemy_key = 0
+
+        for pid in player_ids:
+            self.add_player(pid)
+
+        self.last_enemy_spawn_time = 0
+        self.next_spawn_interval = self.rng.randint(*self.spawn_interval_ms)
+        self.spawn_timer.schedule(_SPAWN_TIMER, self.last_enemy_spawn_time, self.next_spawn_interval)
+        if max_enemies is not None:
+            initial_enemies = min(initial_enemies, max_enemies)
+        for _ in range(initial_enemies):
+            self.spawn_enemy()
+
+    # ------------------------------------------------------------------ membership
+    def random_position(self) -> tuple[int, int]:
+        """A spawn position anywhere in the world, from this world's stream."""
+        return (
+            self.rng.randint(0, self.world_width - ENTITY_SIZE),
+            self.rng.randint(0, self.world_height - ENTITY_SIZE),
+        )
+
+    def add_player(self, player_id: int, player: Player | None = None) -> Player:
+        """Add a player (created at a random position unless one is given)."""
+        if player is None:
+            x, y = self.random_position()
+            player = Player(x, y, is_env=True)
+        self._fit(player)
+        self.players[player_id] = player
+        self.kill_totals[player_id] = 0
+        self.damage_totals[player_id] = 0
+        self.player_shot_timers.schedule(player_id, player.shoot_timer, player.shoot_timer_max)
+        return player
+
+    def remove_player(self, player_id: int) -> None:
+        self.players.pop(player_id, None)
+        self.player_shot_timers.cancel(player_id)
+        self.kill_totals.pop(player_id, None)
+        self.damage_totals.pop(player_id, None)
+
+    def respawn_player(self, player_id: int) -> Player:
+        """Move a player to a random position with full health."""
+        player = self.players[player_id]
+        player.set_position(*self.random_position())
+        player.health = PLAYER_HEALTH_MAX
+        return player
+
+    def spawn_enemy(self) -> Enemy:
+        x, y = self.random_position()
+        enemy = Enemy(x, y)
+        self._fit(enemy)
+        # Keys grow with spawn order, which is also the order of self.enemies.
+        enemy.timer_key = key = self._next_enemy_key
+        self._next_enemy_key += 1
+        self._enemies_by_key[key] = enemy
+        self.enemy_shot_timers.schedule(key, enemy.shoot_timer, enemy.shoot_timer_max)
+        self.enemy_action_timers.schedule(key, enemy.last_action_time, enemy.action_interval)
+        self.enemies.append(enemy)
+        return enemy
+
+    def _fit(self, entity) -> None:
+        """Give an entity this world's movement bounds (the class default is the standard size)."""
+        if (entity.world_width, entity.world_height) != (self.world_width, self.world_height):
+            entity.world_width = self.world_width
+            entity.world_height = self.world_height
+
+    def _forget_enemy(self, enemy: Enemy) -> None:
+        key = enemy.timer_key
+        self._enemies_by_key.pop(key, None)
+        self.enemy_shot_timers.cancel(key)
+        self.enemy_action_timers.cancel(key)
+
+    # ------------------------------------------------------------------ stepping
+    def idle(self) -> None:
+        """Advance the clock without simulating (server with nobody connected)."""
+        self.current_time += self.tick_ms
+        self.tick_count += 1
+
+    def step(self, actions: Mapping[int, PlayerAction] | None = None) -> TickEvents:
+        """Advance the world by one tick. Players missing from actions stand still."""
+        actions = actions or {}
+        self.current_time += self.tick_ms
+        self.tick_count += 1
+        current_time = self.current_time
+        delta_time = self.delta_time
+        bullets = self.bullets
+        events = TickEvents(tick=self.tick_count, current_time=current_time)
+        prof = self.phase_times
+        if prof is not None:
+            lap = _PhaseClock(prof)
+
+        if self.respawn_dead_players:
+            for pid, player in self.players.items():
+                if player.health <= 0:
+                    self.respawn_player(pid)
+                    events.respawns[pid] = (player.x, player.y)
+
+        if self.spawn_timer.pop_due(current_time):
+            if self.max_enemies is None or len(self.enemies) < self.max_enemies:
+                self.spawn_enemy()
+                events.enemies_spawned += 1
+            else:
+                # At the cap: skip this spawn but keep the timer cadence.
+                events.spawns_skipped += 1
+                self.spawns_skipped += 1
+            self.last_enemy_spawn_time = current_time
+            self.next_spawn_interval = self.rng.randint(*self.spawn_interval_ms)
+            self.spawn_timer.schedule(_SPAWN_TIMER, current_time, self.next_spawn_interval)
+        if prof is not None:
+            lap("spawn")
+
+        shooting_players = self.player_shot_timers.pop_due(current_time)
+        for pid, player in self.players.items():
+            move, angle = actions.get(pid, (None, None))
+            if angle is not None:
+                player.aim_angle = angle
+            bullets_to_remove, hit_info = player.update(
+                delta_time, None, bullets, action=move, return_hit_info=True
+            )
+            bullets.remove_many(bullets_to_remove)
+            if hit_info["damage"]:
+                events.damage_taken[pid] = hit_info["damage"]
+                self.damage_totals[pid] += hit_info["damage"]
+            if shooting_players and pid in shooting_players:
+                pb = player.fire(current_time, bullets)
+                pb.owner_id = pid
+                self.player_shot_timers.schedule(pid, current_time, player.shoot_timer_max)
+        if prof is not None:
+            lap("players")
+
+        # Players don't move or lose health while enemies update, so one snapshot serves all.
+        living = [p for p in self.players.values() if p.health > 0]
+        enemies = self.enemies
+        acting = None
+        if living:
+            # Timers only run while there is someone to fight; otherwise they stay due.
+            # Shots leave from the pre-move position, aimed where the enemy aimed last tick.
+            by_key = self._enemies_by_key
+            for key in sorted(self.enemy_shot_timers.pop_due(current_time)):
+                enemy = by_key[key]
+                enemy.fire(current_time, bullets)
+                self.enemy_shot_timers.schedule(key, current_time, enemy.shoot_timer_max)
+            acting = [by_key[key] for key in sorted(self.enemy_action_timers.pop_due(current_time))]
+        self.enemy_controller.update(enemies, living, current_time, delta_time, due=acting)
+        if acting:
+            for enemy in acting:
+                self.enemy_action_timers.schedule(enemy.timer_key, current_time, enemy.action_interval)
+        if prof is not None:
+            lap("enemy_ai")
+        if not living:
+            # Nobody to fight: enemies only drift this tick.
+            enemies = []
+        any_dead = False
+        for enemy in enemies:
+            # Enemy bullets never hit enemies, so checking after all have moved and shot is
+            # the same as the old shoot/move/collide per enemy.
+            bullets_to_remove, hit_info = enemy.is_colliding(bullets, return_hit_info=True)
+            bullets.remove_many(bullets_to_remove)
+            if enemy.health <= 0:
+                any_dead = True
+                killer_id = hit_info.get("killer_owner_id")
+                killer = self.players.get(killer_id) if killer_id is not None else None
+                if killer is not None:
+                    killer.kill_count += 1
+                    self.kill_totals[killer_id] += 1
+                events.kills.append(KillEvent(killer_id, enemy.x, enemy.y))
+        if any_dead:
+            # Batched removal: one compaction instead of list.remove per dead enemy.
+            for enemy in self.enemies:
+                if enemy.health <= 0:
+                    self._forget_enemy(enemy)
+            self.enemies = [e for e in self.enemies if e.health > 0]
+        if prof is not None:
+            lap("enemy_collisions")
+
+        bullets.update(delta_time)
+        events.bullets_culled = bullets.remove_off_screen()
+        if self.max_bullets is not None and len(bullets) > self.max_bullets:
+            evicted = bullets.retire_oldest(len(bullets) - self.max_bullets)
+            events.bullets_evicted = evicted
+            self.bullets_evicted += evicted
+        if prof is not None:
+            lap("bullets")
+        return events
+
+    # ------------------------------------------------------------------ snapshots
+    def snapshot(self) -> dict[str, Any]:
+        """Complete world state as a JSON-serializable dict (see from_snapshot)."""
+        columns = self.bullets.columns()
+        return {
+            "tick_ms": self.tick_ms,
+            "tick_count": self.tick_count,
+            "current_time": self.current_time,
+            "respawn_dead_players": self.respawn_dead_players,
+            "swept_collisions": self.bullets.swept,
+            "fixed_point": self.fixed_point,
+            "max_enemies": self.max_enemies,
+            "max_bullets": self.max_bullets,
+            "world_width": self.world_width,
+            "world_height": self.world_height,
+            "spawn_interval_ms": list(self.spawn_interval_ms),
+            "spawns_skipped": self.spawns_skipped,
+            "bullets_evicted": self.bullets_evicted,
+            "last_enemy_spawn_time": self.last_enemy_spawn_time,
+            "next_spawn_interval": self.next_spawn_interval,
+            "next_enemy_key": self._next_enemy_key,
+            "rng": self.rng.get_state(),
+            # Lists of pairs: JSON would turn int dict keys into strings.
+            "players": [
+                [pid, {name: _plain(getattr(p, name)) for name in _PLAYER_FIELDS}]
+                for pid, p in self.players.items()
+            ],
+            "kill_totals": list(self.kill_totals.items()),
+            "damage_totals": list(self.damage_totals.items()),
+            "enemies": [{name: _plain(getattr(e, name)) for name in _ENEMY_FIELDS} for e in self.enemies],
+            "bullets": {name: col.tolist() for name, col in columns.items()},
+            "bullet_max_step": self.bullets._max_step,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snap: Mapping[str, Any]) -> "WorldSimulator":
+        """Rebuild a world from snapshot(); it steps exactly like the original from here on."""
+        world = cls(
+            tick_ms=snap["tick_ms"],
+            initial_enemies=0,
+            respawn_dead_players=snap["respawn_dead_players"],
+            swept_collisions=snap["swept_collisions"],
+            max_enemies=snap["max_enemies"],
+            max_bullets=snap["max_bullets"],
+            seed=0,
+            fixed_point=snap["fixed_point"],
+            world_width=snap["world_width"],
+            world_height=snap["world_height"],
+            spawn_interval_ms=snap["spawn_interval_ms"],
+        )
+        world._restore(
+            (snap["tick_count"], snap["current_time"], snap["spawns_skipped"], snap["bullets_evicted"],
+             snap["last_enemy_spawn_time"], snap["next_spawn_interval"], snap["next_enemy_key"]),
+            snap["rng"],
+            [(pid, tuple(fields[name] for name in _PLAYER_FIELDS)) for pid, fields in snap["players"]],
+            snap["kill_totals"],
+            snap["damage_totals"],
+            [tuple(fields[name] for name in _ENEMY_FIELDS) for fields in snap["enemies"]],
+            snap["bullets"],
+            snap["bullet_max_step"],
+        )
+        return world
+
+    def get_state(self) -> bytes:
+        """Everything that decides future ticks (entities, bullets, timers, RNG, counters and
+        settings) as a compact binary blob, cheap enough to take every tick. set_state()
+        rewinds this or another world to it, e.g. to branch an episode for lookahead.
+        The blob is a pickle: only load states you produced."""
+        get_player = attrgetter(*_PLAYER_FIELDS)
+        get_enemy = attrgetter(*_ENEMY_FIELDS)
+        columns = self.bullets.columns()
+        state = (
+            _STATE_VERSION,
+            (self.tick_ms, self.fixed_point, self.bullets.swept, self.respawn_dead_players,
+             self.max_enemies, self.max_bullets, self.world_width, self.world_height, self.spawn_interval_ms),
+            (self.tick_count, self.current_time, self.spawns_skipped, self.bullets_evicted,
+             self.last_enemy_spawn_time, self.next_spawn_interval, self._next_enemy_key),
+            self.rng.get_state(),
+            [(pid, get_player(p)) for pid, p in self.players.items()],
+            list(self.kill_totals.items()),
+            list(self.damage_totals.items()),
+            [get_enemy(e) for e in self.enemies],
+            len(self.bullets),
+            np.array([columns[name] for name in _BULLET_FLOAT_COLUMNS], dtype=np.float64).tobytes(),
+            np.array([columns[name] for name in _BULLET_INT_COLUMNS], dtype=np.int32).tobytes(),
+            self.bullets._max_step,
+        )
+        return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+    def set_state(self, blob: bytes) -> None:
+        """Restore a get_state() blob in place. Player objects are kept (and overwritten)
+        where the id still exists, so references like BulletHellEnv.player stay valid."""
+        state = pickle.loads(blob)
+        if state[0] != _STATE_VERSION:
+            raise ValueError(f"world state version {state[0]} is not supported (expected {_STATE_VERSION})")
+        (_, settings, counters, rng_state, players, kills, damage, enemies,
+         n_bullets, float_block, int_block, max_step) = state
+        floats = np.frombuffer(float_block, dtype=np.float64).reshape(len(_BULLET_FLOAT_COLUMNS), n_bullets)
+        ints = np.frombuffer(int_block, dtype=np.int32).reshape(len(_BULLET_INT_COLUMNS), n_bullets)
+        columns = dict(zip(_BULLET_FLOAT_COLUMNS, floats))
+        columns.update(zip(_BULLET_INT_COLUMNS, ints))
+        (self.tick_ms, self.fixed_point, swept, self.respawn_dead_players,
+         self.max_enemies, self.max_bullets, world_width, world_height, self.spawn_interval_ms) = settings
+        self.delta_time = self.tick_ms / 1000
+        if (world_width, world_height) != (self.world_width, self.world_height):
+            self.world_width = world_width
+            self.world_height = world_height
+            self.bullets = BulletPool(world_width=world_width, world_height=world_height)
+            self.enemy_controller.world_width = world_width
+            self.enemy_controller.world_height = world_height
+        self.bullets.swept = swept
+        self.bullets.fixed_point = self.fixed_point
+        self._restore(counters, rng_state, players, kills, damage, enemies, columns, max_step)
+
+    def _restore(self, counters, rng_state, players, kill_totals, damage_totals, enemies, columns, max_step) -> None:
+        """Replace the dynamic state and rebuild every timer from the entities' own fields."""
+        (self.tick_count, self.current_time, self.spawns_skipped, self.bullets_evicted,
+         self.last_enemy_spawn_time, self.next_spawn_interval, next_enemy_key) = counters
+        self.rng.set_state(rng_state)
+        self.spawn_timer = TimerScheduler()
+        self.player_shot_timers = TimerScheduler()
+        self.enemy_shot_timers = TimerScheduler()
+        self.enemy_action_timers = TimerScheduler()
+        self.spawn_timer.schedule(_SPAWN_TIMER, self.last_enemy_spawn_time, self.next_spawn_interval)
+
+        old_players = self.players
+        self.players = {}
+        for pid, values in players:
+            player = old_players.get(pid)
+            if player is None:
+                player = Player(0, 0, is_env=True)
+            player.__dict__.update(zip(_PLAYER_FIELDS, values))  # plain attributes, no properties
+            self.add_player(pid, player)
+        self.kill_totals = {pid: n for pid, n in kill_totals}
+        self.damage_totals = {pid: n for pid, n in damage_totals}
+
+        self.enemies = []
+        self._enemies_by_key = {}
+        for values in enemies:
+            enemy = Enemy(0, 0)
+            self._fit(enemy)
+            enemy.__dict__.update(zip(_ENEMY_FIELDS, values))
+            key = enemy.timer_key
+            self._enemies_by_key[key] = enemy
+            self.enemy_shot_timers.schedule(key, enemy.shoot_timer, enemy.shoot_timer_max)
+            self.enemy_action_timers.schedule(key, enemy.last_action_time, enemy.action_interval)
+            self.enemies.append(enemy)
+        self._next_enemy_key = next_enemy_key
+
+        self.bullets.load_columns(columns, max_step)
+
+    def state_checksum(self) -> int:
+        """CRC32 of everything that decides future ticks. Equal worlds give equal values,
+        so lockstep peers can compare one int instead of the whole state."""
+        head = np.array(
+            [self.tick_count, self.current_time, self.last_enemy_spawn_time, self.next_spawn_interval,
+             self._next_enemy_key, len(self.players), len(self.enemies), len(self.bullets)],
+            dtype=np.float64,
+        )
+        crc = zlib.crc32(head.tobytes())
+        players = np.array(
+            [(pid, p.x, p.y, p.health, p.aim_angle, p.shoot_timer, p.kill_count) for pid, p in self.players.items()],
+            dtype=np.float64,
+        )
+        crc = zlib.crc32(players.tobytes(), crc)
+        enemies = np.array(
+            [(e.timer_key, e.x, e.y, e.health, e.aim_angle, e.shoot_timer, e.last_action_time) for e in self.enemies],
+            dtype=np.float64,
+        )
+        crc = zlib.crc32(enemies.tobytes(), crc)
+        for col in self.bullets.columns().values():
+            crc = zlib.crc32(np.ascontiguousarray(col).tobytes(), crc)
+        rng = self.rng.get_state()
+        undrawn = rng["length"] - rng["pos"]
+        crc = zlib.crc32(repr((rng["bit_generator"]["state"], undrawn)).encode(), crc)
+        return crc
+
+
+__all__ = [
+    "FIXED_POINT_TICK_RATE",
+    "KillEvent",
+    "PlayerAction",
+    "TickEvents",
+    "WorldSimulator",
+]
@@ -0,0 +1,69 @@
+"""
+Metrics CSV schema changes: appending to a log written with an older header rotates it,
+and each process checks a log's header only once.
+
+  python -m pytest tests/test_actor_learner_metrics.py
+"""
+import csv
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.DQN import actor_learner_metrics
+from bullet_hell_rl.DQN.actor_learner_metrics import FIELDNAMES, log_metrics_record
+
+
+def _rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_appends_under_current_header(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.csv"
+    monkeypatch.setenv("RL_METRICS_LOG", str(path))
+    log_metrics_record("server", "tick_stats", {"tick": 1})
+    log_metrics_record("server", "tick_stats", {"tick": 2})
+    rows = _rows(path)
+    assert rows[0] == list(FIELDNAMES)
+    assert len(rows) == 3
+    assert list(tmp_path.glob("metrics.*.csv")) == []
+
+
+def test_old_header_is_rotated(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.csv"
+    monkeypatch.setenv("RL_METRICS_LOG", str(path))
+    old_header = list(FIELDNAMES[: FIELDNAMES.index("tick")])
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([old_header, ["1.0"] + [""] * (len(old_header) - 1)])
+
+    log_metrics_record("server", "tick_stats", {"tick": 7})
+
+    rows = _rows(path)
+    assert rows[0] == list(FIELDNAMES)
+    assert len(rows) == 2 and rows[1][FIELDNAMES.index("tick")] == "7"
+    (rotated,) = tmp_path.glob("metrics.*.csv")
+    assert _rows(rotated)[0] == old_header
+
+
+def test_header_checked_once_per_path(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.csv"
+    monkeypatch.setenv("RL_METRICS_LOG", str(path))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(FIELDNAMES)  # another process started this log
+    checks = []
+    real = actor_learner_metrics._header_matches
+    monkeypatch.setattr(actor_learner_metrics, "_header_matches", lambda p: checks.append(p) or real(p))
+
+    for tick in range(5):
+        log_metrics_record("server", "tick_stats", {"tick": tick})
+    assert checks == [str(path)]
+
+    # a log this process starts itself is never reread
+    other = tmp_path / "other.csv"
+    monkeypatch.setenv("RL_METRICS_LOG", str(other))
+    for tick in range(3):
+        log_metrics_record("server", "tick_stats", {"tick": tick})
+    assert checks == [str(path)]
+    assert len(_rows(path)) == 6 and len(_rows(other)) == 4
@@ -0,0 +1,176 @@
+"""
+BulletHellAsyncVecEnv: worker slices step exactly like in-process envs, reset_mask and
+auto-reset reach the right rows, and a failed worker still closes cleanly.
+
+  python -m pytest tests/test_async_vec_env.py
+"""
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellAsyncVecEnv import INFO_KEYS, BulletHellAsyncVecEnv, _worker_seed
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+from bullet_hell_rl.envs.BulletHellVecEnv import BulletHellVecEnv, flatten_observation
+
+NUM_ENVS = 6
+NUM_WORKERS = 2
+SEED = 7
+MAX_STEPS = 40  # short episodes, so every slice auto-resets
+
+
+def _actions(rng, n=NUM_ENVS):
+    return {
+        "move": rng.integers(0, 5, size=n),
+        "fire_angle": rng.integers(0, 271, size=(n, 1)).astype(np.int16),
+    }
+
+
+class _InProcess:
+    """What the workers run, in this process: one BulletHellVecEnv per slice."""
+
+    def __init__(self, slices, **env_kwargs):
+        self.slices = slices
+        self.envs = [
+            BulletHellVecEnv(num_envs=rows.stop - rows.start, seed=_worker_seed(SEED, index), **env_kwargs)
+            for index, rows in enumerate(slices)
+        ]
+
+    def reset(self, seed=None, mask=None):
+        obs = []
+        for index, (rows, env) in enumerate(zip(self.slices, self.envs)):
+            options = None if mask is None else {"reset_mask": mask[rows]}
+            obs.append(env.reset(seed=None if seed is None else _worker_seed(seed, index), options=options)[0])
+        return np.concatenate(obs)
+
+    def step(self, actions):
+        results = [
+            env.step({"move": actions["move"][rows], "fire_angle": actions["fire_angle"][rows]})
+            for rows, env in zip(self.slices, self.envs)
+        ]
+        obs, rewards, terminations, truncations = (np.concatenate(parts) for parts in zip(*(r[:4] for r in results)))
+        infos = {key: np.concatenate([r[4][key] for r in results]) for key in INFO_KEYS}
+        return obs, rewards, terminations, truncations, infos
+
+
+@pytest.fixture
+def async_env():
+    env = BulletHellAsyncVecEnv(NUM_ENVS, num_workers=NUM_WORKERS, pin_workers=False, seed=SEED, max_steps=MAX_STEPS)
+    yield env
+    env.close()
+
+
+def test_matches_in_process_slices(async_env):
+    local = _InProcess(async_env._slices, max_steps=MAX_STEPS)
+    np.testing.assert_array_equal(async_env.reset(seed=SEED)[0], local.reset(seed=SEED))
+    rng = np.random.default_rng(0)
+    ended = np.zeros(NUM_ENVS, dtype=bool)
+    resets = np.zeros(NUM_ENVS, dtype=np.int64)
+    for step in range(3 * MAX_STEPS):
+        actions = _actions(rng)
+        got = async_env.step(actions)
+        want = local.step(actions)
+        for name, a, b in zip(("obs", "rewards", "terminations", "truncations"), got, want):
+            np.testing.assert_array_equal(a, b, err_msg=f"{name}, step {step}")
+        for key in INFO_KEYS:
+            np.testing.assert_array_equal(got[4][key], want[4][key], err_msg=f"{key}, step {step}")
+        resets += ended
+        ended = got[2] | got[3]
+    # every env of every slice went through at least one auto-reset
+    assert (resets > 0).all()
+
+    mask = np.zeros(NUM_ENVS, dtype=bool)
+    mask[[0, NUM_ENVS - 1]] = True  # one row in each slice
+    before = async_env.step(_actions(rng))[0]
+    obs, _ = async_env.reset(options={"reset_mask": mask})
+    np.testing.assert_array_equal(obs[~mask], before[~mask])
+    assert not np.array_equal(obs[mask], before[mask])
+
+
+def test_reset_mask_matches_in_process(async_env):
+    local = _InProcess(async_env._slices, max_steps=MAX_STEPS)
+    async_env.reset(seed=SEED)
+    local.reset(seed=SEED)
+    rng = np.random.default_rng(1)
+    mask = np.array([True, False, False, False, True, False])
+    for step in range(30):
+        actions = _actions(rng)
+        async_env.step(actions)
+        local.step(actions)
+        if step % 10 == 9:
+            np.testing.assert_array_equal(async_env.reset(options={"reset_mask": mask})[0], local.reset(mask=mask))
+            mask = np.roll(mask, 1)
+
+
+def test_exact_workers_match_single_envs():
+    env = BulletHellAsyncVecEnv(NUM_ENVS, num_workers=NUM_WORKERS, batched=False, pin_workers=False, max_steps=MAX_STEPS)
+    try:
+        singles = [BulletHellEnv(render_mode=None) for _ in range(NUM_ENVS)]
+        for single in singles:
+            single.max_steps = MAX_STEPS
+        obs, _ = env.reset(seed=SEED)
+        for i, single in enumerate(singles):
+            np.testing.assert_array_equal(obs[i], flatten_observation(single.reset(seed=SEED + i)[0]))
+        rng = np.random.default_rng(2)
+        ended = [False] * NUM_ENVS
+        for step in range(2 * MAX_STEPS):
+            actions = _actions(rng)
+            obs, rewards, terminations, truncations, _ = env.step(actions)
+            for i, single in enumerate(singles):
+                if ended[i]:
+                    want = (single.reset()[0], 0, False, False)
+                else:
+                    want = single.step({"move": int(actions["move"][i]), "fire_angle": actions["fire_angle"][i]})[:4]
+                ended[i] = want[2] or want[3]
+                np.testing.assert_array_equal(obs[i], flatten_observation(want[0]), err_msg=f"env {i}, step {step}")
+                assert (rewards[i], terminations[i], truncations[i]) == tuple(want[1:]), f"env {i}, step {step}"
+    finally:
+        env.close()
+
+
+def _assert_freed(name):
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_worker_error_then_close():
+    env = BulletHellAsyncVecEnv(NUM_ENVS, num_workers=NUM_WORKERS, pin_workers=False)
+    name = env._shm.name
+    env.reset(seed=SEED)
+    bad = _actions(np.random.default_rng(0))
+    bad["move"][0] = 99  # no such move: worker 0 raises IndexError
+    with pytest.raises(RuntimeError, match="worker 0 failed"):
+        env.step(bad)
+    with pytest.raises(RuntimeError):
+        env.step(_actions(np.random.default_rng(0)))
+    env.close()
+    env.close()
+    _assert_freed(name)
+
+
+def test_close_with_failed_step_pending():
+    env = BulletHellAsyncVecEnv(NUM_ENVS, num_workers=NUM_WORKERS, pin_workers=False)
+    name = env._shm.name
+    env.reset(seed=SEED)
+    bad = _actions(np.random.default_rng(0))
+    bad["move"][:] = 99
+    env.step_async(bad)
+    env.close()
+    _assert_freed(name)
+
+
+def test_killed_worker_then_close():
+    env = BulletHellAsyncVecEnv(NUM_ENVS, num_workers=NUM_WORKERS, pin_workers=False)
+    name = env._shm.name
+    env.reset(seed=SEED)
+    env._processes[1].kill()
+    env._processes[1].join()
+    with pytest.raises(RuntimeError, match="worker 1 failed"):
+        env.step(_actions(np.random.default_rng(0)))
+    env.close()
+    _assert_freed(name)
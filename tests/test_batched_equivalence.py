@@ -0,0 +1,172 @@
+"""
+Differential check of the batched engine: BulletHellVecEnv (bullet_hell_rl.batched) against
+one BulletHellEnv (WorldSimulator) per world.
+
+The two engines normally draw from different random streams. Here batched world i and env
+i each get a RandomStream seeded with SEEDS[i], the batched side through the draw methods
+of BatchedWorlds, so both replay the same game. Every step feeds the same random actions
+to both and compares rewards, terminations, truncations, health, kills, enemy and bullet
+counts and the observation, across episode ends (next-step auto-reset on the vector side,
+reset() on the single side). The enemy-vs-bullet grid broadphase is also checked directly
+against the full broadcast box test.
+
+  python -m pytest tests/test_batched_equivalence.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.batched import BatchedWorlds
+from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+from bullet_hell_rl.envs.BulletHellVecEnv import BulletHellVecEnv, flatten_observation
+from bullet_hell_rl.bullethell import ENTITY_SIZE, WORLD_HEIGHT, WORLD_WIDTH
+from bullet_hell_rl.rng import RandomStream
+from bullet_hell_rl.world import WorldSimulator
+
+SEEDS = (0, 1, 2, 3)
+STEPS = 1000
+MAX_STEPS = 150  # short episodes, so truncation and auto-reset are exercised too
+
+
+class _StreamedWorlds(BatchedWorlds):
+    """BatchedWorlds drawing world i's randomness from streams[i], call for call as
+    WorldSimulator draws from its RandomStream."""
+
+    def __init__(self, streams, **kwargs):
+        self.streams = streams
+        super().__init__(len(streams), **kwargs)
+
+    def _random_positions(self, worlds):
+        xy = [
+            (self.streams[w].randint(0, self.world_width - ENTITY_SIZE),
+             self.streams[w].randint(0, self.world_height - ENTITY_SIZE))
+            for w in worlds.tolist()
+        ]
+        xy = np.array(xy, dtype=np.int64).reshape(-1, 2)
+        return xy[:, 0], xy[:, 1]
+
+    def _next_intervals(self, worlds):
+        return np.array([self.streams[w].randint(*self.spawn_interval_ms) for w in worlds.tolist()], dtype=np.float64)
+
+    def _enemy_moves(self, w, e):
+        # WorldSimulator rolls a world's due enemies in spawn order, in one choices() call
+        moves = np.empty(len(w), dtype=np.int64)
+        order = np.lexsort((self.enemy_seq[w, e], w))
+        for world in np.unique(w).tolist():
+            rows = order[w[order] == world]
+            moves[rows] = self.streams[world].choices(range(4), k=len(rows))
+        return moves
+
+
+def _streamed_env(seed, **env_kwargs):
+    """BulletHellEnv whose worlds all draw from one RandomStream(seed), continued across resets."""
+    env = BulletHellEnv(render_mode=None, **env_kwargs)
+    stream = RandomStream(seed)
+
+    def new_world(_seed):
+        return WorldSimulator(
+            tick_ms=env.tick_ms,
+            player_ids=(PLAYER_ID,),
+            initial_enemies=3,
+            max_enemies=env.max_enemies,
+            max_bullets=env.max_bullets,
+            seed=stream,
+            world_width=env.world_width,
+            world_height=env.world_height,
+        )
+
+    env._new_world = new_world
+    env.max_steps = MAX_STEPS
+    return env
+
+
+@pytest.mark.parametrize(
+    "env_kwargs",
+    [{}, {"frame_skip": 4}, {"max_enemies": 4, "max_bullets": 6}],
+    ids=["default", "frame_skip", "caps"],
+)
+def test_batched_matches_single_env(env_kwargs):
+    vec = BulletHellVecEnv(num_envs=len(SEEDS), max_steps=MAX_STEPS, **env_kwargs)
+    vec.worlds = worlds = _StreamedWorlds(
+        [RandomStream(seed) for seed in SEEDS],
+        tick_ms=vec.worlds.tick_ms,
+        max_enemies=vec.worlds.max_enemies,
+        max_bullets=vec.worlds.max_bullets,
+    )
+    worlds.streams = [RandomStream(seed) for seed in SEEDS]  # construction already drew a reset
+    envs = [_streamed_env(seed, **env_kwargs) for seed in SEEDS]
+
+    vec_obs, _ = vec.reset()
+    for i, env in enumerate(envs):
+        obs, _ = env.reset()
+        np.testing.assert_allclose(vec_obs[i], flatten_observation(obs), atol=1e-6)
+
+    actions = np.random.default_rng(0)
+    ended = [False] * len(SEEDS)
+    episodes = 0
+    for step in range(STEPS):
+        move = actions.integers(0, 5, size=len(SEEDS))
+        angle = actions.integers(0, 271, size=len(SEEDS)).astype(np.int16)
+        vec_obs, rewards, terminations, truncations, _ = vec.step({"move": move, "fire_angle": angle[:, None]})
+        for i, env in enumerate(envs):
+            where = f"world {i} (seed {SEEDS[i]}), step {step}"
+            if ended[i]:
+                # next-step auto-reset: the action is ignored and the first observation returned
+                obs, _ = env.reset()
+                reward, terminated, truncated = 0, False, False
+                episodes += 1
+            else:
+                obs, reward, terminated, truncated, _ = env.step(
+                    {"move": int(move[i]), "fire_angle": np.array([angle[i]], dtype=np.int16)}
+                )
+            ended[i] = terminated or truncated
+            assert rewards[i] == reward, where
+            assert (terminations[i], truncations[i]) == (terminated, truncated), where
+            assert worlds.health[i] == env.player.health, where
+            assert worlds.kill_totals[i] == env.world.kill_totals[PLAYER_ID], where
+            assert worlds.enemy_counts()[i] == len(env.world.enemies), where
+            assert worlds.bullet_counts()[i] == len(env.world.bullets), where
+            assert worlds.spawns_skipped[i] == env.world.spawns_skipped, where
+            assert worlds.bullets_evicted[i] == env.world.bullets_evicted, where
+            np.testing.assert_allclose(vec_obs[i], flatten_observation(obs), atol=1e-6, err_msg=where)
+    assert episodes > 0  # the comparison crossed episode boundaries
+
+
+@pytest.mark.parametrize("size", [(WORLD_WIDTH, WORLD_HEIGHT), (250, 170)], ids=["default", "small"])
+def test_enemy_candidates_match_broadcast(size):
+    """The grid broadphase finds exactly the (world, enemy, bullet) box overlaps of the
+    full broadcast, on crowded random layouts with short and long bullet paths."""
+    width, height = size
+    rng = np.random.default_rng(0)
+    n, e, b = 6, 40, 120
+    worlds = BatchedWorlds(n, world_width=width, world_height=height, enemy_capacity=e, bullet_capacity=b)
+    worlds.enemy_rect_x = rng.integers(0, width - ENTITY_SIZE + 1, size=(n, e))
+    worlds.enemy_rect_y = rng.integers(0, height - ENTITY_SIZE + 1, size=(n, e))
+    worlds.bullet_rect_x = rng.integers(0, width + 1, size=(n, b))
+    worlds.bullet_rect_y = rng.integers(0, height + 1, size=(n, b))
+    reach = np.where(rng.random((n, b)) < 0.1, 300, 30)  # a few bullets jumped far this tick
+    worlds.bullet_prev_x = worlds.bullet_rect_x + rng.integers(-reach, reach + 1)
+    worlds.bullet_prev_y = worlds.bullet_rect_y + rng.integers(-reach, reach + 1)
+    enemies = rng.random((n, e)) < 0.7
+    bullets = rng.random((n, b)) < 0.5
+    enemies[1] = False  # a world without enemies
+    bullets[2] = False  # and one without bullets
+    path = worlds._path_boxes()
+
+    x0, y0, x1, y1 = (a[:, None, :] for a in path)
+    rx = worlds.enemy_rect_x[:, :, None]
+    ry = worlds.enemy_rect_y[:, :, None]
+    broadcast = (
+        enemies[:, :, None] & bullets[:, None, :]
+        & (x0 < rx + ENTITY_SIZE) & (rx < x1) & (y0 < ry + ENTITY_SIZE) & (ry < y1)
+    )
+    want = set(zip(*(i.tolist() for i in np.nonzero(broadcast))))
+    got = list(zip(*(i.tolist() for i in worlds._enemy_candidates(enemies, bullets, path))))
+    assert len(want) > 20
+    assert len(got) == len(set(got))  # no pair twice
+    assert set(got) == want
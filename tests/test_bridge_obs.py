@@ -0,0 +1,60 @@
+"""
+obs_mode="bridge" / reward_mode="bridge": every step's observation and reward equal what
+a networked actor computes from the server's MSG_UPDATE of the same world. That is
+build_obs_from_update (build_obs_from_arrays) and compute_reward_and_done
+(additive_reward) on build_update's payload, with an ally in the world and across damage
+and kills.
+
+  python -m pytest tests/test_bridge_obs.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import Player
+from bullet_hell_rl.DQN.actor_learner_rl_bridge import build_obs_from_update, compute_reward_and_done
+from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+from bullet_hell_rl.net.state import build_update, bullet_states, enemy_state
+
+ALLY_ID = PLAYER_ID + 1
+
+
+def _update(world):
+    """The MSG_UPDATE run_server would send the env's player for this world."""
+    return build_update(
+        PLAYER_ID,
+        list(world.players.items()),
+        [enemy_state(e) for e in world.enemies],
+        bullet_states(world.bullets),
+        world.tick_count,
+    )
+
+
+def test_bridge_matches_actor_features():
+    env = BulletHellEnv(render_mode=None, flat=True, obs_mode="bridge", reward_mode="bridge")
+    env.max_steps = 10**6
+    rng = np.random.default_rng(0)
+    rewards = []
+    for seed in range(3):
+        obs, _ = env.reset(seed=seed)
+        np.testing.assert_array_equal(obs, build_obs_from_update(_update(env.world)))
+        # an ally standing next to the player: allies rows and the ally reward term
+        player = env.player
+        env.world.add_player(ALLY_ID, Player(player.x + 15, player.y, is_env=True))
+        previous = _update(env.world)
+        terminated = False
+        while not terminated:
+            obs, reward, terminated, truncated, _ = env.step(int(rng.integers(env.action_space.n)))
+            update = _update(env.world)
+            where = f"seed {seed}, tick {env.world.tick_count}"
+            np.testing.assert_array_equal(obs, build_obs_from_update(update), err_msg=where)
+            assert reward == compute_reward_and_done(previous, update, 1)[0], where
+            rewards.append(reward)
+            previous = update
+    rewards = np.array(rewards)
+    assert (rewards <= -1000).any()  # damage taken
+    assert (rewards >= 100).any()  # kills
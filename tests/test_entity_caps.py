@@ -0,0 +1,74 @@
+"""
+Entity caps: with max_enemies the live enemy count never exceeds the cap, in
+WorldSimulator and BatchedWorlds, while the skipped spawns are counted. With
+max_bullets, BulletPool.retire_oldest frees exactly the earliest-spawned live bullets
+(lowest seq).
+
+  python -m pytest tests/test_entity_caps.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.batched import BatchedWorlds
+from bullet_hell_rl.bullethell import BulletPool
+from bullet_hell_rl.net.input_sync import world_actions
+from bullet_hell_rl.net.protocol import FLAT_ACTION_COUNT
+from bullet_hell_rl.world import WorldSimulator
+
+FAST_SPAWNS = (30, 60)  # ms between spawns, so the cap is reached within a few ticks
+
+
+@pytest.mark.parametrize("max_enemies", [0, 1, 4])
+def test_world_never_exceeds_max_enemies(max_enemies):
+    world = WorldSimulator(
+        player_ids=(0, 1),
+        initial_enemies=6,
+        respawn_dead_players=True,
+        max_enemies=max_enemies,
+        max_bullets=5,
+        spawn_interval_ms=FAST_SPAWNS,
+        seed=0,
+    )
+    assert len(world.enemies) == max_enemies  # initial_enemies is capped too
+    rng = np.random.default_rng(0)
+    for tick in range(600):
+        world.step(world_actions({pid: int(rng.integers(FLAT_ACTION_COUNT)) for pid in world.players}))
+        assert len(world.enemies) <= max_enemies, f"tick {tick}"
+        assert len(world.bullets) <= 5, f"tick {tick}"
+    assert world.spawns_skipped > 0
+    assert world.bullets_evicted > 0
+
+
+def test_batched_never_exceeds_max_enemies():
+    worlds = BatchedWorlds(8, initial_enemies=6, max_enemies=3, max_bullets=20, spawn_interval_ms=FAST_SPAWNS, seed=0)
+    rng = np.random.default_rng(0)
+    for tick in range(600):
+        worlds.step(rng.integers(0, 5, size=8), rng.uniform(0, 270, size=8))
+        assert (worlds.enemy_counts() <= 3).all(), f"tick {tick}"
+        assert (worlds.bullet_counts() <= 20).all(), f"tick {tick}"
+    assert (worlds.spawns_skipped > 0).all()
+
+
+def test_retire_oldest_evicts_lowest_seq():
+    rng = np.random.default_rng(0)
+    pool = BulletPool(capacity=4)
+    for _ in range(50):
+        pool.spawn(*rng.uniform(0, 500, size=2), rng.uniform(0, 360), 10, bool(rng.random() < 0.5))
+    # free some slots and refill them, so spawn order and slot order disagree
+    pool.remove_many([pool._views[s] for s in rng.choice(pool.live_slots(), size=15, replace=False)])
+    for _ in range(10):
+        pool.spawn(*rng.uniform(0, 500, size=2), rng.uniform(0, 360), 10, True)
+    assert not np.array_equal(pool.live_slots(), pool.live_slots(ordered=False))
+
+    seqs = pool.seq[pool.live_slots()]
+    assert pool.retire_oldest(12) == 12
+    np.testing.assert_array_equal(pool.seq[pool.live_slots()], seqs[12:])
+    assert pool.retire_oldest(0) == 0
+    assert pool.retire_oldest(len(pool) + 5) == len(seqs) - 12
+    assert len(pool) == 0
@@ -0,0 +1,53 @@
+"""
+frame_skip: one step of BulletHellEnv(frame_skip=k) plays exactly k single-tick steps with
+the action held. The rewards are summed and the observation is the last tick's. The step
+ends early, with info["frames"] < k, on the tick the player dies.
+
+  python -m pytest tests/test_frame_skip.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+SEEDS = range(6)
+
+
+def _env(frame_skip):
+    env = BulletHellEnv(render_mode=None, flat=True, frame_skip=frame_skip)
+    env.max_steps = 10**6  # play until the player dies
+    return env
+
+
+@pytest.mark.parametrize("k", [2, 3])
+def test_frame_skip_equals_k_single_steps(k):
+    skipping, single = _env(k), _env(1)
+    early = 0
+    for seed in SEEDS:
+        obs, _ = skipping.reset(seed=seed)
+        np.testing.assert_array_equal(obs, single.reset(seed=seed)[0])
+        rng = np.random.default_rng(seed)
+        terminated = False
+        while not terminated:
+            action = int(rng.integers(skipping.action_space.n))
+            obs, reward, terminated, truncated, info = skipping.step(action)
+            want_reward, ticks = 0, 0
+            for _ in range(k):
+                want_obs, r, want_terminated, *_ = single.step(action)
+                want_reward += r
+                ticks += 1
+                if want_terminated:
+                    break
+            where = f"seed {seed}, tick {single.world.tick_count}"
+            assert info["frames"] == ticks, where
+            assert (reward, terminated, truncated) == (want_reward, want_terminated, False), where
+            np.testing.assert_array_equal(obs, want_obs, err_msg=where)
+            assert skipping.world.tick_count == single.world.tick_count
+        early += info["frames"] < k
+    assert early > 0  # some player died mid-step
@@ -0,0 +1,143 @@
+"""
+Frame stacking: FrameStack / VecFrameStack return exactly np.stack of the last k raw
+observations (the episode's first repeated before it has k), across ring wraps, resets
+and partial auto-resets, and FrameStackReplay samples rebuild the stacks that went in.
+
+  python -m pytest tests/test_frame_stack.py
+"""
+import sys
+from pathlib import Path
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import VectorWrapper
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.DQN.frame_replay import FrameStackReplay
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+from bullet_hell_rl.envs.BulletHellVecEnv import BulletHellVecEnv
+from bullet_hell_rl.envs.FrameStack import FrameStack, VecFrameStack
+
+K = 3
+
+
+class _Recorder(gym.Wrapper):
+    """Keeps a copy of every raw observation, per episode."""
+
+    def reset(self, **kwargs):
+        obs, info = self.env.reset(**kwargs)
+        self.episode = [obs.copy()]
+        return obs, info
+
+    def step(self, action):
+        obs, *rest = self.env.step(action)
+        self.episode.append(obs.copy())
+        return (obs, *rest)
+
+
+class _VecRecorder(VectorWrapper):
+    """Per env, copies of the raw observations of its current episode (next-step auto-reset)."""
+
+    def reset(self, *, seed=None, options=None):
+        obs, info = self.env.reset(seed=seed, options=options)
+        mask = None if options is None else options.get("reset_mask")
+        if mask is None:
+            self.episodes = [[row.copy()] for row in obs]
+            self.ended = np.zeros(self.num_envs, dtype=bool)
+        else:
+            for i in np.flatnonzero(mask):
+                self.episodes[i] = [obs[i].copy()]
+                self.ended[i] = False
+        return obs, info
+
+    def step(self, actions):
+        obs, rewards, terminations, truncations, infos = self.env.step(actions)
+        for i, row in enumerate(obs):
+            if self.ended[i]:
+                self.episodes[i] = [row.copy()]
+            else:
+                self.episodes[i].append(row.copy())
+        self.ended = terminations | truncations
+        return obs, rewards, terminations, truncations, infos
+
+
+def _expected(episode, k=K):
+    frames = episode[-k:]
+    return np.stack([episode[0]] * (k - len(frames)) + frames)
+
+
+def test_frame_stack_matches_last_k_frames():
+    recorder = _Recorder(BulletHellEnv(render_mode=None, flat=True, reuse_obs=True))
+    recorder.unwrapped.max_steps = 30
+    env = FrameStack(recorder, k=K)
+    rng = np.random.default_rng(0)
+    stack, _ = env.reset(seed=0)
+    np.testing.assert_array_equal(stack, _expected(recorder.episode))
+    resets = 0
+    for step in range(200):  # many ring wraps (2k slots)
+        stack, _, terminated, truncated, _ = env.step(int(rng.integers(env.action_space.n)))
+        assert stack.shape == (K, *recorder.observation_space.shape)
+        np.testing.assert_array_equal(stack, _expected(recorder.episode), err_msg=f"step {step}")
+        if terminated or truncated or step == 7:  # step 7: reset mid-episode, before k frames wrap
+            stack, _ = env.reset()
+            resets += 1
+            np.testing.assert_array_equal(stack, _expected(recorder.episode), err_msg=f"reset after {step}")
+    assert resets > 2
+
+
+def test_vec_frame_stack_partial_autoreset():
+    n = 4
+    recorder = _VecRecorder(BulletHellVecEnv(num_envs=n, max_steps=25, seed=1))
+    env = VecFrameStack(recorder, k=K)
+    rng = np.random.default_rng(1)
+    stacks, _ = env.reset(seed=1)
+    autoresets = 0
+    for step in range(120):
+        if step == 10:
+            # desynchronise the episodes, so later auto-resets hit only some envs
+            stacks, _ = env.reset(options={"reset_mask": np.array([True, False, True, False])})
+            for i in range(n):
+                np.testing.assert_array_equal(stacks[i], _expected(recorder.episodes[i]), err_msg=f"mask, env {i}")
+        partial = recorder.ended.any() and not recorder.ended.all()
+        autoresets += partial
+        actions = {"move": rng.integers(0, 5, size=n), "fire_angle": rng.integers(0, 271, size=(n, 1))}
+        stacks, *_ = env.step(actions)
+        for i in range(n):
+            np.testing.assert_array_equal(stacks[i], _expected(recorder.episodes[i]), err_msg=f"step {step}, env {i}")
+    assert autoresets > 0
+
+
+def test_replay_samples_rebuild_stacks():
+    recorder = _Recorder(BulletHellEnv(render_mode=None, flat=True, reuse_obs=True))
+    recorder.unwrapped.max_steps = 20  # several episode boundaries inside the replay
+    env = FrameStack(recorder, k=K)
+    capacity = 60
+    replay = FrameStackReplay(capacity, env.observation_space.shape[1:], k=K)
+    rng = np.random.default_rng(2)
+    truth = []  # per transition: state stack, reward, next stack, done
+
+    stack, _ = env.reset(seed=2)
+    replay.start_episode(stack[-1])
+    for t in range(250):  # wraps the transition and frame rings several times
+        state = stack.copy()
+        stack, reward, terminated, truncated, _ = env.step(int(rng.integers(env.action_space.n)))
+        done = terminated or truncated
+        # the action is the transition's index, so a sample tells which transition it is
+        replay.add(t, reward, stack[-1], terminated)
+        truth.append((state, reward, stack.copy(), terminated))
+        if done:
+            stack, _ = env.reset()
+            replay.start_episode(stack[-1])
+
+    states, ids, rewards, next_states, dones = replay.sample(4000, np.random.default_rng(3))
+    assert len(set(ids.tolist())) > capacity * 3 // 4
+    assert ids.min() >= len(truth) - capacity  # only transitions still in the ring
+    for b, t in enumerate(ids.tolist()):
+        state, reward, next_state, done = truth[t]
+        np.testing.assert_array_equal(states[b], state, err_msg=f"transition {t}")
+        np.testing.assert_array_equal(next_states[b], next_state, err_msg=f"transition {t}")
+        assert (rewards[b], dones[b]) == (reward, done)
+    # sampled stacks include episode starts, where the first frame is repeated
+    assert any(np.array_equal(states[b][0], states[b][1]) for b in range(len(ids)))
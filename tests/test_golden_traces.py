@@ -0,0 +1,24 @@
+"""
+Golden traces as a pytest check: every trace in golden_traces/ is recorded again with the
+reference engine (golden.record_trace) and must match the stored one.
+
+  python -m pytest tests/test_golden_traces.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.golden import BASELINE_TRACES, GOLDEN_TRACES, compare_traces, load_trace, record_trace
+
+TRACE_DIR = Path(__file__).resolve().parent.parent / "golden_traces"
+
+
+@pytest.mark.parametrize("name", [*GOLDEN_TRACES, *BASELINE_TRACES])
+def test_golden_trace(name):
+    stored = load_trace(TRACE_DIR / f"{name}.json.gz")
+    divergence = compare_traces(stored, record_trace(name))
+    assert divergence is None, str(divergence)
@@ -0,0 +1,83 @@
+"""
+Occupancy grid: build_grid_from_arrays' single bincount equals a naive count, cell by
+cell and channel by channel. The layouts include entities on cell edges, outside the
+window and empty groups. BulletHellEnv(obs_mode="grid") returns the grid
+build_grid_from_update makes from the server's MSG_UPDATE of the same world.
+
+  python -m pytest tests/test_grid_obs.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.DQN.actor_learner_rl_bridge import (
+    GRID_CHANNELS,
+    GRID_RADIUS,
+    GRID_SIZE,
+    build_grid_from_arrays,
+    build_grid_from_update,
+)
+from bullet_hell_rl.envs.BulletHellEnv import PLAYER_ID, BulletHellEnv
+from bullet_hell_rl.net.state import build_update, bullet_states, enemy_state
+
+CELL = 2 * GRID_RADIUS / GRID_SIZE
+
+
+def _naive_grid(px, py, groups):
+    grid = np.zeros((GRID_CHANNELS, GRID_SIZE, GRID_SIZE), dtype=np.float32)
+    left, top = px - GRID_RADIUS, py - GRID_RADIUS
+    for channel, rows in enumerate(groups):
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                x0, y0 = left + c * CELL, top + r * CELL
+                grid[channel, r, c] = sum(
+                    1 for x, y in rows[:, :2] if x0 <= x < x0 + CELL and y0 <= y < y0 + CELL
+                )
+    return grid
+
+
+def _rows(rng, n, px, py):
+    """n rows around (px, py): a third of them exactly on cell edges, some outside."""
+    xy = rng.uniform(-1.5 * GRID_RADIUS, 1.5 * GRID_RADIUS, size=(n, 2)) + (px, py)
+    edges = rng.integers(-2, GRID_SIZE + 3, size=(n, 2)) * CELL + (px - GRID_RADIUS, py - GRID_RADIUS)
+    on_edge = rng.random(n) < 1 / 3
+    xy[on_edge] = edges[on_edge]
+    return np.column_stack([xy, rng.uniform(-1, 1, size=(n, 2))])
+
+
+@pytest.mark.parametrize("counts", [(300, 12, 2), (0, 5, 0), (40, 0, 3), (0, 0, 0)])
+def test_grid_matches_naive_count(counts):
+    rng = np.random.default_rng(sum(counts))
+    px, py = 400.0, 250.0
+    bullets, enemies, allies = (_rows(rng, n, px, py) for n in counts)
+    got = build_grid_from_arrays((px, py), bullets, allies, enemies)
+    want = _naive_grid(px, py, (bullets, enemies, allies))
+    assert got.dtype == np.float32 and got.shape == (GRID_CHANNELS, GRID_SIZE, GRID_SIZE)
+    np.testing.assert_array_equal(got, want)
+    out = np.full_like(want, 7.0)
+    assert build_grid_from_arrays((px, py), bullets, allies, enemies, out=out) is out
+    np.testing.assert_array_equal(out, want)
+
+
+def test_env_grid_matches_update():
+    env = BulletHellEnv(render_mode=None, flat=True, obs_mode="grid")
+    obs, _ = env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    occupied = 0
+    for _ in range(200):
+        obs, _, terminated, truncated, _ = env.step(int(rng.integers(env.action_space.n)))
+        world = env.world
+        update = build_update(
+            PLAYER_ID, list(world.players.items()), [enemy_state(e) for e in world.enemies],
+            bullet_states(world.bullets), world.tick_count,
+        )
+        np.testing.assert_array_equal(obs, build_grid_from_update(update))
+        occupied += int(obs[0].sum() > 0)
+        if terminated or truncated:
+            env.reset()
+    assert occupied > 0  # hostile bullets showed up in the window
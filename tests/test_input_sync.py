@@ -0,0 +1,136 @@
+"""
+Input-sync networking without sockets: a server-side fixed-point world steps the way
+run_server(input_sync=True) does, and an InputSyncReplica fed its MSG_INPUTS (through a
+JSON round trip, as on the wire) stays checksum-equal; a skipped or altered tick ends in
+MSG_DESYNC and a snapshot recovers.
+
+  python -m pytest tests/test_input_sync.py
+"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import Player
+from bullet_hell_rl.net.input_sync import (
+    CHECKSUM_INTERVAL,
+    InputSyncReplica,
+    inputs_message,
+    join_entry,
+    snapshot_message,
+    world_actions,
+)
+from bullet_hell_rl.net.protocol import FLAT_ACTION_COUNT, MSG_DESYNC
+from bullet_hell_rl.world import FIXED_POINT_TICK_RATE, WorldSimulator
+
+CLIENT_ID = 0
+
+
+def _wire(msg):
+    return json.loads(json.dumps(msg))
+
+
+class _Server:
+    """run_server's input-sync tick without sockets: leaves, joins, step, MSG_INPUTS."""
+
+    def __init__(self, seed=0, initial_enemies=12):
+        self.world = WorldSimulator(
+            tick_ms=1000 / FIXED_POINT_TICK_RATE,
+            initial_enemies=initial_enemies,
+            respawn_dead_players=True,
+            seed=seed,
+            fixed_point=True,
+        )
+        self.rng = np.random.default_rng(seed)
+        self.respawns = 0
+
+    def tick(self, joins=(), leaves=()):
+        world = self.world
+        for pid in leaves:
+            world.remove_player(pid)
+        joined = []
+        for pid in joins:
+            # positions come from the accept loop's own stream, not the world's
+            x, y = (int(v) for v in self.rng.integers(0, 900, size=2))
+            joined.append(join_entry(pid, world.add_player(pid, Player(x, y, is_env=True))))
+        flat_actions = {pid: int(self.rng.integers(FLAT_ACTION_COUNT)) for pid in world.players}
+        events = world.step(world_actions(flat_actions))
+        self.respawns += len(events.respawns)
+        return _wire(inputs_message(world, joined, leaves, flat_actions))
+
+    def snapshot(self):
+        return _wire(snapshot_message(self.world))
+
+
+def _in_sync(server, replica):
+    return replica.world.state_checksum() == server.world.state_checksum()
+
+
+def _started(seed=0):
+    server = _Server(seed)
+    server.tick(joins=[CLIENT_ID, 1])
+    replica = InputSyncReplica(CLIENT_ID)
+    assert replica.handle(server.snapshot()) is not None
+    return server, replica
+
+
+def test_replica_follows_inputs_through_join_leave_respawn():
+    server, replica = _started()
+    checksums = 0
+    for t in range(1500):
+        joins = [2] if t == 100 else ()
+        leaves = [1] if t == 400 else ()
+        msg = server.tick(joins, leaves)
+        checksums += "checksum" in msg
+        update = replica.handle(msg)
+        assert update is not None and not replica.desynced, f"tick {msg['tick']}"
+        assert _in_sync(server, replica), f"tick {msg['tick']}"
+        assert update["tick"] == server.world.tick_count
+    assert sorted(replica.world.players) == sorted(server.world.players) == [0, 2]
+    assert server.respawns > 0
+    assert checksums >= 1500 // CHECKSUM_INTERVAL
+    assert replica.resync_request() is None
+
+
+def test_skipped_tick_desyncs():
+    server, replica = _started()
+    replica.handle(server.tick())
+    server.tick()  # lost
+    assert replica.handle(server.tick()) is None
+    assert replica.desynced
+    request = replica.resync_request()
+    assert request["type"] == MSG_DESYNC
+    assert replica.resync_request() is None  # sent once
+    assert replica.handle(server.tick()) is None  # stays stopped until a snapshot
+
+
+def test_altered_tick_desyncs_at_the_next_checksum():
+    server, replica = _started()
+    msg = server.tick()
+    # another move (flat = move * 4 + angle / 90): the player ends the tick elsewhere
+    msg["actions"][str(CLIENT_ID)] = (msg["actions"][str(CLIENT_ID)] + 4) % FLAT_ACTION_COUNT
+    replica.handle(msg)
+    while not replica.desynced:
+        msg = server.tick()
+        replica.handle(msg)
+        assert server.world.tick_count <= 2 * CHECKSUM_INTERVAL, "checksum never caught the change"
+    assert "checksum" in msg
+    assert replica.resync_request()["type"] == MSG_DESYNC
+    assert replica.desync_count == 1
+
+
+def test_snapshot_recovers():
+    server, replica = _started()
+    server.tick()  # lost
+    replica.handle(server.tick())
+    assert replica.desynced
+    replica.resync_request()
+    assert replica.handle(server.snapshot()) is not None
+    assert not replica.desynced and _in_sync(server, replica)
+    for _ in range(3 * CHECKSUM_INTERVAL):
+        assert replica.handle(server.tick()) is not None
+        assert _in_sync(server, replica)
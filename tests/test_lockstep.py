@@ -0,0 +1,122 @@
+"""
+Lockstep server wait: _wait_for_actions returns once every client sent the tick has
+acted on it, gives up after the straggler timeout, and stops waiting for a client that
+disconnects. Clients talk over socket pairs through the server's own receive threads.
+
+  python -m pytest tests/test_lockstep.py
+"""
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import Player
+from bullet_hell_rl.net.protocol import MSG_ACTION, send_message
+from bullet_hell_rl.net.server import ClientRecord, _client_recv_loop, _wait_for_actions
+
+TICK = 5
+DELAY = 0.05  # clients answer after the wait has started
+
+
+class _Lobby:
+    """Server-side client table and queue, plus the client end of each connection."""
+
+    def __init__(self, n):
+        self.clients = {}
+        self.clients_lock = threading.Lock()
+        self.message_queue = []
+        self.queue_lock = threading.Condition()
+        self.peers = {}
+        for cid in range(n):
+            server_end, client_end = socket.socketpair()
+            rec = ClientRecord(cid, server_end, Player(100 * cid, 100, is_env=True))
+            rec.sent_tick = TICK
+            self.clients[cid] = rec
+            self.peers[cid] = client_end
+            threading.Thread(
+                target=_client_recv_loop,
+                args=(cid, server_end, self.message_queue, self.queue_lock),
+                daemon=True,
+            ).start()
+
+    def later(self, fn):
+        def run():
+            time.sleep(DELAY)
+            fn()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def act(self, cid, action, tick=TICK):
+        self.later(lambda: send_message(self.peers[cid], {"type": MSG_ACTION, "action": action, "tick": tick}))
+
+    def leave(self, cid):
+        self.later(self.peers[cid].close)
+
+    def wait(self, timeout):
+        start = time.monotonic()
+        done = _wait_for_actions(
+            TICK, self.clients, self.clients_lock, self.message_queue, self.queue_lock, timeout
+        )
+        return done, time.monotonic() - start
+
+    def close(self):
+        for peer in self.peers.values():
+            peer.close()
+
+
+@pytest.fixture
+def lobby():
+    made = []
+
+    def make(n):
+        made.append(_Lobby(n))
+        return made[-1]
+
+    yield make
+    for lob in made:
+        lob.close()
+
+
+def test_all_acted(lobby):
+    lob = lobby(3)
+    for cid in range(3):
+        lob.act(cid, action=cid + 4)
+    done, elapsed = lob.wait(timeout=5.0)
+    assert done and elapsed < 5.0
+    assert [rec.latest_action for rec in lob.clients.values()] == [4, 5, 6]
+    assert all(rec.acted_tick == TICK for rec in lob.clients.values())
+
+
+def test_not_sent_this_tick_is_not_waited_for(lobby):
+    lob = lobby(2)
+    lob.clients[1].sent_tick = -1  # accepted after the tick's updates went out
+    lob.act(0, action=1)
+    done, elapsed = lob.wait(timeout=5.0)
+    assert done and elapsed < 5.0
+
+
+def test_straggler_times_out(lobby):
+    lob = lobby(2)
+    lob.act(0, action=3)
+    lob.act(1, action=7, tick=TICK - 1)  # a stale answer does not count for this tick
+    timeout = 0.3
+    done, elapsed = lob.wait(timeout)
+    assert not done and elapsed >= timeout
+    assert lob.clients[0].acted_tick == TICK
+    assert lob.clients[1].acted_tick == TICK - 1
+    assert lob.clients[1].latest_action == 7  # still applied as its previous action
+
+
+def test_disconnect_while_waiting(lobby):
+    lob = lobby(2)
+    lob.act(0, action=2)
+    lob.leave(1)
+    done, elapsed = lob.wait(timeout=5.0)
+    assert done and elapsed < 5.0
+    assert lob.clients[1].disconnected and not lob.clients[0].disconnected
@@ -0,0 +1,84 @@
+"""
+render_mode="rgb_array" without a display (SDL_VIDEODRIVER=dummy): render() returns an
+(H, W, 3) uint8 frame with the player, enemies and bullets drawn where the camera puts
+them. The frame changes as entities move and no window is opened.
+
+  python -m pytest tests/test_render.py
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame
+
+from bullet_hell_rl.bullethell import BLUE, BULLET_SIZE, RED
+from bullet_hell_rl.envs.BulletHellEnv import BulletHellEnv
+
+
+def _camera(env):
+    player = env.player
+    x = player.x + player.size // 2 - env.screen_width // 2
+    y = player.y + player.size // 2 - env.screen_height // 2
+    return (
+        max(0, min(env.world_width - env.screen_width, x)),
+        max(0, min(env.world_height - env.screen_height, y)),
+    )
+
+
+def _center_pixel(env, frame, entity):
+    camera_x, camera_y = _camera(env)
+    col = int(entity.x - camera_x) + entity.size // 2
+    row = int(entity.y - camera_y) + entity.size // 2
+    if 0 <= row < env.screen_height and 0 <= col < env.screen_width:
+        return tuple(frame[row, col].tolist())
+    return None
+
+
+def _drawn(env):
+    """Screen positions of everything render() draws that lands on the screen."""
+    camera_x, camera_y = _camera(env)
+    pool = env.bullets
+    slots = pool.live_slots()
+    entities = [(e.x, e.y, e.size) for e in [env.player, *env.enemies]]
+    entities += [(x, y, BULLET_SIZE) for x, y in zip(pool.x[slots].tolist(), pool.y[slots].tolist())]
+    on_screen = []
+    for x, y, size in entities:
+        sx, sy = int(x - camera_x), int(y - camera_y)
+        if -size < sx < env.screen_width and -size < sy < env.screen_height:
+            on_screen.append((sx, sy))
+    return on_screen
+
+
+def test_rgb_array_frames():
+    env = BulletHellEnv(render_mode="rgb_array")
+    env.reset(seed=0)
+    frame = env.render()
+    assert isinstance(frame, np.ndarray)
+    assert frame.shape == (env.screen_height, env.screen_width, 3) and frame.dtype == np.uint8
+    assert _center_pixel(env, frame, env.player) == BLUE
+
+    rng = np.random.default_rng(0)
+    moved = 0
+    for step in range(30):
+        before, drawn = frame.copy(), _drawn(env)
+        env.step({"move": int(rng.integers(5)), "fire_angle": np.array([rng.integers(0, 271)], dtype=np.int16)})
+        frame = env.render()
+        assert frame is env.frame  # redrawn in place
+        if _drawn(env) != drawn:
+            moved += 1
+            assert not np.array_equal(frame, before), f"step {step}: entities moved, frame did not"
+        assert _center_pixel(env, frame, env.player) == BLUE
+        for enemy in env.enemies:
+            assert _center_pixel(env, frame, enemy) in (None, RED, BLUE)  # bullets may cover it
+    assert moved > 20
+    colors = {tuple(c) for c in np.unique(frame.reshape(-1, 3), axis=0).tolist()}
+    assert {BLUE, RED} <= colors  # player, friendly bullets, enemies / hostile bullets
+    assert pygame.display.get_surface() is None  # offscreen only
+    env.close()
@@ -0,0 +1,74 @@
+"""
+Collision broadphase: BulletPool.overlapping through the spatial hash returns the same
+bullets, in the same order, as testing every live bullet, on random layouts. This covers
+swept and plain tests, bullets spawned after the last rebuild, removals, and query rects
+at and past the world edges.
+
+  python -m pytest tests/test_spatial_hash.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.bullethell import ENTITY_SIZE, WORLD_HEIGHT, WORLD_WIDTH, BulletPool
+
+
+class _Pools:
+    """The same bullets in a hashed pool and a brute-force one, driven in lockstep."""
+
+    def __init__(self, swept):
+        self.hashed = BulletPool(capacity=8, swept=swept)
+        self.brute = BulletPool(capacity=8, use_spatial_hash=False, swept=swept)
+
+    def spawn(self, rng, k):
+        for _ in range(k):
+            x, y = rng.uniform(-20, WORLD_WIDTH + 20), rng.uniform(-20, WORLD_HEIGHT + 20)
+            angle = rng.uniform(0, 360)
+            friendly = bool(rng.random() < 0.5)
+            self.hashed.spawn(x, y, angle, 10, friendly)
+            self.brute.spawn(x, y, angle, 10, friendly)
+
+    def update(self, dt):
+        for pool in (self.hashed, self.brute):
+            pool.update(dt)
+            pool.remove_off_screen()
+
+    def remove_random(self, rng, k):
+        # same spawn order in both pools, so the i-th live bullet is the same bullet
+        picks = rng.choice(len(self.hashed), size=min(k, len(self.hashed)), replace=False)
+        for pool in (self.hashed, self.brute):
+            slots = pool.live_slots()[picks]
+            pool.remove_many([pool._views[s] for s in slots])
+
+    def check(self, rng, queries=60):
+        hits = 0
+        for _ in range(queries):
+            rx = int(rng.integers(-ENTITY_SIZE, WORLD_WIDTH + ENTITY_SIZE))
+            ry = int(rng.integers(-ENTITY_SIZE, WORLD_HEIGHT + ENTITY_SIZE))
+            w, h = (int(v) for v in rng.integers(1, 4 * ENTITY_SIZE, size=2))
+            got = [self.hashed.seq[b._slot] for b in self.hashed.overlapping(rx, ry, w, h)]
+            want = [self.brute.seq[b._slot] for b in self.brute.overlapping(rx, ry, w, h)]
+            assert got == want, (rx, ry, w, h)
+            hits += len(want)
+        return hits
+
+
+@pytest.mark.parametrize("swept", [False, True], ids=["plain", "swept"])
+def test_hash_matches_brute_force(swept):
+    rng = np.random.default_rng(0)
+    pools = _Pools(swept)
+    pools.spawn(rng, 400)
+    hits = pools.check(rng)
+    for tick in range(40):
+        pools.update(dt=[1 / 60, 1 / 20, 0.25][tick % 3])  # up to ~175 px per update
+        hits += pools.check(rng)
+        pools.spawn(rng, 20)  # pending: spawned after the rebuild the checks triggered
+        hits += pools.check(rng)
+        pools.remove_random(rng, 10)
+        hits += pools.check(rng)
+    assert hits > 500
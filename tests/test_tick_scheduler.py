@@ -0,0 +1,146 @@
+"""
+FixedRateScheduler on an injected clock: ticks start on the deadline grid, catch_up runs
+at most max_catch_up overdue ticks back to back, drop skips every missed deadline, and
+report() counts overruns / late / dropped ticks and takes percentiles of the durations.
+A tick rate of 64 keeps every time exact in binary floating point.
+
+  python -m pytest tests/test_tick_scheduler.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Ensure src is on path when run from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bullet_hell_rl.net.tick_scheduler import FixedRateScheduler
+
+RATE = 64
+PERIOD = 1 / RATE
+
+
+class _Clock:
+    """Simulated time: work() and the scheduler's sleeps advance it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        assert seconds > 0
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
+
+
+def _scheduler(clock, **kwargs):
+    return FixedRateScheduler(RATE, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _run(scheduler, clock, work):
+    """One tick per work duration; returns the time each tick started."""
+    starts = []
+    for seconds in work:
+        scheduler.begin_tick()
+        starts.append(clock())
+        clock.work(seconds)
+        scheduler.wait()
+    return starts
+
+
+def test_ticks_stay_on_the_grid():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    starts = _run(scheduler, clock, [PERIOD / 4, PERIOD / 2, 0.0, PERIOD * 3 / 4] * 5)
+    assert starts == [n * PERIOD for n in range(20)]
+    assert (scheduler.late, scheduler.overruns, scheduler.dropped) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("max_catch_up", [1, 3, 5])
+def test_catch_up_is_bounded(max_catch_up):
+    clock = _Clock()
+    scheduler = _scheduler(clock, max_catch_up=max_catch_up)
+    stall = 10  # periods: deadlines 1..10 are due when the stalled tick ends
+    starts = _run(scheduler, clock, [0.0, stall * PERIOD] + [0.0] * 12)
+    resumed = (stall + 1) * PERIOD
+    back_to_back = [t for t in starts[2:] if t == resumed]
+    assert len(back_to_back) == max_catch_up
+    assert scheduler.dropped == stall - max_catch_up
+    # after catching up, ticks are on the grid again
+    assert starts[2 + max_catch_up:] == [resumed + n * PERIOD for n in range(1, 13 - max_catch_up)]
+    assert scheduler.late == max_catch_up
+    assert scheduler.overruns == 1
+
+
+def test_drop_skips_missed_deadlines():
+    clock = _Clock()
+    scheduler = _scheduler(clock, policy="drop")
+    stall = 10
+    starts = _run(scheduler, clock, [0.0, stall * PERIOD] + [0.0] * 5)
+    resumed = (stall + 1) * PERIOD
+    # one tick starts right away, never two back to back, then the grid resumes
+    assert starts[2:] == [resumed + n * PERIOD for n in range(5)]
+    assert scheduler.dropped == stall - 1
+    assert (scheduler.late, scheduler.overruns) == (1, 1)
+
+
+def test_slow_ticks_count_overruns_and_late():
+    clock = _Clock()
+    scheduler = _scheduler(clock, policy="drop")
+    # 1.5 periods each: every tick overruns; a tick is late whenever it ends past the next deadline
+    _run(scheduler, clock, [1.5 * PERIOD] * 8)
+    assert scheduler.overruns == 8
+    assert scheduler.late == 8
+    assert scheduler.ticks == 8
+
+
+def test_end_tick_only_never_sleeps():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    for _ in range(10):
+        scheduler.begin_tick()
+        clock.work(2 * PERIOD)
+        assert scheduler.end_tick() == 2 * PERIOD
+    assert clock.sleeps == []
+    assert (scheduler.overruns, scheduler.late, scheduler.dropped) == (10, 0, 0)
+
+
+def test_report_percentiles_since_last_report():
+    clock = _Clock()
+    window = 32
+    scheduler = _scheduler(clock, window=window)
+    rng = np.random.default_rng(0)
+    first = rng.uniform(0, 2 * PERIOD, size=50)
+    _run(scheduler, clock, first)
+    stats = scheduler.report()
+    kept = first[-window:] * 1000.0  # only the last `window` ticks are kept
+    np.testing.assert_allclose(
+        [stats["tick_ms_p50"], stats["tick_ms_p95"], stats["tick_ms_p99"], stats["tick_ms_max"]],
+        [*np.percentile(kept, (50, 95, 99)), kept.max()],
+    )
+    assert stats["tick"] == 50
+    assert stats["tick_overruns"] == int((first > PERIOD).sum())
+    assert stats["ticks_late"] == scheduler.late and stats["ticks_dropped"] == scheduler.dropped
+    assert stats["achieved_tick_rate"] == pytest.approx(50 / clock())
+
+    reported_at = clock()
+    late, dropped = scheduler.late, scheduler.dropped
+    second = np.full(10, PERIOD / 2)
+    _run(scheduler, clock, second)
+    stats = scheduler.report()
+    assert stats["tick_ms_p50"] == stats["tick_ms_p99"] == stats["tick_ms_max"] == PERIOD / 2 * 1000.0
+    assert stats["tick_overruns"] == 0
+    # still catching up on the first ticks' backlog for a while
+    assert (stats["ticks_late"], stats["ticks_dropped"]) == (scheduler.late - late, scheduler.dropped - dropped)
+    assert stats["ticks_late"] > 0
+    assert stats["achieved_tick_rate"] == pytest.approx(10 / (clock() - reported_at))
+
+    empty = scheduler.report()
+    assert empty["tick_ms_max"] == 0.0 and empty["tick_overruns"] == 0